@@ -1,6 +1,6 @@
 # Package for RubikState
-from RubikState.rubik_chen import RubikState, SOLVED_STATE_3x3, MOVES_3x3, heuristic_3x3
-from RubikState.rubik_2x2 import Rubik2x2State, SOLVED_STATE_2x2, MOVES_2x2, heuristic_2x2
+from RubikState.rubik_chen import RubikState, SOLVED_STATE_3x3, MOVES_3x3, heuristic_3x3, heuristic_3x3_batch
+from RubikState.rubik_2x2 import Rubik2x2State, SOLVED_STATE_2x2, MOVES_2x2, heuristic_2x2, heuristic_2x2_batch
 
 # We'll import solver functions from the specific module instead of here
 # to avoid circular imports 
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Weighted A* and anytime repairing A* (ARA*) shared by the 2x2 and 3x3 solvers
+
+States are the encoded keys of RubikState.compiled_moves. Priorities are
+f = g + w * h, scaled by WEIGHT_SCALE to stay integers for BucketQueue; the
+weight is rounded down to a multiple of 1 / WEIGHT_SCALE, which keeps the
+bound. With a consistent h every solution found with weight w is at most w
+times longer than the optimal one. A state is expanded at most once per
+search, so an admissible but inconsistent h does not keep that bound.
+heuristic_2x2 and heuristic_3x3 are not even admissible (h = 2 one quarter
+turn from solved), so with them the reported bound is not guaranteed. The
+pattern databases of RubikState.korf (use_pdb) are consistent.
+
+ARA* (Likhachev, Gordon, Thrun 2003) runs weighted A* with a decreasing
+weight and reuses the search effort: states whose g improved after they were
+expanded are kept in an INCONS list and put back into OPEN when the weight
+goes down, instead of restarting the search.
+"""
+
+import time
+
+from RubikState.search_structures import NodeArena, BucketQueue
+
+WEIGHT_SCALE = 100
+
+# How many generated nodes between two time-limit checks
+TIME_CHECK_INTERVAL = 4096
+
+def ara_star(start_key, goal_key, compiled, heuristic, start_time, time_limit,
+             weight=3.0, final_weight=1.0, weight_step=0.5, on_solution=None):
+    """
+    Anytime repairing A*
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes
+        heuristic: Function h(key, g)
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        weight: Weight of the first search (>= 1)
+        final_weight: Stop after the search with this weight (1 gives an optimal solution
+                      with a consistent heuristic)
+        weight_step: Amount the weight goes down after each solution
+        on_solution: Optional callback on_solution(path, bound, elapsed), called
+                     with every improved solution
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated, bound)
+               bound is the suboptimality factor of the path, proven only for a
+               consistent heuristic (None if the deadline came before the first
+               search finished)
+    """
+    if weight < 1 or final_weight < 1:
+        raise ValueError("Weights must be at least 1")
+    deadline = start_time + time_limit
+    apply = compiled.apply
+    names = compiled.names
+    n = len(apply)
+
+    # Every improvement of g creates a node; best[key] is the current one
+    arena = NodeArena()
+    h_cache = {start_key: heuristic(start_key, 0)}
+    best = {start_key: arena.add(start_key)}
+    w = int(weight * WEIGHT_SCALE)
+    final_w = int(final_weight * WEIGHT_SCALE)
+    step = max(1, int(weight_step * WEIGHT_SCALE))
+    scale = WEIGHT_SCALE
+
+    queue = BucketQueue(order="high_g")
+    queue.push(w * h_cache[start_key], best[start_key])
+    incons = []
+    solution = None   # (path, weight bound)
+    goal_g = float('inf')
+    nodes = 0
+    next_check = TIME_CHECK_INTERVAL
+
+    while True:
+        # ImprovePath: expand while a node may still lead to a cheaper goal
+        closed = set()
+        timed_out = False
+        while queue:
+            f, node = queue.pop()
+            if f >= goal_g * scale:
+                queue.push(f, node, arena.g[node])
+                break
+            key = arena.states[node]
+            if best[key] != node or key in closed:
+                continue  # Stale entry
+            closed.add(key)
+            g = arena.g[node] + 1
+            for m in range(n):
+                child = apply[m](key)
+                nodes += 1
+                old = best.get(child)
+                if old is not None and arena.g[old] <= g:
+                    continue
+                child_node = arena.add(child, node, m, g)
+                best[child] = child_node
+                if child == goal_key:
+                    goal_g = g
+                if child in closed:
+                    incons.append(child_node)
+                    continue
+                h = h_cache.get(child)
+                if h is None:
+                    h = h_cache[child] = heuristic(child, g)
+                queue.push(g * scale + w * h, child_node, g)
+            if nodes >= next_check:
+                if time.time() >= deadline:
+                    timed_out = True
+                    break
+                next_check += TIME_CHECK_INTERVAL
+
+        if goal_g != float('inf'):
+            # A finished pass proves the bound w; a pass cut by the deadline only
+            # keeps the bound of the previous solution (None if there is none)
+            bound = w / scale if not timed_out else (solution[1] if solution else None)
+            if solution is None or goal_g < len(solution[0]):
+                path = arena.path(best[goal_key], names)
+                solution = (path, bound)
+                if on_solution is not None:
+                    on_solution(path, bound, time.time() - start_time)
+            else:
+                solution = (solution[0], bound)
+
+        if timed_out or w <= final_w or time.time() >= deadline:
+            break
+        if not queue and not incons:
+            break
+
+        # Lower the weight, move INCONS into OPEN and reorder OPEN
+        w = max(final_w, w - step)
+        pending = incons
+        incons = []
+        while queue:
+            pending.append(queue.pop()[1])
+        for node in pending:
+            key = arena.states[node]
+            if best[key] == node:
+                g = arena.g[node]
+                queue.push(g * scale + w * h_cache.get(key, 0), node, g)
+
+    if solution is None:
+        return None, nodes, None
+    return solution[0], nodes, solution[1]
@@ -0,0 +1,210 @@
+"""
+Batched IDA* shared by the 2x2 and 3x3 solvers
+
+The threshold iterations are those of depth_first.ida_star, but nodes are
+expanded a batch at a time instead of one by one. A batch is an (N, slots)
+int8 array of cubie values (key[:slots] of RubikState.compiled_moves: corner
+slots hold cp * 3 + co, edge slots ep * 2 + eo), measured relative to the
+goal with CompiledMoves.relative_to so the goal is the solved state. It
+carries the canonical move context of every row and an (N, g) array of the
+moves that led there.
+
+Expanding a batch is a few NumPy operations for all its rows and moves at
+once: a move is a column gather plus a value table (the cubie a slot
+receives and its new orientation), canonical pruning a boolean mask indexed
+by context, and h the counts of make_heuristic summed from per-slot tables,
+optionally raised by the three pattern databases of the optimal solver
+(RubikState.korf). The children with g + h <= threshold are cut into batches
+again and pushed on a stack, so the tree is still walked depth first and at
+most about depth * moves batches are alive at a time.
+
+The order of the nodes inside an iteration differs from ida_star, and there
+is no transposition table, but every iteration searches the same bounded
+tree, so the solutions have the same length.
+"""
+
+import time
+
+import numpy as np
+
+from RubikState.compiled_moves import heuristic_terms
+
+# Parents expanded per batch
+BATCH_NODES = 1 << 14
+
+def cubie_moves(compiled):
+    """
+    Moves as gathers on (N, slots) cubie arrays
+
+    Slot s after move m receives the cubie of slot read[m, s], turned by
+    the sticker the move takes it from, so its new value is
+    values[m, s, old[:, read[m, s]]].
+
+    Args:
+        compiled: CompiledMoves of the search
+
+    Returns:
+        tuple: (read, values) as (moves, slots) intp and (moves, slots, 24) int8 arrays
+    """
+    # Slot, sticker number and orientation count of every sticker index
+    sticker = {}
+    for i, stickers in enumerate(compiled.corner_index):
+        for k, index in enumerate(stickers):
+            sticker[index] = (i, k, 3)
+    for j, stickers in enumerate(compiled.edge_index):
+        for k, index in enumerate(stickers):
+            sticker[index] = (8 + j, k, 2)
+
+    n = len(compiled.sources)
+    read = np.zeros((n, compiled.slots), dtype=np.intp)
+    values = np.zeros((n, compiled.slots, 24), dtype=np.int8)
+    v = np.arange(24)
+    for m, sources in enumerate(compiled.sources):
+        for slot in range(compiled.slots):
+            source, k, orientations = sticker[sources[slot]]
+            read[m, slot] = source
+            values[m, slot] = v - v % orientations + (v % orientations + k) % orientations
+    return read, values
+
+class BatchExpander:
+    """
+    Children, pruning masks and heuristic values of cubie batches
+
+    Attributes:
+        n: Number of moves
+        allowed: (contexts, moves) mask of the canonical moves per context
+        next_ctx: (contexts, moves) context after each move
+        root_ctx: Context of the root
+    """
+    def __init__(self, compiled, start_key, tables=None):
+        """
+        Args:
+            compiled: CompiledMoves of the search (compiled.uniform must be true)
+            start_key: Start state relative to the goal
+            tables: Optional KorfTables whose pattern databases raise h (3x3 only,
+                    admissible for the move set of the tables)
+        """
+        read, values = cubie_moves(compiled)
+        self.n, self.slots = read.shape
+        # Flat index into values of slot s of move m reading value v: base[m, s] + v
+        self.read = read
+        self.base = (np.arange(self.n * self.slots) * 24).reshape(self.n, self.slots)
+        self.values = values.ravel()
+
+        self.allowed = np.zeros((len(compiled.allowed), self.n), dtype=bool)
+        for ctx, moves in enumerate(compiled.allowed):
+            self.allowed[ctx, list(moves)] = True
+        self.next_ctx = np.array(compiled.next_ctx, dtype=np.intp)
+        self.root_ctx = compiled.root_ctx
+
+        contrib, extra = heuristic_terms(compiled, start_key)
+        self.contrib = np.array(contrib, dtype=np.int32)
+        self.slot_index = np.arange(self.slots)
+        self.extra = extra
+        self.tables = tables
+
+    def children(self, states):
+        """(N, moves, slots) children of an (N, slots) batch"""
+        return self.values[states[:, self.read] + self.base]
+
+    def heuristic(self, states, g):
+        """
+        Heuristic of a batch of states at depth g
+
+        Returns:
+            tuple: (h, solved) arrays of the batch shape without the slot axis
+        """
+        total = self.contrib[self.slot_index, states].sum(axis=-1)
+        h = np.maximum(np.maximum((total & 31) >> 2, total >> 7), self.extra[g & 1])
+        if self.tables is not None:
+            cubies = states.reshape(-1, self.slots)
+            arr = np.concatenate([cubies[:, :8] // 3, cubies[:, :8] % 3,
+                                  cubies[:, 8:] // 2, cubies[:, 8:] % 2], axis=1)
+            for values in self.tables.batch_lookups(arr):
+                h = np.maximum(h, values.reshape(h.shape))
+        return h, total == 0
+
+def batched_ida_star(start_key, goal_key, compiled, start_time, time_limit, tables=None,
+                     batch=BATCH_NODES, max_threshold=None):
+    """
+    IDA* expanding batches of nodes as NumPy arrays
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes (compiled.uniform must be true)
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        tables: Optional KorfTables whose pattern databases raise h (see BatchExpander)
+        batch: Parents expanded per batch
+        max_threshold: Give up once the threshold would exceed this (None for no bound)
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated, stats)
+               stats is a dict with iterations and nodes_per_second
+    """
+    if not compiled.uniform:
+        raise ValueError("Batched IDA* needs a move set whose moves all change parities the same way")
+    deadline = start_time + time_limit
+    start = compiled.relative_to(goal_key)(start_key)
+    expander = BatchExpander(compiled, start, tables)
+    slots = compiled.slots
+    root = np.array([start[:slots]], dtype=np.int8)
+
+    h, solved = expander.heuristic(root, 0)
+    threshold = int(h[0])
+    nodes = 1
+    iterations = 0
+    found = [] if solved[0] else None
+    timed_out = False
+
+    while found is None and not timed_out:
+        if max_threshold is not None and threshold > max_threshold:
+            break
+        iterations += 1
+        next_threshold = None
+        # Batches of (states, contexts, moves so far); the top one is expanded next
+        stack = [(root, np.array([expander.root_ctx]), np.zeros((1, 0), dtype=np.int8))]
+        while stack:
+            states, ctxs, paths = stack.pop()
+            g = paths.shape[1] + 1
+            children = expander.children(states)
+            h, solved = expander.heuristic(children, g)
+            mask = expander.allowed[ctxs]
+            nodes += int(mask.sum())
+
+            f = h + g
+            over = mask & (f > threshold)
+            if over.any():
+                smallest = int(f[over].min())
+                if next_threshold is None or smallest < next_threshold:
+                    next_threshold = smallest
+            rows, moves = np.nonzero(mask & (f <= threshold))
+
+            goal = np.flatnonzero(solved[rows, moves])
+            if len(goal):
+                i = goal[0]
+                found = paths[rows[i]].tolist() + [int(moves[i])]
+                break
+            if len(rows):
+                kept = (children[rows, moves], expander.next_ctx[ctxs[rows], moves],
+                        np.concatenate([paths[rows], moves[:, None].astype(np.int8)], axis=1))
+                # Last batch pushed first, so the first children are expanded first
+                for begin in range((len(rows) - 1) // batch * batch, -1, -batch):
+                    stack.append(tuple(part[begin:begin + batch] for part in kept))
+
+            if time.time() >= deadline:
+                timed_out = True
+                break
+
+        if found is not None or timed_out or next_threshold is None:
+            break
+        threshold = next_threshold
+
+    stats = {
+        "iterations": iterations,
+        "nodes_per_second": nodes / max(time.time() - start_time, 1e-9),
+    }
+    if found is None:
+        return None, nodes, stats
+    return [compiled.names[m] for m in found], nodes, stats
@@ -0,0 +1,141 @@
+"""
+Vectorized beam search for the 3x3 Rubik's cube
+
+States are rows of the (N, 40) arrays of states_to_array_3x3 (cp, co, ep,
+eo). A whole layer is expanded at once: every move is a column gather plus an
+orientation offset, so the children of a beam are one fancy-indexing
+operation. Children are deduplicated with np.unique on a 16-byte packed key
+and the beam_width children with the lowest heuristic are kept. Only the
+parent index and move of each kept state are stored per depth, so memory is
+O(beam_width) for the layer plus 5 bytes per state and depth for the path.
+
+Beam search is not complete: a state may be solvable while every path to the
+goal leaves the beam. Solutions are not optimal.
+"""
+
+import time
+
+import numpy as np
+
+from RubikState.rubik_chen import states_to_array_3x3, heuristic_3x3_batch
+
+def batch_moves(moves_dict):
+    """
+    Moves as column gathers on (N, 40) state arrays
+
+    Returns:
+        tuple: (names, index, offset, modulus) such that the children of arr are
+               (arr[:, index] + offset) % modulus, shaped (N, n_moves, 40)
+    """
+    names = list(moves_dict.keys())
+    index = []
+    offset = []
+    for name in names:
+        move = moves_dict[name]
+        cp, co, ep, eo = move['cp'], move['co'], move['ep'], move['eo']
+        index.append(list(cp) + [8 + i for i in cp] + [16 + j for j in ep] + [28 + j for j in ep])
+        offset.append([0] * 8 + list(co) + [0] * 12 + list(eo))
+    modulus = np.array([8] * 8 + [3] * 8 + [12] * 12 + [2] * 12, dtype=np.int8)
+    return names, np.array(index), np.array(offset, dtype=np.int8), modulus
+
+def pack_keys(arr):
+    """
+    One 16-byte key per state row, for np.unique
+
+    Corner slots hold cp * 3 + co and edge slots ep * 2 + eo, 5 bits each:
+    40 bits of corners in the first word and 60 bits of edges in the second.
+    """
+    corners = (arr[:, :8] * 3 + arr[:, 8:16]).astype(np.uint64)
+    edges = (arr[:, 16:28] * 2 + arr[:, 28:40]).astype(np.uint64)
+    packed = np.empty((len(arr), 2), dtype=np.uint64)
+    packed[:, 0] = corners @ (np.uint64(1) << (np.arange(8, dtype=np.uint64) * np.uint64(5)))
+    packed[:, 1] = edges @ (np.uint64(1) << (np.arange(12, dtype=np.uint64) * np.uint64(5)))
+    return packed.view(np.dtype((np.void, 16))).ravel()
+
+def pdb_score_batch(tables):
+    """
+    Beam score from the pattern databases of the optimal solver
+
+    The maximum of the three lookups decides (it is a lower bound on the
+    distance), their sum breaks the many ties between equal maxima.
+
+    Args:
+        tables: KorfTables (quarter turn metric for MOVES_3x3)
+
+    Returns:
+        function: score(arr) -> int array, lower is better
+    """
+    def score(arr):
+        corner, edges_0, edges_1 = (values.astype(np.int32) for values in tables.batch_lookups(arr))
+        return np.maximum(np.maximum(corner, edges_0), edges_1) * 64 + corner + edges_0 + edges_1
+    return score
+
+def beam_search(start_state, goal_state, moves_dict, start_time, time_limit, beam_width=10000,
+                max_depth=40, heuristic_batch=None):
+    """
+    Beam search on batches of states
+
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (RubikState)
+        moves_dict: Dictionary of moves
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        beam_width: States kept per depth
+        max_depth: Give up after this many moves
+        heuristic_batch: Function scoring an (N, 40) array, lower is better
+                         (default heuristic_3x3_batch)
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    heuristic_batch = heuristic_batch or heuristic_3x3_batch
+    deadline = start_time + time_limit
+    names, index, offset, modulus = batch_moves(moves_dict)
+    n = len(names)
+
+    beam = states_to_array_3x3([start_state])
+    goal_key = pack_keys(states_to_array_3x3([goal_state]))[0]
+    if pack_keys(beam)[0] == goal_key:
+        return [], 1
+    previous = seen = pack_keys(beam)
+    parents = []  # Per depth: index in the previous beam of each kept state
+    moves = []    # Per depth: move that produced each kept state
+    nodes = 1
+
+    for depth in range(max_depth):
+        if time.time() >= deadline:
+            break
+        children = ((beam[:, index] + offset) % modulus).reshape(-1, 40)
+        nodes += len(children)
+        keys = pack_keys(children)
+
+        goal_rows = np.flatnonzero(keys == goal_key)
+        if goal_rows.size:
+            row = int(goal_rows[0])
+            path = [names[row % n]]
+            row //= n
+            for level in range(depth - 1, -1, -1):
+                path.append(names[moves[level][row]])
+                row = parents[level][row]
+            path.reverse()
+            return path, nodes
+
+        # Drop duplicates inside the layer and states of the two previous layers
+        # (a move followed by its inverse leads back two layers)
+        keys, first = np.unique(keys, return_index=True)
+        fresh = ~np.isin(keys, seen)
+        keys, first = keys[fresh], first[fresh]
+        if not len(first):
+            break
+        scores = heuristic_batch(children[first])
+        if len(first) > beam_width:
+            best = np.argpartition(scores, beam_width - 1)[:beam_width]
+            keys, first = keys[best], first[best]
+        parents.append((first // n).astype(np.int32))
+        moves.append((first % n).astype(np.int8))
+        beam = children[first]
+        seen = np.concatenate([previous, keys])
+        previous = keys
+
+    return None, nodes
@@ -0,0 +1,313 @@
+"""
+Bidirectional (meet-in-the-middle) searches shared by the 2x2 and 3x3 solvers
+
+States are the sticker tuples of RubikState.compiled_moves, stored as bytes to
+keep the visited tables small (itemgetter works on bytes directly). The
+forward side grows from the start state with the normal moves, the backward
+side grows from the goal with the inverse moves.
+
+bidirectional_bfs expands whole layers. mm_search is the heuristic
+front-to-end search MM (Holte, Felner, Sharon, Sturtevant 2016): both sides
+are best-first searches ordered by max(f, 2g), so neither side expands a node
+beyond the middle of the solution. The backward heuristic measures the
+distance to the start state through CompiledMoves.relative_to.
+"""
+
+import time
+
+from RubikState.compiled_moves import make_heuristic
+from RubikState.search_structures import BucketQueue
+
+# How many generated nodes between two time-limit checks
+TIME_CHECK_INTERVAL = 4096
+
+def _walk(table, key, step, inverse):
+    """
+    Follow the moves recorded in a visited table from key back to its root
+
+    Args:
+        table: Visited table, state -> depth * 16 + move index
+        key: State (bytes) to start from
+        step: compiled.apply
+        inverse: True to undo the recorded moves (forward table)
+
+    Returns:
+        list: Recorded move indices, from key towards the root
+    """
+    moves = []
+    code = table[key]
+    while code >> 4:
+        m = code & 15
+        moves.append(m)
+        key = bytes(step[inverse[m] if inverse is not None else m](key))
+        code = table[key]
+    return moves
+
+def bidirectional_bfs(start_key, goal_key, compiled, start_time, time_limit):
+    """
+    Bidirectional breadth-first search
+
+    Whole layers are expanded, always on the side with the smaller frontier.
+    The first layer that meets the other side is finished and the shortest
+    meeting is kept, so the result is an optimal solution.
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves with an inverse for every move
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+
+    Returns:
+        tuple: (list of move names or None, nodes_expanded)
+    """
+    apply = compiled.apply
+    inverse = compiled.inverse
+    if min(inverse) < 0:
+        raise ValueError("Bidirectional search needs an inverse for every move")
+
+    start = bytes(start_key)
+    goal = bytes(goal_key)
+    if start == goal:
+        return [], 1
+
+    deadline = start_time + time_limit
+    n = len(apply)
+    # Visited tables: state -> depth * 16 + index of the move that reached it.
+    # Forward entries are reached from their parent with that move, backward
+    # entries reach their parent (closer to the goal) with that move.
+    seen = [{start: 0}, {goal: 0}]
+    frontiers = [[start], [goal]]
+    depths = [0, 0]
+    steps = [list(range(n)), [inverse[m] for m in range(n)]]
+    nodes = 0
+    next_check = TIME_CHECK_INTERVAL
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own, other = seen[side], seen[1 - side]
+        depth = depths[side] + 1
+        base = depth << 4
+        best = None  # (length, state)
+        next_frontier = []
+
+        for key in frontiers[side]:
+            nodes += 1
+            if nodes >= next_check:
+                if time.time() >= deadline:
+                    return None, nodes
+                next_check += TIME_CHECK_INTERVAL
+            for m in range(n):
+                child = bytes(apply[steps[side][m]](key))
+                if child in own:
+                    continue
+                own[child] = base | m
+                next_frontier.append(child)
+                code = other.get(child)
+                if code is not None:
+                    length = depth + (code >> 4)
+                    if best is None or length < best[0]:
+                        best = (length, child)
+
+        if best is not None:
+            meet = best[1]
+            forward = _walk(seen[0], meet, apply, inverse)
+            forward.reverse()
+            backward = _walk(seen[1], meet, apply, None)
+            return [compiled.names[m] for m in forward + backward], nodes
+
+        frontiers[side] = next_frontier
+        depths[side] = depth
+
+    return None, nodes
+
+def mm_heuristics(compiled, start_key, goal_key, heuristic=None):
+    """
+    Front-to-end heuristics for both directions
+
+    Args:
+        compiled: CompiledMoves of the search
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        heuristic: Optional h(key, g) of the distance from key to the solved
+                   state, e.g. a pattern database (default is make_heuristic)
+
+    Returns:
+        tuple: (forward h(key, g) estimating the distance to goal_key,
+                backward h(key, g) estimating the distance from start_key,
+                g being the depth on the side of the search)
+    """
+    to_goal = compiled.relative_to(goal_key)
+    to_start = compiled.relative_to(start_key)
+    if heuristic is None:
+        forward = make_heuristic(compiled, to_goal(start_key))
+        backward = make_heuristic(compiled, to_start(goal_key))
+    else:
+        forward = backward = heuristic
+    if to_goal(goal_key) == goal_key:
+        # Solved goal: keys are already relative to it
+        heuristic_forward = forward
+    else:
+        heuristic_forward = lambda key, g: forward(to_goal(key), g)
+    return heuristic_forward, lambda key, g: backward(to_start(key), g)
+
+class _Side:
+    """Open and closed lists of one direction of mm_search"""
+    def __init__(self, root, h):
+        self.g = {root: 0}             # Best g of every reached state
+        self.parent = {root: None}     # State -> (parent state, move index)
+        self.open = {root: (0, h)}     # Open state -> (g, h)
+        self.queue = BucketQueue(order="high_g")
+        self.queue.push(h, (root, 0), 0)
+        self.top = None                # Best queue entry (priority, state, g), taken out of the queue
+        self.f_count = [0] * 64        # Open states per f and per g, for the stopping rule
+        self.g_count = [0] * 64
+        self.f_min = self.g_min = 0
+        self.expanded = 0
+        self._count(0, h, 1)
+
+    def _count(self, g, h, delta):
+        f = g + h
+        while len(self.f_count) <= f:
+            self.f_count.extend([0] * len(self.f_count))
+            self.g_count.extend([0] * len(self.g_count))
+        self.f_count[f] += delta
+        self.g_count[g] += delta
+        if delta > 0:
+            self.f_min = min(self.f_min, f)
+            self.g_min = min(self.g_min, g)
+
+    def add(self, key, g, h, parent, move):
+        """Open a state with a new best g"""
+        old = self.open.get(key)
+        if old is not None:
+            self._count(old[0], old[1], -1)
+        self.g[key] = g
+        self.parent[key] = (parent, move)
+        self.open[key] = (g, h)
+        self._count(g, h, 1)
+        priority = max(g + h, 2 * g)
+        if self.top is not None and priority < self.top[0]:
+            self.queue.push(self.top[0], self.top[1:], self.top[2])
+            self.top = None
+        self.queue.push(priority, (key, g), g)
+
+    def close(self, key):
+        g, h = self.open.pop(key)
+        self._count(g, h, -1)
+        self.expanded += 1
+
+    def best(self):
+        """(priority, state, g) of the best open state, None if there is none"""
+        top = self.top
+        while top is None or self.open.get(top[1], (None,))[0] != top[2]:
+            if not self.queue:
+                self.top = None
+                return None
+            priority, (key, g) = self.queue.pop()
+            top = (priority, key, g)
+        self.top = top
+        return top
+
+    def lower_bounds(self):
+        """(smallest f, smallest g) over the open states"""
+        while not self.f_count[self.f_min]:
+            self.f_min += 1
+        while not self.g_count[self.g_min]:
+            self.g_min += 1
+        return self.f_min, self.g_min
+
+    def moves_to_root(self, key):
+        """Move indices recorded from key back to the root"""
+        moves = []
+        while self.parent[key] is not None:
+            key, m = self.parent[key]
+            moves.append(m)
+        return moves
+
+def mm_search(start_key, goal_key, compiled, heuristic_forward, heuristic_backward, start_time, time_limit):
+    """
+    Bidirectional heuristic search MM
+
+    Each step expands the best node of the side whose best priority
+    max(g + h, 2g) is lower. The search stops once the best meeting found is
+    no longer than max(C, fmin forward, fmin backward, gmin forward + gmin
+    backward + 1), C being the smaller best priority. That bound proves the
+    meeting optimal only if both heuristics are admissible, like the pattern
+    databases of mm_heuristics. heuristic_2x2 and heuristic_3x3 overestimate
+    (h = 2 one quarter turn from solved), so with them the solution is
+    usually short but not guaranteed optimal.
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves with an inverse for every move
+        heuristic_forward: Function h(key, g) estimating the distance to goal_key
+        heuristic_backward: Function h(key, g) estimating the distance from start_key
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated, stats)
+               stats is a dict with forward_expanded and backward_expanded
+    """
+    apply = compiled.apply
+    inverse = compiled.inverse
+    if min(inverse) < 0:
+        raise ValueError("Bidirectional search needs an inverse for every move")
+    deadline = start_time + time_limit
+    n = len(apply)
+
+    sides = (_Side(start_key, heuristic_forward(start_key, 0)),
+             _Side(goal_key, heuristic_backward(goal_key, 0)))
+    heuristics = (heuristic_forward, heuristic_backward)
+    steps = (list(range(n)), [inverse[m] for m in range(n)])
+    best_length = 0 if start_key == goal_key else None
+    meet = start_key
+    nodes = 0
+    next_check = TIME_CHECK_INTERVAL
+    timed_out = False
+
+    while True:
+        tops = [side.best() for side in sides]
+        if tops[0] is None or tops[1] is None:
+            break
+        if best_length is not None:
+            f_forward, g_forward = sides[0].lower_bounds()
+            f_backward, g_backward = sides[1].lower_bounds()
+            if best_length <= max(min(tops[0][0], tops[1][0]), f_forward, f_backward,
+                                  g_forward + g_backward + 1):
+                break
+
+        d = 0 if tops[0][0] <= tops[1][0] else 1
+        own, other = sides[d], sides[1 - d]
+        _, key, g = tops[d]
+        own.top = None
+        own.close(key)
+        child_g = g + 1
+        h = heuristics[d]
+        for m in range(n):
+            child = apply[steps[d][m]](key)
+            nodes += 1
+            old = own.g.get(child)
+            if old is not None and old <= child_g:
+                continue
+            own.add(child, child_g, h(child, child_g), key, m)
+            other_g = other.g.get(child)
+            if other_g is not None and (best_length is None or child_g + other_g < best_length):
+                best_length = child_g + other_g
+                meet = child
+
+        if nodes >= next_check:
+            if time.time() >= deadline:
+                timed_out = True
+                break
+            next_check += TIME_CHECK_INTERVAL
+
+    stats = {"forward_expanded": sides[0].expanded, "backward_expanded": sides[1].expanded}
+    if best_length is None or timed_out:
+        return None, nodes, stats
+    forward = sides[0].moves_to_root(meet)
+    forward.reverse()
+    backward = sides[1].moves_to_root(meet)
+    return [compiled.names[m] for m in forward + backward], nodes, stats
@@ -0,0 +1,89 @@
+"""
+Checkpoint files of long-running searches
+
+A checkpoint is a small pickled dict: the kind of search, a signature of the
+problem (start, goal, options), so that a file is never resumed by another
+search, and the resumable state of the search (for IDA* the threshold and
+the path prefix it was working on, for a BFS the layer and the chunk of it).
+
+Writes are atomic: the dict goes to a temporary file in the same directory,
+which is flushed to disk and then renamed over the old checkpoint with
+os.replace. A crash during a write leaves the previous checkpoint intact.
+"""
+
+import os
+import pickle
+import time
+
+# Seconds between two checkpoint writes
+CHECKPOINT_INTERVAL = 300.0
+
+FORMAT_VERSION = 1
+
+class Checkpoint:
+    """
+    Checkpoint file of one search
+
+    Attributes:
+        path: File of the checkpoint
+        interval: Seconds between two writes (due() is true once they passed)
+        saves: Number of checkpoints written
+    """
+    def __init__(self, path, kind, signature, interval=CHECKPOINT_INTERVAL):
+        """
+        Args:
+            path: File of the checkpoint
+            kind: Name of the search writing it
+            signature: Picklable description of the problem; a checkpoint with another
+                       kind or signature is ignored by load()
+            interval: Seconds between two writes
+        """
+        self.path = path
+        self.kind = kind
+        self.signature = signature
+        self.interval = interval
+        self.saves = 0
+        self.next_save = time.time() + interval
+
+    def load(self):
+        """
+        Resumable state of an earlier run of the same search
+
+        Returns:
+            dict: State passed to save(), or None if there is no usable checkpoint
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Error loading checkpoint from {self.path}: {e}")
+            return None
+        if (data.get("version") != FORMAT_VERSION or data.get("kind") != self.kind or
+                data.get("signature") != self.signature):
+            print(f"Ignoring checkpoint {self.path}: written by another search")
+            return None
+        return data["state"]
+
+    def due(self):
+        """True when the interval since the last write has passed"""
+        return time.time() >= self.next_save
+
+    def save(self, state):
+        """Write the resumable state atomically"""
+        data = {"version": FORMAT_VERSION, "kind": self.kind, "signature": self.signature, "state": state}
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.saves += 1
+        self.next_save = time.time() + self.interval
+
+    def clear(self):
+        """Delete the checkpoint, once the search has finished"""
+        for path in (self.path, self.path + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
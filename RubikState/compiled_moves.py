@@ -0,0 +1,270 @@
+"""
+Compiled move tables for fast depth-first search
+
+A state is encoded as a flat tuple of sticker values. Slot i of a corner has
+three stickers holding cp[i] * 3 + (k + co[i]) % 3 for k = 0, 1, 2 and slot j
+of an edge has two stickers holding ep[j] * 2 + (k + eo[j]) % 2. Sticker k = 0
+of every slot comes first, so key[:8] (2x2) or key[:20] (3x3) is the cubie
+encoding cp * 3 + co / ep * 2 + eo. Because orientation is carried by which
+sticker sits where, every move becomes a pure permutation of the tuple and is
+applied with a single itemgetter call, and the tuple doubles as the state key.
+
+The module also derives canonical move pruning (no move followed by its
+inverse, no three equal quarter turns, a fixed order for commuting moves) and
+a heuristic that reproduces heuristic_2x2 / heuristic_3x3 on encoded states.
+"""
+
+from operator import getitem, itemgetter
+
+from RubikState.rubik_chen import RubikState, calculate_parity, heuristic_3x3
+from RubikState.rubik_2x2 import Rubik2x2State, heuristic_2x2
+
+class CompiledMoves:
+    """
+    Move tables compiled from a moves dictionary (MOVES_2x2, MOVES_3x3 or compatible)
+
+    Attributes:
+        names: Move names, indexed by move index
+        slots: Number of leading key entries holding the cubie encoding
+        sources: sources[m][s] is the sticker moved to position s by move m
+        apply: List of itemgetters, apply[m](key) returns the key after move m
+        inverse: inverse[m] is the index of the inverse move (-1 if none)
+        allowed: allowed[ctx] lists the move indices permitted after context ctx
+        next_ctx: next_ctx[ctx][m] is the context after playing move m in ctx
+        root_ctx: Context of the root node (every move allowed)
+    """
+    def __init__(self, moves_dict):
+        self.names = list(moves_dict.keys())
+        self.has_edges = 'ep' in moves_dict[self.names[0]]
+        self.slots = 20 if self.has_edges else 8
+        self.size = 48 if self.has_edges else 24
+
+        # Sticker index of (corner slot, k) and (edge slot, k)
+        if self.has_edges:
+            self.corner_index = [[i, 20 + i, 28 + i] for i in range(8)]
+            self.edge_index = [[8 + j, 36 + j] for j in range(12)]
+        else:
+            self.corner_index = [[i, 8 + i, 16 + i] for i in range(8)]
+            self.edge_index = []
+
+        self.sources = []  # Sticker read by each destination sticker, per move
+        self.apply = []
+        for name in self.names:
+            move_def = moves_dict[name]
+            sources = [0] * self.size
+            for i in range(8):
+                src, d = move_def['cp'][i], move_def['co'][i]
+                for k in range(3):
+                    sources[self.corner_index[i][k]] = self.corner_index[src][(k + d) % 3]
+            if self.has_edges:
+                for j in range(12):
+                    src, d = move_def['ep'][j], move_def['eo'][j]
+                    for k in range(2):
+                        sources[self.edge_index[j][k]] = self.edge_index[src][(k + d) % 2]
+            self.sources.append(tuple(sources))
+            self.apply.append(itemgetter(*sources))
+
+        self._derive_pruning(moves_dict)
+        self._derive_invariants(moves_dict)
+
+    def encode(self, state):
+        """Encode a RubikState or Rubik2x2State as a tuple of sticker values"""
+        key = [0] * self.size
+        for i in range(8):
+            for k in range(3):
+                key[self.corner_index[i][k]] = state.cp[i] * 3 + (k + state.co[i]) % 3
+        if self.has_edges:
+            for j in range(12):
+                for k in range(2):
+                    key[self.edge_index[j][k]] = state.ep[j] * 2 + (k + state.eo[j]) % 2
+        return tuple(key)
+
+    def decode(self, key):
+        """Inverse of encode"""
+        cp = tuple(v // 3 for v in key[:8])
+        co = tuple(v % 3 for v in key[:8])
+        if not self.has_edges:
+            return Rubik2x2State(cp, co)
+        ep = tuple(v // 2 for v in key[8:20])
+        eo = tuple(v % 2 for v in key[8:20])
+        return RubikState(cp, co, ep, eo)
+
+    def relative_to(self, target_key):
+        """
+        Express states relative to a target state
+
+        A state is a permutation of sticker values, and a move composes it with
+        the permutation of the move, so the moves taking key to target_key are
+        exactly the moves taking f(key) to solved, with f the returned function.
+        Heuristics that measure the distance to solved then estimate the
+        distance to target_key.
+
+        Args:
+            target_key: Encoded target state
+
+        Returns:
+            function: f(key) -> encoded state
+        """
+        solved = self.encode(RubikState() if self.has_edges else Rubik2x2State())
+        corner_positions = {index for stickers in self.corner_index for index in stickers}
+        # Position of each sticker value in the target, corners and edges apart
+        where = ({}, {})
+        for position, value in enumerate(target_key):
+            where[position not in corner_positions][value] = position
+        maps = [tuple(solved[where[kind][value]] for value in range(len(where[kind])))
+                for kind in (0, 1)]
+        per_position = tuple(maps[position not in corner_positions] for position in range(self.size))
+        return lambda key: tuple(map(getitem, per_position, key))
+
+    def apply_sequence(self, key, move_indices):
+        """Apply a sequence of move indices to an encoded state"""
+        apply = self.apply
+        for m in move_indices:
+            key = apply[m](key)
+        return key
+
+    def _derive_pruning(self, moves_dict):
+        """Build the canonical move pruning contexts from the move definitions"""
+        solved = self.encode(RubikState() if self.has_edges else Rubik2x2State())
+        n = len(self.names)
+        after = [self.apply[m](solved) for m in range(n)]
+
+        # Inverse moves and faces (a face groups a move with its inverse)
+        self.inverse = [-1] * n
+        for a in range(n):
+            for b in range(n):
+                if self.apply[b](after[a]) == solved:
+                    self.inverse[a] = b
+        face = list(range(n))
+        for m in range(n):
+            if self.inverse[m] >= 0:
+                face[m] = min(m, self.inverse[m])
+
+        # Moves of different faces that commute (opposite faces)
+        commute = [[face[a] != face[b] and
+                    self.apply[b](after[a]) == self.apply[a](after[b])
+                    for b in range(n)] for a in range(n)]
+
+        # Context = last move * 2 + (1 if the last two moves were equal)
+        self.root_ctx = 2 * n
+        self.allowed = []
+        self.next_ctx = []
+        for ctx in range(2 * n + 1):
+            last, repeated = divmod(ctx, 2)
+            allowed = []
+            for m in range(n):
+                if ctx == self.root_ctx:
+                    allowed.append(m)
+                    continue
+                if m == self.inverse[last]:
+                    continue
+                if m == last and (repeated or face[m] != m):
+                    # Three equal quarter turns, or X' X' instead of the canonical X X
+                    continue
+                if commute[m][last] and face[m] < face[last]:
+                    continue
+                allowed.append(m)
+            self.allowed.append(tuple(allowed))
+            self.next_ctx.append(tuple(m * 2 + (1 if ctx != self.root_ctx and m == last else 0)
+                                       for m in range(n)))
+
+    def _derive_invariants(self, moves_dict):
+        """Record how each move changes parities and orientation sums"""
+        corner_flips = {calculate_parity(moves_dict[name]['cp']) for name in self.names}
+        edge_flips = {calculate_parity(moves_dict[name]['ep']) for name in self.names} if self.has_edges else {0}
+        twist_sums = {sum(moves_dict[name]['co']) % 3 for name in self.names}
+        flip_sums = {sum(moves_dict[name]['eo']) % 2 for name in self.names} if self.has_edges else {0}
+
+        # Parity terms then only depend on the parity of g, orientation sums are constant
+        self.uniform = (len(corner_flips) == 1 and len(edge_flips) == 1 and
+                        twist_sums == {0} and flip_sums == {0})
+        self.corner_parity_flip = corner_flips.pop() if len(corner_flips) == 1 else None
+        self.edge_parity_flip = edge_flips.pop() if len(edge_flips) == 1 else None
+
+_compiled_cache = {}
+
+def get_compiled_moves(moves_dict):
+    """Return the CompiledMoves for a moves dictionary, compiling it on first use"""
+    entry = _compiled_cache.get(id(moves_dict))
+    if entry is None or entry[0] is not moves_dict:
+        entry = (moves_dict, CompiledMoves(moves_dict))
+        _compiled_cache[id(moves_dict)] = entry
+    return entry[1]
+
+def heuristic_terms(compiled, start_key):
+    """
+    Components of the heuristic of make_heuristic for a uniform move set
+
+    h(key, g) = max(((total & 31) >> 2), (total >> 7), extra[g & 1]) where
+    total = sum(map(getitem, contrib, key)): misplaced plus misoriented corner
+    counts in the low 5 bits, edge counts above.
+
+    Args:
+        compiled: CompiledMoves of the search (compiled.uniform must be true)
+        start_key: Encoded start state (g = 0)
+
+    Returns:
+        tuple: (contrib, extra) with contrib[slot][value] the count of one slot
+               and extra the parity/orientation term for even and odd g
+    """
+    # Per-slot contributions of the cubie part key[:slots]: corners in the
+    # low 5 bits, edges above (map() stops after the last table)
+    contrib = [tuple((v // 3 != i) + (v % 3 != 0) for v in range(24)) for i in range(8)]
+    if compiled.has_edges:
+        contrib += [tuple(((v // 2 != i) + (v % 2 != 0)) << 5 for v in range(24)) for i in range(12)]
+    contrib = tuple(contrib)
+
+    start = compiled.decode(start_key)
+    corner_parity = calculate_parity(start.cp)
+    orient_bad = sum(start.co) % 3 != 0
+
+    if compiled.has_edges:
+        orient_bad = orient_bad or sum(start.eo) % 2 != 0
+        parity_diff = corner_parity != calculate_parity(start.ep)
+        flip = compiled.corner_parity_flip ^ compiled.edge_parity_flip
+        extra = (max(int(parity_diff), int(orient_bad)),
+                 max(int(parity_diff ^ flip), int(orient_bad)))
+    else:
+        flip = compiled.corner_parity_flip
+        extra = (max(corner_parity, int(orient_bad)),
+                 max(corner_parity ^ flip, int(orient_bad)))
+    return contrib, extra
+
+def make_heuristic(compiled, start_key):
+    """
+    Build h(key, g) reproducing heuristic_2x2 / heuristic_3x3 on encoded states.
+
+    Misplaced/misoriented counts come from per-slot lookup tables. For the
+    standard move sets parity and orientation-sum terms are not recomputed:
+    they are derived from the start state and the parity of g.
+
+    Args:
+        compiled: CompiledMoves of the search
+        start_key: Encoded start state (g = 0)
+
+    Returns:
+        function: h(key, g) -> int
+    """
+    if not compiled.uniform:
+        scalar = heuristic_3x3 if compiled.has_edges else heuristic_2x2
+        decode = compiled.decode
+        return lambda key, g: scalar(decode(key))
+
+    contrib, extra = heuristic_terms(compiled, start_key)
+
+    if compiled.has_edges:
+        def h(key, g):
+            total = sum(map(getitem, contrib, key))
+            hc = (total & 31) >> 2
+            he = total >> 7
+            if he > hc:
+                hc = he
+            x = extra[g & 1]
+            return hc if hc > x else x
+        return h
+
+    def h(key, g):
+        hc = sum(map(getitem, contrib, key)) >> 2
+        x = extra[g & 1]
+        return hc if hc > x else x
+    return h
@@ -0,0 +1,116 @@
+"""
+Integer coordinates for Rubik's cube states
+
+This module converts permutations and orientation vectors into dense integer
+indices (and back), both one state at a time and vectorized over NumPy arrays.
+The indices are used to address packed lookup tables such as pattern databases.
+"""
+
+import numpy as np
+
+# Giai thừa 0!..12! dùng cho mã Lehmer
+FACTORIALS = [1]
+for _i in range(1, 13):
+    FACTORIALS.append(FACTORIALS[-1] * _i)
+
+def permutation_rank(perm):
+    """
+    Rank a permutation of 0..n-1 in lexicographic order (Lehmer code)
+
+    Args:
+        perm: Sequence containing each of 0..n-1 exactly once
+
+    Returns:
+        int: Rank in range [0, n!)
+    """
+    n = len(perm)
+    rank = 0
+    for i in range(n):
+        smaller = 0
+        for j in range(i + 1, n):
+            if perm[j] < perm[i]:
+                smaller += 1
+        rank += smaller * FACTORIALS[n - 1 - i]
+    return rank
+
+def permutation_unrank(rank, n):
+    """
+    Inverse of permutation_rank
+
+    Args:
+        rank: Rank in range [0, n!)
+        n: Length of the permutation
+
+    Returns:
+        tuple: Permutation of 0..n-1
+    """
+    remaining = list(range(n))
+    perm = []
+    for i in range(n - 1, -1, -1):
+        index, rank = divmod(rank, FACTORIALS[i])
+        perm.append(remaining.pop(index))
+    return tuple(perm)
+
+def permutation_rank_batch(perms):
+    """
+    Vectorized permutation_rank
+
+    Args:
+        perms: (N, n) integer array, one permutation per row
+
+    Returns:
+        np.ndarray: (N,) int64 array of ranks
+    """
+    perms = np.asarray(perms)
+    n = perms.shape[1]
+    ranks = np.zeros(perms.shape[0], dtype=np.int64)
+    for i in range(n - 1):
+        smaller = (perms[:, i + 1:] < perms[:, i:i + 1]).sum(axis=1)
+        ranks += smaller * FACTORIALS[n - 1 - i]
+    return ranks
+
+def calculate_parity_batch(perms):
+    """
+    Parity of every row of an (N, n) permutation array, by counting inversions
+
+    Args:
+        perms: (N, n) integer array, one permutation per row
+
+    Returns:
+        np.ndarray: (N,) int8 array, 1 for odd permutations
+    """
+    perms = np.asarray(perms)
+    i, j = np.triu_indices(perms.shape[1], 1)
+    return ((perms[:, i] > perms[:, j]).sum(axis=1) & 1).astype(np.int8)
+
+def orientation_rank(orientation, base):
+    """
+    Read an orientation vector as a number in the given base (first digit most significant)
+
+    Args:
+        orientation: Sequence of digits in range [0, base)
+        base: 3 for corners, 2 for edges
+
+    Returns:
+        int: Rank in range [0, base ** len(orientation))
+    """
+    rank = 0
+    for value in orientation:
+        rank = rank * base + value
+    return rank
+
+def orientation_rank_batch(orientations, base):
+    """
+    Vectorized orientation_rank
+
+    Args:
+        orientations: (N, n) integer array, one orientation vector per row
+        base: 3 for corners, 2 for edges
+
+    Returns:
+        np.ndarray: (N,) int64 array of ranks
+    """
+    orientations = np.asarray(orientations, dtype=np.int64)
+    n = orientations.shape[1]
+    weights = base ** np.arange(n - 1, -1, -1, dtype=np.int64)
+    return orientations @ weights
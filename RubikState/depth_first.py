@@ -0,0 +1,829 @@
+"""
+Iterative depth-first search engine shared by the 2x2 and 3x3 solvers
+
+The search works on states encoded by RubikState.compiled_moves. It uses an
+explicit stack and one mutable move array instead of recursion and path
+copies, and prunes redundant move sequences with the canonical move contexts
+of CompiledMoves. An optional TranspositionTable (search_structures) cuts
+subtrees already searched through another move order and raises h with the
+backed-up bounds of earlier iterations. The uninformed DFS and IDS use
+depth_limited_dfs, which has no heuristic and only checks cycles against the
+current path. An optional MoveOrdering makes any of them try the children
+with the smallest heuristic first, ties broken by history and killer moves.
+bounded_dfs can report its position (path prefix and child cursors) to a
+checkpoint and resume from one, which ida_star uses to survive restarts.
+"""
+
+import time
+
+# How many generated nodes between two time-limit checks
+TIME_CHECK_INTERVAL = 4096
+
+# How many ancestors depth_limited_dfs compares a child with
+CYCLE_WINDOW = 8
+
+class MoveOrdering:
+    """
+    Heuristic ordering of the children of a node
+
+    All children of a node are generated at once and tried by increasing h.
+    Ties are broken first by the killer moves of the depth, then by the
+    history score of the move after the node's pruning context. Both are
+    learned from progress: a move whose child has a smaller h than its parent
+    and is searched (not cut by the threshold) becomes a killer at that depth
+    and gains history. The tables persist across iterations of an IDA* or
+    IDS, so the last iteration, which finds the solution, benefits from
+    everything learned before it.
+
+    Generating all children up front costs the children that a node-by-node
+    search would not reach once the solution is found, so the node counts
+    are comparable: every generated child is counted.
+    """
+    def __init__(self, compiled, heuristic, killers=2):
+        """
+        Args:
+            compiled: CompiledMoves of the search
+            heuristic: Function h(key, g) used to sort the children
+            killers: Killer moves remembered per depth
+        """
+        self.apply = compiled.apply
+        self.allowed = compiled.allowed
+        self.heuristic = heuristic
+        self.history = [[0] * len(compiled.apply) for _ in compiled.allowed]
+        self.killers = []  # Killer moves per depth, most recent first
+        self.max_killers = killers
+
+    def expand(self, key, ctx, g):
+        """
+        Children of a node at depth g, best first
+
+        Returns:
+            tuple: (moves, child keys, child h values) in the order to try
+        """
+        apply = self.apply
+        heuristic = self.heuristic
+        history = self.history[ctx]
+        killers = self.killers[g] if g < len(self.killers) else ()
+        child_g = g + 1
+        scored = []
+        for m in self.allowed[ctx]:
+            child = apply[m](key)
+            h = heuristic(child, child_g)
+            scored.append((h, m not in killers, -history[m], m, child))
+        scored.sort()
+        return (tuple(entry[3] for entry in scored), [entry[4] for entry in scored],
+                [entry[0] for entry in scored])
+
+    def record(self, ctx, m, g):
+        """Move m played after context ctx at depth g made progress"""
+        self.history[ctx][m] += 1
+        while len(self.killers) <= g:
+            self.killers.append([])
+        killers = self.killers[g]
+        if m in killers:
+            killers.remove(m)
+        killers.insert(0, m)
+        del killers[self.max_killers:]
+
+def bounded_dfs(start_key, goal_key, compiled, heuristic, threshold, deadline, table=None,
+                root_g=0, root_ctx=None, stop=None, endgame=None, ordering=None, resume=None,
+                checkpoint=None):
+    """
+    Depth-first search of all canonical paths with g + h <= threshold
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes
+        heuristic: Function h(key, g)
+        threshold: Inclusive bound on f = g + h
+        deadline: Absolute time (time.time()) after which the search stops
+        table: Optional TranspositionTable, new_iteration() must have been called
+               (only for a search from the root, root_g = 0)
+        root_g: g of start_key, when searching the subtree below a path prefix
+        root_ctx: Move pruning context of start_key (default compiled.root_ctx)
+        stop: Optional event (threading or multiprocessing), the search gives
+              up like on a timeout once it is set
+        endgame: Optional EndgameTable (goal_key must be solved and heuristic
+                 wrapped by endgame.heuristic); a child with h <= endgame.depth
+                 is finished by a table walk instead of being searched
+        ordering: Optional MoveOrdering sorting the children; its heuristic
+                  replaces heuristic, so it must be the same function
+        resume: Optional position reported to checkpoint by an earlier call with the
+                same arguments; the search continues from there
+        checkpoint: Optional function checkpoint(position, nodes, final), called at
+                    every time check (final False) and on a timeout (final True);
+                    position is (path prefix, child cursors, next_threshold so far)
+
+    Returns:
+        tuple: (move_indices or None, next_threshold, nodes_generated, timed_out)
+               move_indices start at start_key, next_threshold is the smallest f
+               that exceeded threshold (inf if none)
+    """
+    if start_key == goal_key:
+        return [], threshold, 1, False
+    if (resume is not None or checkpoint is not None) and (table is not None or ordering is not None):
+        raise ValueError("Checkpoints need the fixed move order and no transposition table")
+    if table is not None:
+        if root_g or root_ctx is not None or stop is not None:
+            raise ValueError("The transposition table search only runs from the root")
+        return _bounded_dfs_table(start_key, goal_key, compiled, heuristic,
+                                  threshold, deadline, table, endgame, ordering)
+
+    apply = compiled.apply
+    allowed = compiled.allowed
+    next_ctx = compiled.next_ctx
+
+    if root_ctx is None:
+        root_ctx = compiled.root_ctx
+    max_depth = max(threshold - root_g, 0) + 1
+    path = [0] * max_depth           # Move played at each depth (g <= threshold)
+    keys = [None] * (max_depth + 1)  # State at each depth
+    ctxs = [0] * (max_depth + 1)     # Move pruning context at each depth
+    children = [()] * (max_depth + 1)
+    cursor = [0] * (max_depth + 1)   # Next child to try at each depth
+    if ordering is not None:
+        child_keys = [None] * (max_depth + 1)  # Generated children at each depth
+        child_hs = [None] * (max_depth + 1)
+        node_h = [0] * (max_depth + 1)         # h of the state at each depth
+
+    keys[0] = start_key
+    ctxs[0] = root_ctx
+    children[0] = allowed[root_ctx]
+    depth = 0
+    nodes = 1
+    next_check = TIME_CHECK_INTERVAL
+    next_threshold = float('inf')
+    if ordering is not None:
+        children[0], child_keys[0], child_hs[0] = ordering.expand(start_key, root_ctx, root_g)
+        node_h[0] = heuristic(start_key, root_g)
+        nodes += len(children[0])
+    if resume is not None:
+        # Replay the path prefix, then restore the cursors
+        prefix, cursors, next_threshold = resume
+        for depth, m in enumerate(prefix):
+            path[depth] = m
+            keys[depth + 1] = apply[m](keys[depth])
+            ctxs[depth + 1] = next_ctx[ctxs[depth]][m]
+            children[depth + 1] = allowed[ctxs[depth + 1]]
+        depth = len(prefix)
+        cursor[:depth + 1] = cursors
+
+    while True:
+        i = cursor[depth]
+        moves_here = children[depth]
+        if i == len(moves_here):
+            if depth == 0:
+                return None, next_threshold, nodes, False
+            depth -= 1
+            continue
+        cursor[depth] = i + 1
+
+        m = moves_here[i]
+        g = root_g + depth + 1
+        if ordering is None:
+            child = apply[m](keys[depth])
+            nodes += 1
+            h = heuristic(child, g)
+        else:
+            child = child_keys[depth][i]
+            h = child_hs[depth][i]
+        if nodes >= next_check:
+            if time.time() >= deadline or (stop is not None and stop.is_set()):
+                if checkpoint is not None:
+                    checkpoint((tuple(path[:depth]), tuple(cursor[:depth]) + (i,), next_threshold), nodes, True)
+                return None, next_threshold, nodes, True
+            if checkpoint is not None:
+                # The current child i is generated again on resume
+                checkpoint((tuple(path[:depth]), tuple(cursor[:depth]) + (i,), next_threshold), nodes, False)
+            next_check += TIME_CHECK_INTERVAL
+
+        f = g + h
+        if f > threshold:
+            if f < next_threshold:
+                next_threshold = f
+            continue
+
+        if ordering is not None and h < node_h[depth]:
+            ordering.record(ctxs[depth], m, g - 1)
+        path[depth] = m
+        depth += 1
+        if child == goal_key:
+            return path[:depth], threshold, nodes, False
+        if endgame is not None and h <= endgame.depth:
+            tail = endgame.walk(child)
+            if tail is not None:
+                return path[:depth] + tail, threshold, nodes, False
+
+        ctx = next_ctx[ctxs[depth - 1]][m]
+        keys[depth] = child
+        ctxs[depth] = ctx
+        cursor[depth] = 0
+        if ordering is None:
+            children[depth] = allowed[ctx]
+        else:
+            children[depth], child_keys[depth], child_hs[depth] = ordering.expand(child, ctx, g)
+            node_h[depth] = h
+            nodes += len(children[depth])
+
+def _bounded_dfs_table(start_key, goal_key, compiled, heuristic, threshold, deadline, table, endgame=None,
+                       ordering=None):
+    """
+    bounded_dfs with transposition table probes.
+
+    A child is cut when the table holds the same state, reached in this
+    iteration at a smaller g, or at the same g in the same move pruning
+    context: that subtree was (or is being) searched with at least the same
+    budget, and a state on an optimal path can never be reached earlier
+    through a shorter path. When a node is exhausted, the minimum f found
+    below it minus g is a lower bound on its remaining cost in its context
+    and is written back, so later iterations start from a larger h.
+    """
+    apply = compiled.apply
+    allowed = compiled.allowed
+    next_ctx = compiled.next_ctx
+
+    mask = table.mask
+    t_hash = table.hashes
+    t_g = table.g
+    t_bound = table.bound
+    t_ctx = table.ctx
+    t_stamp = table.stamp
+    stamp = table.iteration
+    inf = float('inf')
+
+    max_depth = threshold + 1
+    path = [0] * max_depth
+    keys = [None] * (max_depth + 1)
+    hashes = [0] * (max_depth + 1)   # hash() of keys[depth]
+    ctxs = [0] * (max_depth + 1)
+    children = [()] * (max_depth + 1)
+    cursor = [0] * (max_depth + 1)
+    sub_min = [inf] * (max_depth + 1)  # Lower bound on f found below each depth
+    if ordering is not None:
+        child_keys = [None] * (max_depth + 1)
+        child_hs = [None] * (max_depth + 1)
+        node_h = [0] * (max_depth + 1)
+
+    root_ctx = compiled.root_ctx
+    hk = hash(start_key)
+    slot = hk & mask
+    if not (t_stamp[slot] and t_hash[slot] == hk) or t_ctx[slot] != root_ctx:
+        t_bound[slot] = 0
+    t_hash[slot] = hk
+    t_g[slot] = 0
+    t_ctx[slot] = root_ctx
+    t_stamp[slot] = stamp
+
+    keys[0] = start_key
+    hashes[0] = hk
+    ctxs[0] = root_ctx
+    children[0] = allowed[root_ctx]
+    depth = 0
+    nodes = 1
+    next_check = TIME_CHECK_INTERVAL
+    next_threshold = inf
+    if ordering is not None:
+        children[0], child_keys[0], child_hs[0] = ordering.expand(start_key, root_ctx, 0)
+        node_h[0] = heuristic(start_key, 0)
+        nodes += len(children[0])
+
+    while True:
+        i = cursor[depth]
+        moves_here = children[depth]
+        if i == len(moves_here):
+            # Node exhausted: back up its bound
+            low = sub_min[depth]
+            if low != inf:
+                hk = hashes[depth]
+                slot = hk & mask
+                if t_hash[slot] == hk and t_ctx[slot] == ctxs[depth]:
+                    b = low - depth
+                    if b > t_bound[slot]:
+                        t_bound[slot] = b if b < 255 else 255
+            if depth == 0:
+                return None, next_threshold, nodes, False
+            depth -= 1
+            if low < sub_min[depth]:
+                sub_min[depth] = low
+            continue
+        cursor[depth] = i + 1
+
+        m = moves_here[i]
+        g = depth + 1
+        if ordering is None:
+            child = apply[m](keys[depth])
+            nodes += 1
+            h = heuristic(child, g)
+        else:
+            child = child_keys[depth][i]
+            h = child_hs[depth][i]
+        if nodes >= next_check:
+            if time.time() >= deadline:
+                return None, next_threshold, nodes, True
+            next_check += TIME_CHECK_INTERVAL
+
+        ctx = next_ctx[ctxs[depth]][m]
+        hk = hash(child)
+        slot = hk & mask
+        known = t_stamp[slot] and t_hash[slot] == hk
+        if known and t_ctx[slot] == ctx and t_bound[slot] > h:
+            h = t_bound[slot]
+
+        f = g + h
+        if f > threshold:
+            if f < next_threshold:
+                next_threshold = f
+            if f < sub_min[depth]:
+                sub_min[depth] = f
+            continue
+
+        if known and t_stamp[slot] == stamp and (
+                t_g[slot] < g or (t_g[slot] == g and t_ctx[slot] == ctx)):
+            # Duplicate of a node searched with at least the same budget
+            if f < sub_min[depth]:
+                sub_min[depth] = f
+            continue
+
+        if child == goal_key:
+            path[depth] = m
+            return path[:g], threshold, nodes, False
+        if endgame is not None and h <= endgame.depth:
+            tail = endgame.walk(child)
+            if tail is not None:
+                path[depth] = m
+                return path[:g] + tail, threshold, nodes, False
+
+        # Store the node, depth-preferred replacement
+        if known or t_stamp[slot] != stamp or t_g[slot] >= g:
+            if not known or t_ctx[slot] != ctx:
+                t_bound[slot] = h if h < 255 else 255
+            t_hash[slot] = hk
+            t_g[slot] = g
+            t_ctx[slot] = ctx
+            t_stamp[slot] = stamp
+
+        if ordering is not None:
+            if h < node_h[depth]:
+                ordering.record(ctxs[depth], m, depth)
+            children[g], child_keys[g], child_hs[g] = ordering.expand(child, ctx, g)
+            node_h[g] = h
+            nodes += len(children[g])
+        else:
+            children[g] = allowed[ctx]
+        path[depth] = m
+        keys[g] = child
+        hashes[g] = hk
+        ctxs[g] = ctx
+        cursor[g] = 0
+        sub_min[g] = inf
+        depth = g
+
+def goal_predecessors(compiled, goal_key):
+    """
+    States one move before the goal
+
+    Args:
+        compiled: CompiledMoves of the search
+        goal_key: Encoded goal state
+
+    Returns:
+        dict: key -> index of the move that turns key into goal_key
+    """
+    predecessors = {}
+    for m, sources in enumerate(compiled.sources):
+        key = [None] * len(goal_key)
+        for position, source in enumerate(sources):
+            key[source] = goal_key[position]
+        predecessors.setdefault(tuple(key), m)
+    return predecessors
+
+def depth_limited_dfs(start_key, goal_key, compiled, limit, deadline, goal_moves=None,
+                      cycle_window=CYCLE_WINDOW, endgame=None, ordering=None, table=None):
+    """
+    Depth-first search of all canonical paths of at most limit moves
+
+    Besides canonical move pruning, a child equal to one of its last
+    cycle_window ancestors is cut (a cycle on the current path; there is no
+    global visited set, so every state within the limit stays reachable).
+    With goal_moves, nodes at depth limit - 1 are looked up instead of
+    expanded, so the last layer is never generated. With an endgame table,
+    nodes at most endgame.depth moves above the limit are looked up instead,
+    and finished by a table walk when they are close enough. With a
+    transposition table, duplicates reached through another move order are
+    cut as well (see _depth_limited_dfs_table).
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes
+        limit: Maximum number of moves
+        deadline: Absolute time (time.time()) after which the search stops
+        goal_moves: Optional result of goal_predecessors(compiled, goal_key)
+        cycle_window: How many ancestors a child is compared with
+        endgame: Optional EndgameTable (goal_key must be solved)
+        ordering: Optional MoveOrdering sorting the children (its heuristic only
+                  orders, nothing is pruned)
+        table: Optional TranspositionTable, new_iteration() must have been called
+
+    Returns:
+        tuple: (move_indices or None, nodes_generated, timed_out)
+    """
+    if start_key == goal_key:
+        return [], 1, False
+    if limit <= 0:
+        return None, 1, False
+    if endgame is not None and limit <= endgame.depth:
+        distance = endgame.lookup(start_key)
+        if distance is None or distance > limit:
+            return None, 1, False
+        return endgame.walk(start_key), 1, False
+    if goal_moves is not None and limit == 1:
+        m = goal_moves.get(start_key)
+        return ([m] if m is not None else None), 1, False
+    if table is not None:
+        return _depth_limited_dfs_table(start_key, goal_key, compiled, limit, deadline, goal_moves,
+                                        cycle_window, endgame, ordering, table)
+
+    apply = compiled.apply
+    allowed = compiled.allowed
+    next_ctx = compiled.next_ctx
+
+    # Canonical pruning removes cycles of one or two moves; when every move
+    # flips the corner parity a cycle has an even length
+    step = 2 if compiled.corner_parity_flip == 1 else 1
+    first_back = 4 if step == 2 else 3
+    last = limit - 1 if goal_moves is not None else limit  # Deepest depth that is expanded
+
+    path = [0] * (limit + 1)        # Move played at each depth
+    keys = [None] * (limit + 1)     # State at each depth
+    ctxs = [0] * (limit + 1)        # Move pruning context at each depth
+    children = [()] * (limit + 1)
+    cursor = [0] * (limit + 1)      # Next child to try at each depth
+    if ordering is not None:
+        child_keys = [None] * (limit + 1)  # Generated children at each depth
+        child_hs = [None] * (limit + 1)
+        node_h = [0] * (limit + 1)         # h of the state at each depth
+
+    keys[0] = start_key
+    ctxs[0] = compiled.root_ctx
+    children[0] = allowed[ctxs[0]]
+    depth = 0
+    nodes = 1
+    next_check = TIME_CHECK_INTERVAL
+    if ordering is not None:
+        children[0], child_keys[0], child_hs[0] = ordering.expand(start_key, ctxs[0], 0)
+        node_h[0] = ordering.heuristic(start_key, 0)
+        nodes += len(children[0])
+
+    while True:
+        i = cursor[depth]
+        moves_here = children[depth]
+        if i == len(moves_here):
+            if depth == 0:
+                return None, nodes, False
+            depth -= 1
+            continue
+        cursor[depth] = i + 1
+
+        m = moves_here[i]
+        g = depth + 1
+        if ordering is None:
+            child = apply[m](keys[depth])
+            nodes += 1
+        else:
+            child = child_keys[depth][i]
+        if nodes >= next_check:
+            if time.time() >= deadline:
+                return None, nodes, True
+            next_check += TIME_CHECK_INTERVAL
+
+        if child == goal_key:
+            path[depth] = m
+            return path[:g], nodes, False
+        if g == last + 1:
+            continue
+        if endgame is not None and limit - g <= endgame.depth:
+            # Only the table can finish within the limit from here
+            distance = endgame.lookup(child)
+            if distance is not None and distance <= limit - g:
+                tail = endgame.walk(child)
+                if tail is not None:
+                    path[depth] = m
+                    return path[:g] + tail, nodes, False
+            continue
+
+        # Cycle on the current path
+        j = g - first_back
+        stop = g - cycle_window if g > cycle_window else 0
+        while j >= stop and keys[j] != child:
+            j -= step
+        if j >= stop:
+            continue
+
+        path[depth] = m
+        if g == last:
+            # Deepest node: without goal_moves it is a leaf, with them one lookup
+            if goal_moves is not None:
+                final = goal_moves.get(child)
+                if final is not None:
+                    path[g] = final
+                    return path[:g + 1], nodes, False
+            continue
+
+        keys[g] = child
+        ctxs[g] = ctx = next_ctx[ctxs[depth]][m]
+        cursor[g] = 0
+        if ordering is None:
+            children[g] = allowed[ctx]
+        else:
+            h = child_hs[depth][i]
+            if h < node_h[depth]:
+                ordering.record(ctxs[depth], m, depth)
+            children[g], child_keys[g], child_hs[g] = ordering.expand(child, ctx, g)
+            node_h[g] = h
+            nodes += len(children[g])
+        depth = g
+
+def _depth_limited_dfs_table(start_key, goal_key, compiled, limit, deadline, goal_moves, cycle_window,
+                             endgame, ordering, table):
+    """
+    depth_limited_dfs with transposition table probes.
+
+    A child is cut when the table holds the same state, reached in this
+    iteration at a smaller depth, or at the same depth in the same move
+    pruning context: that subtree was (or is being) searched with at least
+    the same number of moves left. When a node is exhausted, no path of at
+    most limit - depth moves leaves it in its context, so limit - depth + 1
+    is written back as its bound; later iterations cut the node while that
+    bound exceeds the moves they have left.
+    """
+    apply = compiled.apply
+    allowed = compiled.allowed
+    next_ctx = compiled.next_ctx
+
+    mask = table.mask
+    t_hash = table.hashes
+    t_g = table.g
+    t_bound = table.bound
+    t_ctx = table.ctx
+    t_stamp = table.stamp
+    stamp = table.iteration
+
+    step = 2 if compiled.corner_parity_flip == 1 else 1
+    first_back = 4 if step == 2 else 3
+    last = limit - 1 if goal_moves is not None else limit  # Deepest depth that is expanded
+
+    path = [0] * (limit + 1)
+    keys = [None] * (limit + 1)
+    hashes = [0] * (limit + 1)      # hash() of keys[depth]
+    ctxs = [0] * (limit + 1)
+    children = [()] * (limit + 1)
+    cursor = [0] * (limit + 1)
+    if ordering is not None:
+        child_keys = [None] * (limit + 1)
+        child_hs = [None] * (limit + 1)
+        node_h = [0] * (limit + 1)
+
+    root_ctx = compiled.root_ctx
+    hk = hash(start_key)
+    slot = hk & mask
+    if not (t_stamp[slot] and t_hash[slot] == hk) or t_ctx[slot] != root_ctx:
+        t_bound[slot] = 0
+    t_hash[slot] = hk
+    t_g[slot] = 0
+    t_ctx[slot] = root_ctx
+    t_stamp[slot] = stamp
+
+    keys[0] = start_key
+    hashes[0] = hk
+    ctxs[0] = root_ctx
+    children[0] = allowed[root_ctx]
+    depth = 0
+    nodes = 1
+    next_check = TIME_CHECK_INTERVAL
+    if ordering is not None:
+        children[0], child_keys[0], child_hs[0] = ordering.expand(start_key, root_ctx, 0)
+        node_h[0] = ordering.heuristic(start_key, 0)
+        nodes += len(children[0])
+
+    while True:
+        i = cursor[depth]
+        moves_here = children[depth]
+        if i == len(moves_here):
+            # Node exhausted: back up its bound
+            hk = hashes[depth]
+            slot = hk & mask
+            if t_hash[slot] == hk and t_ctx[slot] == ctxs[depth]:
+                b = limit - depth + 1
+                if b > t_bound[slot]:
+                    t_bound[slot] = b if b < 255 else 255
+            if depth == 0:
+                return None, nodes, False
+            depth -= 1
+            continue
+        cursor[depth] = i + 1
+
+        m = moves_here[i]
+        g = depth + 1
+        if ordering is None:
+            child = apply[m](keys[depth])
+            nodes += 1
+        else:
+            child = child_keys[depth][i]
+        if nodes >= next_check:
+            if time.time() >= deadline:
+                return None, nodes, True
+            next_check += TIME_CHECK_INTERVAL
+
+        if child == goal_key:
+            path[depth] = m
+            return path[:g], nodes, False
+        if g == last + 1:
+            continue
+        if endgame is not None and limit - g <= endgame.depth:
+            distance = endgame.lookup(child)
+            if distance is not None and distance <= limit - g:
+                tail = endgame.walk(child)
+                if tail is not None:
+                    path[depth] = m
+                    return path[:g] + tail, nodes, False
+            continue
+
+        j = g - first_back
+        stop = g - cycle_window if g > cycle_window else 0
+        while j >= stop and keys[j] != child:
+            j -= step
+        if j >= stop:
+            continue
+
+        path[depth] = m
+        if g == last:
+            if goal_moves is not None:
+                final = goal_moves.get(child)
+                if final is not None:
+                    path[g] = final
+                    return path[:g + 1], nodes, False
+            continue
+
+        ctx = next_ctx[ctxs[depth]][m]
+        hk = hash(child)
+        slot = hk & mask
+        known = t_stamp[slot] and t_hash[slot] == hk
+        if known and t_ctx[slot] == ctx and t_bound[slot] > limit - g:
+            continue
+        if known and t_stamp[slot] == stamp and (
+                t_g[slot] < g or (t_g[slot] == g and t_ctx[slot] == ctx)):
+            # Duplicate of a node searched with at least the same moves left
+            continue
+
+        # Store the node, depth-preferred replacement
+        if known or t_stamp[slot] != stamp or t_g[slot] >= g:
+            if not known or t_ctx[slot] != ctx:
+                t_bound[slot] = 0
+            t_hash[slot] = hk
+            t_g[slot] = g
+            t_ctx[slot] = ctx
+            t_stamp[slot] = stamp
+
+        keys[g] = child
+        hashes[g] = hk
+        ctxs[g] = ctx
+        cursor[g] = 0
+        if ordering is None:
+            children[g] = allowed[ctx]
+        else:
+            h = child_hs[depth][i]
+            if h < node_h[depth]:
+                ordering.record(ctxs[depth], m, depth)
+            children[g], child_keys[g], child_hs[g] = ordering.expand(child, ctx, g)
+            node_h[g] = h
+            nodes += len(children[g])
+        depth = g
+
+def iterative_deepening(start_key, goal_key, compiled, start_time, time_limit, max_depth=20,
+                        endgame=None, ordering=None, stats=None, table=None):
+    """
+    Iterative deepening search: depth_limited_dfs with limits 0, 1, ..., max_depth
+
+    The one-move lookup table of the goal is built once and shared by all
+    iterations, so no iteration generates the states at its depth limit.
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        max_depth: Largest depth limit
+        endgame: Optional EndgameTable (goal_key must be solved)
+        ordering: Optional MoveOrdering shared by all iterations
+        stats: Optional dict, filled with iterations and last_iteration_nodes
+        table: Optional TranspositionTable shared by all iterations
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    deadline = start_time + time_limit
+    goal_moves = goal_predecessors(compiled, goal_key)
+    total_nodes = 0
+
+    for limit in range(max_depth + 1):
+        if table is not None:
+            table.new_iteration()
+        moves, nodes, timed_out = depth_limited_dfs(
+            start_key, goal_key, compiled, limit, deadline, goal_moves, endgame=endgame,
+            ordering=ordering, table=table
+        )
+        total_nodes += nodes
+        if stats is not None:
+            stats.update(iterations=limit + 1, last_iteration_nodes=nodes)
+        if moves is not None:
+            return [compiled.names[m] for m in moves], total_nodes
+        if timed_out:
+            break
+
+    return None, total_nodes
+
+def ida_star(start_key, goal_key, compiled, heuristic, start_time, time_limit,
+             table=None, max_threshold=None, endgame=None, move_ordering=False, stats=None,
+             checkpoint=None):
+    """
+    Iterative-deepening A* on encoded states
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes
+        heuristic: Function h(key, g)
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        table: Optional TranspositionTable shared by all iterations
+        max_threshold: Give up once the threshold would exceed this (None for no bound)
+        endgame: Optional EndgameTable (goal_key must be solved); it sharpens the
+                 heuristic and finishes the search by a table walk
+        move_ordering: Sort the children with a MoveOrdering shared by all iterations
+        stats: Optional dict, filled with iterations and last_iteration_nodes
+        checkpoint: Optional Checkpoint (RubikState.checkpoint) receiving the threshold
+                    and the position in the iteration; the search resumes from it
+                    and deletes it once finished (no table, no move ordering)
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    deadline = start_time + time_limit
+    if endgame is not None:
+        heuristic = endgame.heuristic(heuristic)
+        tail = endgame.walk(start_key)
+        if tail is not None:
+            return [compiled.names[m] for m in tail], 1
+    ordering = MoveOrdering(compiled, heuristic) if move_ordering else None
+    threshold = heuristic(start_key, 0)
+    total_nodes = 0
+    iterations = 0
+    position = None
+
+    save = None
+    if checkpoint is not None:
+        state = checkpoint.load()
+        if state is not None:
+            threshold, position = state["threshold"], state["position"]
+            total_nodes, iterations = state["nodes"], state["iterations"]
+
+        def save(position, nodes, final):
+            if final or checkpoint.due():
+                checkpoint.save({"threshold": threshold, "position": position,
+                                 "nodes": total_nodes + nodes, "iterations": iterations})
+
+    while time.time() < deadline:
+        if max_threshold is not None and threshold > max_threshold:
+            break
+        if table is not None:
+            table.new_iteration()
+        moves, next_threshold, nodes, timed_out = bounded_dfs(
+            start_key, goal_key, compiled, heuristic, threshold, deadline, table, endgame=endgame,
+            ordering=ordering, resume=position, checkpoint=save
+        )
+        position = None
+        total_nodes += nodes
+        iterations += 1
+        if stats is not None:
+            stats.update(iterations=iterations, last_iteration_nodes=nodes)
+
+        if moves is not None:
+            if checkpoint is not None:
+                checkpoint.clear()
+            return [compiled.names[m] for m in moves], total_nodes
+        if timed_out:
+            return None, total_nodes
+        if next_threshold == float('inf'):
+            break
+
+        threshold = next_threshold
+
+    if checkpoint is not None:
+        if time.time() < deadline:
+            checkpoint.clear()  # Search exhausted or bound reached: nothing to resume
+        else:
+            save(None, 0, True)
+    return None, total_nodes
@@ -0,0 +1,411 @@
+"""
+Distributed IDA* over TCP with work stealing
+
+A coordinator splits each IDA* iteration into path prefixes (as
+parallel_search does) and ships them to worker processes, which may run on
+other machines. Messages are JSON objects, one per line; states travel as
+their cp/co/ep/eo lists, never as pickles, so a worker never executes code
+sent over the network.
+
+Coordinator -> worker:
+    {"type": "problem", "moves": moves_dict, "start": state, "goal": state}
+    {"type": "tasks", "tasks": [task, ...], "time_left": seconds}
+    {"type": "steal"}       hand back half of the queued tasks
+    {"type": "cancel"}      drop the queue and stop the running task
+    {"type": "shutdown"}
+Worker -> coordinator:
+    {"type": "hello"}
+    {"type": "result", "id": ..., "moves": [...] or null, "next_threshold": ... or null,
+     "nodes": ..., "timed_out": ...}
+    {"type": "stolen", "tasks": [task, ...]}
+    {"type": "idle", "received": n}
+                            the local queue is empty after n tasks received in total
+    {"type": "cancelled", "nodes": ...}
+with task = {"id": ..., "prefix": [...], "state": state, "ctx": ..., "threshold": ...}.
+
+Every prefix is first queued on some worker. A worker that runs out of tasks
+reports idle, and the coordinator steals half of the queue of the busiest
+worker for it. Workers read their socket at every time check of the search,
+so steal and cancel requests are served while a subtree is being searched.
+"""
+
+import json
+import select
+import socket
+import sys
+import time
+import multiprocessing
+from collections import deque
+
+from RubikState.compiled_moves import get_compiled_moves, make_heuristic
+from RubikState.depth_first import bounded_dfs
+from RubikState.parallel_search import split_prefixes
+from RubikState.rubik_chen import RubikState
+from RubikState.rubik_2x2 import Rubik2x2State
+
+# Seconds to wait for the workers to connect, and for their last node counts after a cancel
+CONNECT_TIMEOUT = 30
+CANCEL_TIMEOUT = 2
+
+def state_to_json(state):
+    """Serialize a RubikState or Rubik2x2State as a dict of lists"""
+    data = {"cp": list(state.cp), "co": list(state.co)}
+    if hasattr(state, "ep"):
+        data["ep"] = list(state.ep)
+        data["eo"] = list(state.eo)
+    return data
+
+def state_from_json(data):
+    """Inverse of state_to_json"""
+    if "ep" in data:
+        return RubikState(tuple(data["cp"]), tuple(data["co"]), tuple(data["ep"]), tuple(data["eo"]))
+    return Rubik2x2State(tuple(data["cp"]), tuple(data["co"]))
+
+class Channel:
+    """Newline-delimited JSON messages over a socket"""
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = b""
+        self.closed = False
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def send(self, message):
+        self.sock.sendall(json.dumps(message).encode() + b"\n")
+
+    def receive(self, timeout=None):
+        """
+        Read the messages that are available
+
+        Args:
+            timeout: Seconds to wait for data (None blocks, 0 only polls)
+
+        Returns:
+            list: Decoded messages, empty if nothing arrived in time
+        """
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        if ready:
+            self.read_available()
+        return self.pop_messages()
+
+    def read_available(self):
+        """Read once from the socket (it must be readable)"""
+        data = self.sock.recv(1 << 16)
+        if not data:
+            self.closed = True
+        self.buffer += data
+
+    def pop_messages(self):
+        """Decode the complete lines in the buffer"""
+        if b"\n" not in self.buffer:
+            return []
+        *lines, self.buffer = self.buffer.split(b"\n")
+        return [json.loads(line) for line in lines if line]
+
+    def close(self):
+        self.sock.close()
+
+class _Worker:
+    """Worker side of the protocol: a task queue served between search steps"""
+    def __init__(self, channel):
+        self.channel = channel
+        self.queue = deque()
+        self.received = 0
+        self.deadline = 0
+        self.cancelled = False
+        self.running = True
+        self.nodes_since_cancel = 0
+        self.moves_dict = None
+        self.compiled = None
+        self.heuristic = None
+        self.goal_key = None
+
+    def handle(self, message):
+        kind = message["type"]
+        if kind == "problem":
+            # Keep the dict alive: get_compiled_moves caches by id
+            self.moves_dict = message["moves"]
+            self.compiled = get_compiled_moves(self.moves_dict)
+            start_key = self.compiled.encode(state_from_json(message["start"]))
+            self.heuristic = make_heuristic(self.compiled, start_key)
+            self.goal_key = self.compiled.encode(state_from_json(message["goal"]))
+        elif kind == "tasks":
+            self.queue.extend(message["tasks"])
+            self.received += len(message["tasks"])
+            self.deadline = time.time() + message["time_left"]
+            self.cancelled = False
+        elif kind == "steal":
+            stolen = [self.queue.pop() for _ in range(len(self.queue) // 2)]
+            self.channel.send({"type": "stolen", "tasks": stolen})
+        elif kind == "cancel":
+            self.queue.clear()
+            self.cancelled = True
+        elif kind == "shutdown":
+            self.queue.clear()
+            self.cancelled = True
+            self.running = False
+
+    def is_set(self):
+        """Stop check of bounded_dfs: serve pending messages, then report a cancel"""
+        for message in self.channel.receive(0):
+            self.handle(message)
+        return self.cancelled or self.channel.closed
+
+    def serve(self):
+        """Run tasks until the coordinator shuts the worker down"""
+        self.channel.send({"type": "hello"})
+        idle_sent = False
+        while self.running and not self.channel.closed:
+            if not self.queue:
+                if self.cancelled:
+                    self.channel.send({"type": "cancelled", "nodes": self.nodes_since_cancel})
+                    self.nodes_since_cancel = 0
+                    self.cancelled = False
+                elif not idle_sent and self.compiled is not None:
+                    self.channel.send({"type": "idle", "received": self.received})
+                    idle_sent = True
+                for message in self.channel.receive(None):
+                    self.handle(message)
+                continue
+            idle_sent = False
+
+            task = self.queue.popleft()
+            key = self.compiled.encode(state_from_json(task["state"]))
+            moves, next_threshold, nodes, timed_out = bounded_dfs(
+                key, self.goal_key, self.compiled, self.heuristic, task["threshold"], self.deadline,
+                root_g=len(task["prefix"]), root_ctx=task["ctx"], stop=self
+            )
+            if self.cancelled:
+                self.nodes_since_cancel += nodes
+                continue
+            self.channel.send({
+                "type": "result",
+                "id": task["id"],
+                "moves": task["prefix"] + moves if moves is not None else None,
+                "next_threshold": None if next_threshold == float('inf') else next_threshold,
+                "nodes": nodes,
+                "timed_out": timed_out,
+            })
+
+def run_worker(host, port):
+    """
+    Connect to a coordinator and solve the subproblems it sends
+
+    Args:
+        host: Coordinator host name or address
+        port: Coordinator port
+    """
+    channel = Channel(socket.create_connection((host, port)))
+    try:
+        _Worker(channel).serve()
+    finally:
+        channel.close()
+
+class _Peer:
+    """Coordinator-side record of a connected worker"""
+    def __init__(self, channel):
+        self.channel = channel
+        self.queued = 0         # Tasks sent and not answered yet
+        self.sent = 0           # Tasks sent since the start, to recognize stale idle messages
+        self.idle = False
+        self.stealing = False   # A steal request is pending
+
+def _accept_workers(server, count, deadline):
+    """Accept count worker connections and wait for their hello"""
+    peers = []
+    while len(peers) < count:
+        timeout = deadline - time.time()
+        if timeout <= 0:
+            raise TimeoutError(f"Only {len(peers)} of {count} workers connected")
+        ready, _, _ = select.select([server], [], [], timeout)
+        if not ready:
+            continue
+        sock, _ = server.accept()
+        channel = Channel(sock)
+        while not channel.receive(max(0.0, deadline - time.time())):
+            if channel.closed or time.time() >= deadline:
+                raise ConnectionError("A worker connected but did not say hello")
+        peers.append(_Peer(channel))
+    return peers
+
+def _run_iteration(peers, tasks, deadline):
+    """
+    Distribute the prefixes of one iteration and collect the results
+
+    Returns:
+        tuple: (move indices or None, next_threshold, nodes, timed_out)
+    """
+    inf = float('inf')
+    next_threshold = inf
+    nodes = 0
+    timed_out = False
+    outstanding = len(tasks)
+    spare = []  # Stolen tasks not yet handed to an idle worker
+
+    # Even shares up front, work stealing fixes the imbalance of the subtrees
+    share = -(-len(tasks) // len(peers))
+    for i, peer in enumerate(peers):
+        batch = tasks[i * share:(i + 1) * share]
+        peer.queued = len(batch)
+        peer.sent += len(batch)
+        peer.idle = not batch
+        peer.stealing = False
+        if batch:
+            peer.channel.send({"type": "tasks", "tasks": batch, "time_left": deadline - time.time()})
+
+    while outstanding:
+        if time.time() >= deadline:
+            return None, next_threshold, nodes, True
+
+        # Give spare tasks to idle workers, otherwise steal from the busiest one
+        for peer in peers:
+            if not peer.idle:
+                continue
+            if spare:
+                batch, spare = spare[:max(1, len(spare) // 2)], spare[max(1, len(spare) // 2):]
+                peer.queued += len(batch)
+                peer.sent += len(batch)
+                peer.idle = False
+                peer.channel.send({"type": "tasks", "tasks": batch, "time_left": deadline - time.time()})
+                continue
+            victim = max((p for p in peers if p is not peer), key=lambda p: p.queued, default=peer)
+            # The task the victim is running counts in queued but cannot be stolen
+            if victim.queued > 1 and not victim.stealing:
+                victim.stealing = True
+                victim.channel.send({"type": "steal"})
+
+        channels = [peer.channel for peer in peers]
+        ready, _, _ = select.select(channels, [], [], min(1.0, max(0.0, deadline - time.time())))
+        for channel in ready:
+            channel.read_available()
+        for peer in peers:
+            if peer.channel.closed:
+                raise ConnectionError("A worker disconnected during the search")
+            for message in peer.channel.pop_messages():
+                kind = message["type"]
+                if kind == "result":
+                    outstanding -= 1
+                    peer.queued -= 1
+                    nodes += message["nodes"]
+                    timed_out = timed_out or message["timed_out"]
+                    if message["moves"] is not None:
+                        return message["moves"], next_threshold, nodes, False
+                    if message["next_threshold"] is not None and message["next_threshold"] < next_threshold:
+                        next_threshold = message["next_threshold"]
+                elif kind == "stolen":
+                    peer.stealing = False
+                    peer.queued -= len(message["tasks"])
+                    spare.extend(message["tasks"])
+                elif kind == "idle" and message["received"] == peer.sent:
+                    peer.idle = True
+    return None, next_threshold, nodes, timed_out
+
+def _cancel(peers):
+    """Broadcast a cancel and collect the node counts of the interrupted tasks"""
+    nodes = 0
+    waiting = []
+    for peer in peers:
+        peer.channel.send({"type": "cancel"})
+        waiting.append(peer)
+    deadline = time.time() + CANCEL_TIMEOUT
+    while waiting and time.time() < deadline:
+        for peer in list(waiting):
+            for message in peer.channel.receive(0.05):
+                if message["type"] == "cancelled":
+                    nodes += message["nodes"]
+                    waiting.remove(peer)
+                    break
+    return nodes
+
+def distributed_ida_star(start_state, goal_state, moves_dict, start_time, time_limit, workers=2,
+                         remote_workers=0, host="127.0.0.1", port=0, split_depth=3):
+    """
+    IDA* with the subtrees of each iteration searched by TCP workers
+
+    Args:
+        start_state: Starting state (RubikState or Rubik2x2State)
+        goal_state: Goal state
+        moves_dict: Dictionary of moves, sent to the workers
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        workers: Worker processes started on this machine
+        remote_workers: Workers started elsewhere with run_worker(host, port)
+        host: Address the coordinator listens on
+        port: Port the coordinator listens on (0 picks a free port, local workers only)
+        split_depth: Length of the path prefixes sent as tasks
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    if workers + remote_workers < 1:
+        raise ValueError("Distributed search needs at least one worker")
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    goal_key = compiled.encode(goal_state)
+    if start_key == goal_key:
+        return [], 1
+    heuristic = make_heuristic(compiled, start_key)
+    deadline = start_time + time_limit
+
+    server = socket.create_server((host, port))
+    port = server.getsockname()[1]
+    processes = [multiprocessing.Process(target=run_worker, args=(host, port), daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    peers = []
+    total_nodes = 0
+    try:
+        peers = _accept_workers(server, workers + remote_workers, time.time() + CONNECT_TIMEOUT)
+        problem = {"type": "problem", "moves": moves_dict,
+                   "start": state_to_json(start_state), "goal": state_to_json(goal_state)}
+        for peer in peers:
+            peer.channel.send(problem)
+
+        threshold = heuristic(start_key, 0)
+        task_id = 0
+        while time.time() < deadline:
+            prefixes, solution, next_threshold, nodes = split_prefixes(
+                start_key, goal_key, compiled, heuristic, threshold, split_depth
+            )
+            total_nodes += nodes
+            if solution is not None:
+                return [compiled.names[m] for m in solution], total_nodes
+
+            tasks = []
+            for prefix, key, ctx in prefixes:
+                tasks.append({"id": task_id, "prefix": list(prefix),
+                              "state": state_to_json(compiled.decode(key)),
+                              "ctx": ctx, "threshold": threshold})
+                task_id += 1
+            moves, sub_threshold, nodes, timed_out = _run_iteration(peers, tasks, deadline)
+            total_nodes += nodes
+            if moves is not None:
+                total_nodes += _cancel(peers)
+                return [compiled.names[m] for m in moves], total_nodes
+            if timed_out:
+                total_nodes += _cancel(peers)
+                break
+            next_threshold = min(next_threshold, sub_threshold)
+            if next_threshold == float('inf'):
+                break
+            threshold = next_threshold
+        return None, total_nodes
+    finally:
+        for peer in peers:
+            try:
+                peer.channel.send({"type": "shutdown"})
+            except OSError:
+                pass
+            peer.channel.close()
+        server.close()
+        for process in processes:
+            process.join(timeout=CANCEL_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+
+if __name__ == "__main__":
+    # Start a worker on another machine: python -m RubikState.distributed_search HOST PORT
+    run_worker(sys.argv[1], int(sys.argv[2]))
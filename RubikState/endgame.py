@@ -0,0 +1,270 @@
+"""
+Endgame database for the 3x3 Rubik's cube
+
+Every state within depth moves of solved (MOVES_3x3, quarter turn metric) is
+stored as a 64-bit key in one sorted array, with its distance to solved in a
+second array at the same index. Both are .npy files opened memory-mapped, so
+several solver processes share one copy and only the pages a search touches
+are read. Depth 6 holds about 1 million states (9 MB), depth 7 about 9.2
+million (83 MB).
+
+A key is a hash of the cubie encoding cp * 3 + co / ep * 2 + eo of each slot
+(key[:20] of RubikState.compiled_moves). Hash collisions only make a state
+outside the table look like a state inside: the distance returned is then
+still a lower bound, and walk() checks every step against the real state, so
+a solution completed from the table is always correct.
+
+For a search the table gives the exact distance of the states it holds and a
+lower bound of depth + 1 for every other state, so the last depth levels of
+every search are replaced by one lookup and a table walk.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from RubikState.compiled_moves import get_compiled_moves
+from RubikState.beam_search import batch_moves
+from RubikState.rubik_chen import SOLVED_STATE_3x3, MOVES_3x3, states_to_array_3x3
+
+ENDGAME_DEPTH = 6
+
+MASK_64 = (1 << 64) - 1
+EDGE_SEED = 0x9E3779B97F4A7C15
+
+# Multipliers of the splitmix64 mixing function
+MIX_1 = 0xBF58476D1CE4E5B9
+MIX_2 = 0x94D049BB133111EB
+
+# Parents expanded at once while building (about 40 MB of children per block)
+BUILD_BLOCK = 1 << 16
+
+def _mix(x):
+    """splitmix64 finalizer on a Python int"""
+    x = ((x ^ (x >> 30)) * MIX_1) & MASK_64
+    x = ((x ^ (x >> 27)) * MIX_2) & MASK_64
+    return x ^ (x >> 31)
+
+def _mix_batch(x):
+    """splitmix64 finalizer on a uint64 array (wraps modulo 2**64)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(MIX_1)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(MIX_2)
+    return x ^ (x >> np.uint64(31))
+
+def cubie_hash(cubies):
+    """
+    64-bit key of a state
+
+    Args:
+        cubies: The 20 values cp * 3 + co of the corner slots, then ep * 2 + eo of the edge slots
+
+    Returns:
+        int: Key in [0, 2**64)
+    """
+    corners = 0
+    for i in range(8):
+        corners |= cubies[i] << (5 * i)
+    edges = 0
+    for j in range(12):
+        edges |= cubies[8 + j] << (5 * j)
+    return _mix(corners) ^ _mix(edges ^ EDGE_SEED)
+
+def cubie_hash_batch(arr):
+    """
+    cubie_hash of every row of an (N, 40) state array (cp, co, ep, eo)
+
+    Returns:
+        np.ndarray: uint64 keys
+    """
+    shifts = np.arange(12, dtype=np.uint64) * np.uint64(5)
+    corners = (arr[:, :8] * 3 + arr[:, 8:16]).astype(np.uint64) << shifts[:8]
+    edges = (arr[:, 16:28] * 2 + arr[:, 28:40]).astype(np.uint64) << shifts
+    corners = np.bitwise_or.reduce(corners, axis=1)
+    edges = np.bitwise_or.reduce(edges, axis=1)
+    return _mix_batch(corners) ^ _mix_batch(edges ^ np.uint64(EDGE_SEED))
+
+def _contains(sorted_keys, keys):
+    """Mask of the keys present in a sorted array"""
+    if not len(sorted_keys):
+        return np.zeros(len(keys), dtype=bool)
+    index = np.searchsorted(sorted_keys, keys)
+    index[index == len(sorted_keys)] = 0
+    return sorted_keys[index] == keys
+
+def build_endgame_table(depth, moves_dict=None):
+    """
+    Breadth-first search from solved on batches of states
+
+    Args:
+        depth: Largest distance stored
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+
+    Returns:
+        tuple: (keys, distances) as sorted uint64 keys and uint8 distances
+    """
+    moves_dict = moves_dict or MOVES_3x3
+    _, index, offset, modulus = batch_moves(moves_dict)
+    layer = states_to_array_3x3([SOLVED_STATE_3x3])
+    layer_keys = cubie_hash_batch(layer)
+    seen = np.sort(layer_keys)
+    key_parts = [layer_keys]
+    distance_parts = [np.zeros(1, dtype=np.uint8)]
+
+    for distance in range(1, depth + 1):
+        block_keys = []
+        block_states = []
+        for start in range(0, len(layer), BUILD_BLOCK):
+            children = ((layer[start:start + BUILD_BLOCK, index] + offset) % modulus).reshape(-1, 40)
+            keys, first = np.unique(cubie_hash_batch(children), return_index=True)
+            fresh = ~_contains(seen, keys)
+            block_keys.append(keys[fresh])
+            block_states.append(children[first[fresh]])
+        keys, first = np.unique(np.concatenate(block_keys), return_index=True)
+        layer = np.concatenate(block_states)[first]
+        key_parts.append(keys)
+        distance_parts.append(np.full(len(keys), distance, dtype=np.uint8))
+        seen = np.sort(np.concatenate([seen, keys]))
+
+    keys = np.concatenate(key_parts)
+    order = np.argsort(keys)
+    return keys[order], np.concatenate(distance_parts)[order]
+
+class EndgameTable:
+    """
+    Memory-mapped endgame database
+
+    Attributes:
+        depth: Largest distance stored
+        keys: Sorted uint64 keys (memory-mapped)
+        distances: uint8 distance to solved of each key (memory-mapped)
+        compiled: CompiledMoves of MOVES_3x3, for walk()
+    """
+    def __init__(self, depth=ENDGAME_DEPTH, filename=None):
+        """
+        Args:
+            depth: Largest distance stored
+            filename: Prefix of the two .npy files, built and saved when missing
+                      (default RubikState/endgame_qtm_d<depth>)
+        """
+        self.depth = depth
+        if filename is None:
+            filename = os.path.join(os.path.dirname(__file__), f"endgame_qtm_d{depth}")
+        keys_file = filename + "_keys.npy"
+        distances_file = filename + "_distances.npy"
+        if not (os.path.exists(keys_file) and os.path.exists(distances_file)):
+            start = time.time()
+            print(f"Building the endgame table of depth {depth}...")
+            keys, distances = build_endgame_table(depth)
+            # Write under temporary names first so a killed build never leaves half a table
+            for path, data in ((keys_file, keys), (distances_file, distances)):
+                with open(path + ".tmp", "wb") as f:
+                    np.save(f, data)
+                os.replace(path + ".tmp", path)
+            print(f"Endgame table: {len(keys)} states in {time.time() - start:.1f}s")
+        self.keys = np.load(keys_file, mmap_mode="r")
+        self.distances = np.load(distances_file, mmap_mode="r")
+        self.compiled = get_compiled_moves(MOVES_3x3)
+        self.goal_key = self.compiled.encode(SOLVED_STATE_3x3)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, cubies):
+        """
+        Distance to solved of a state in the table
+
+        Args:
+            cubies: Encoded state (compiled key, only the first 20 entries are read)
+
+        Returns:
+            int or None: Distance to solved, None if the state is more than depth moves away
+        """
+        h = cubie_hash(cubies)
+        keys = self.keys
+        i = int(keys.searchsorted(np.uint64(h)))
+        if i < len(keys) and int(keys[i]) == h:
+            return int(self.distances[i])
+        return None
+
+    def lookup_state(self, state):
+        """lookup() for a RubikState"""
+        return self.lookup([state.cp[i] * 3 + state.co[i] for i in range(8)] +
+                           [state.ep[j] * 2 + state.eo[j] for j in range(12)])
+
+    def heuristic(self, base):
+        """
+        Wrap a heuristic with the table
+
+        Args:
+            base: Function h(key, g) on compiled keys of MOVES_3x3
+
+        Returns:
+            function: h(key, g), the exact distance for a state in the table and
+                      max(base, depth + 1) otherwise
+        """
+        depth = self.depth
+        lookup = self.lookup
+
+        def h(key, g):
+            value = base(key, g)
+            if value > depth:
+                return value
+            distance = lookup(key)
+            if distance is None:
+                return depth + 1
+            return distance if distance > value else value
+        return h
+
+    def state_heuristic(self, base):
+        """heuristic() for a heuristic h(state) on RubikState objects"""
+        depth = self.depth
+        lookup = self.lookup_state
+
+        def h(state):
+            value = base(state)
+            if value > depth:
+                return value
+            distance = lookup(state)
+            if distance is None:
+                return depth + 1
+            return distance if distance > value else value
+        return h
+
+    def walk(self, key):
+        """
+        Finish a solution from a state in the table
+
+        Every step plays a move to a neighbour one move closer to solved.
+
+        Args:
+            key: Compiled key of MOVES_3x3
+
+        Returns:
+            list or None: Move indices reaching solved, None if the state is not
+                          in the table (or only collides with a key of it)
+        """
+        distance = self.lookup(key)
+        if distance is None:
+            return None
+        apply = self.compiled.apply
+        moves = []
+        while distance > 0:
+            for m in range(len(apply)):
+                child = apply[m](key)
+                if self.lookup(child) == distance - 1:
+                    break
+            else:
+                return None
+            moves.append(m)
+            key = child
+            distance -= 1
+        return moves if key == self.goal_key else None
+
+_tables = {}
+
+def get_endgame_table(depth=ENDGAME_DEPTH):
+    """Return the endgame table of a depth, loading or building it on first use"""
+    if depth not in _tables:
+        _tables[depth] = EndgameTable(depth)
+    return _tables[depth]
@@ -0,0 +1,375 @@
+"""
+External-memory breadth-first search with delayed duplicate detection
+
+The frontier never lives in RAM. Each layer is a file of sorted, unique,
+fixed-size records (packed states). A layer is expanded in chunks read
+sequentially. The children of a chunk are sorted, deduplicated and written as
+one sorted run file. The runs are then merged into the next layer, and the
+records of the two previous layers are removed during the same merge. In an
+undirected graph every neighbour of a layer lies in the layer before it, in
+the layer itself or in the next one, so those two layers are all the
+duplicate detection needs; there is no visited set.
+
+Records are raw bytes (numpy void dtype). np.sort, np.unique and
+np.searchsorted order them bytewise, which is the only order the merge needs.
+All reads and writes are large sequential block transfers.
+
+Since the layers and runs are files already, a search survives a restart:
+with a Checkpoint (RubikState.checkpoint) the layer index, the number of
+chunks of it already expanded to runs, and the counters are written
+periodically, and a new search with the same checkpoint continues from the
+next chunk.
+
+The engine is generic: expand() maps a record array to the records of its
+neighbours. expand_states_3x3 works on the 16-byte pack_keys records of whole
+3x3 states (for bfs_search_3x3). external_pdb writes BFS distances of any
+abstract state space into a memory-mapped pattern database.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from RubikState.beam_search import batch_moves, pack_keys
+
+# Parents expanded per chunk (the children of one chunk are one run)
+CHUNK_RECORDS = 1 << 18
+
+# Bytes read or written per buffered file operation
+IO_BUFFER = 1 << 22
+
+# Bytes of read buffers shared by all files of one merge
+MERGE_MEMORY = 1 << 28
+
+# Checkpoint file of external_bfs_search, in the directory of the layers
+CHECKPOINT_NAME = "checkpoint.pkl"
+
+def record_dtype(size):
+    """numpy dtype of records of size bytes"""
+    return np.dtype((np.void, size))
+
+def layer_file(directory, depth):
+    """Path of the file holding a layer"""
+    return os.path.join(directory, f"layer_{depth:03d}.bin")
+
+def clear_layers(directory):
+    """Delete the layer and run files of a search"""
+    for name in os.listdir(directory):
+        if name.endswith(".bin") and name.startswith(("layer_", "run_")):
+            os.remove(os.path.join(directory, name))
+
+def run_file(directory, index):
+    """Path of the file holding a sorted run of the layer being built"""
+    return os.path.join(directory, f"run_{index:05d}.bin")
+
+def read_layer(directory, depth, dtype, chunk=CHUNK_RECORDS, skip=0):
+    """
+    Read a layer sequentially
+
+    Args:
+        skip: Number of leading chunks not to read
+
+    Yields:
+        np.ndarray: Up to chunk records, in sorted order
+    """
+    with open(layer_file(directory, depth), "rb", buffering=IO_BUFFER) as f:
+        f.seek(skip * chunk * dtype.itemsize)
+        while True:
+            records = np.fromfile(f, dtype=dtype, count=chunk)
+            if not len(records):
+                return
+            yield records
+
+def layer_contains(directory, depth, dtype, records):
+    """
+    Membership of records in a layer, by binary search in the memory-mapped file
+
+    Returns:
+        np.ndarray: Boolean mask
+    """
+    path = layer_file(directory, depth)
+    if not os.path.getsize(path):
+        return np.zeros(len(records), dtype=bool)
+    layer = np.memmap(path, dtype=dtype, mode="r")
+    index = np.searchsorted(layer, records)
+    index[index == len(layer)] = 0
+    return layer[index] == records
+
+class _SortedReader:
+    """Buffered sequential reader of a sorted record file"""
+    def __init__(self, path, dtype, block):
+        self.file = open(path, "rb", buffering=0)
+        self.dtype = dtype
+        self.block = block
+        self.eof = False
+        self._read()
+
+    def _read(self):
+        self.buffer = np.fromfile(self.file, dtype=self.dtype, count=self.block)
+        self.pos = 0
+        if len(self.buffer) < self.block:
+            self.eof = True
+            self.file.close()
+
+    def exhausted(self):
+        return self.pos == len(self.buffer) and self.eof
+
+    def limit(self):
+        """Last buffered record if more records wait on disk, else None"""
+        return None if self.eof else self.buffer[-1:]
+
+    def take_through(self, bound):
+        """
+        Remove and return every remaining record <= bound (all if bound is None)
+        """
+        parts = []
+        while True:
+            buffer = self.buffer[self.pos:]
+            cut = len(buffer) if bound is None else int(np.searchsorted(buffer, bound[0], side="right"))
+            parts.append(buffer[:cut])
+            self.pos += cut
+            if self.pos < len(self.buffer) or self.eof:
+                break
+            self._read()
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+def _merge_runs(run_paths, exclude_paths, out_path, dtype):
+    """
+    Merge sorted runs into one sorted unique file, without the records of exclude_paths
+
+    Returns:
+        int: Records written
+    """
+    files = len(run_paths) + len(exclude_paths)
+    block = max(1024, MERGE_MEMORY // (files * dtype.itemsize))
+    runs = [_SortedReader(path, dtype, block) for path in run_paths]
+    excludes = [_SortedReader(path, dtype, block) for path in exclude_paths]
+    written = 0
+    with open(out_path, "wb", buffering=IO_BUFFER) as out:
+        while not all(run.exhausted() for run in runs):
+            # Everything up to the smallest last buffered record is in memory for every run
+            limits = [limit for limit in (run.limit() for run in runs) if limit is not None]
+            bound = np.sort(np.concatenate(limits))[:1] if limits else None
+            merged = np.unique(np.concatenate([run.take_through(bound) for run in runs]))
+            for exclude in excludes:
+                old = exclude.take_through(bound)
+                if len(old) and len(merged):
+                    merged = merged[~np.isin(merged, old)]
+            merged.tofile(out)
+            written += len(merged)
+    return written
+
+def _resumable(directory, dtype, state):
+    """True when the layer and run files a checkpoint refers to are all on disk"""
+    depth = state["depth"]
+    for d in (depth - 1, depth):
+        if d >= 0:
+            path = layer_file(directory, d)
+            if not os.path.exists(path) or os.path.getsize(path) != state["sizes"][d] * dtype.itemsize:
+                return False
+    return all(os.path.exists(run_file(directory, k)) for k in range(state["runs"]))
+
+def external_bfs(start, expand, directory, max_depth=None, goal=None, deadline=None,
+                 chunk=CHUNK_RECORDS, progress=None, checkpoint=None):
+    """
+    Layered breadth-first search with layers on disk
+
+    Args:
+        start: Record array of the start layer (records of one size)
+        expand: Function mapping a record array to the record array of all
+                neighbours (any order, duplicates allowed)
+        directory: Directory of the layer files (created if missing; files of an
+                   earlier search there are overwritten, unless it is resumed)
+        max_depth: Last layer to build (None: until the graph is exhausted)
+        goal: Optional array of one record; the search stops at the layer that contains it
+        deadline: Optional absolute time (time.time()) checked between chunks
+        chunk: Parents expanded per run
+        progress: Optional callback progress(depth, layer_size, elapsed)
+        checkpoint: Optional Checkpoint; the search resumes from it when its files are
+                    still in directory, saves it after every layer, when due and on a
+                    timeout (the runs written so far are then kept), and leaves it in
+                    place at the end
+
+    Returns:
+        tuple: (goal_depth or None, layer_sizes, nodes_generated, timed_out)
+    """
+    os.makedirs(directory, exist_ok=True)
+    dtype = start.dtype
+    begin = time.time()
+    state = checkpoint.load() if checkpoint is not None else None
+    if state is not None and not _resumable(directory, dtype, state):
+        print(f"Ignoring checkpoint {checkpoint.path}: its layer files are missing")
+        state = None
+
+    if state is None:
+        start = np.unique(start)
+        start.tofile(layer_file(directory, 0))
+        state = {"depth": 0, "sizes": [len(start)], "nodes": 0, "runs": 0, "found": False}
+        if progress is not None:
+            progress(0, len(start), 0.0)
+        if goal is not None and np.isin(goal, start).any():
+            return 0, state["sizes"], 0, False
+
+    depth = state["depth"]
+    sizes = state["sizes"]
+    nodes = state["nodes"]
+    while sizes[-1] and (max_depth is None or depth < max_depth):
+        runs = [run_file(directory, k) for k in range(state["runs"])]
+        found = state["found"]
+        for records in read_layer(directory, depth, dtype, chunk, skip=len(runs)):
+            children = np.unique(expand(records))
+            nodes += len(children)
+            if goal is not None and np.isin(goal, children).any():
+                found = True
+            run = run_file(directory, len(runs))
+            with open(run, "wb", buffering=IO_BUFFER) as f:
+                children.tofile(f)
+            runs.append(run)
+            timed_out = deadline is not None and time.time() >= deadline
+            if checkpoint is not None and (timed_out or checkpoint.due()):
+                state = {"depth": depth, "sizes": sizes, "nodes": nodes, "runs": len(runs), "found": found}
+                checkpoint.save(state)
+            if timed_out:
+                if checkpoint is None:
+                    for run in runs:
+                        os.remove(run)
+                return None, sizes, nodes, True
+
+        previous = [layer_file(directory, d) for d in (depth - 1, depth) if d >= 0]
+        sizes.append(_merge_runs(runs, previous, layer_file(directory, depth + 1), dtype))
+        depth += 1
+        state = {"depth": depth, "sizes": sizes, "nodes": nodes, "runs": 0, "found": False}
+        if checkpoint is not None:
+            # Saved before the runs are deleted: a crash in between resumes at the new layer
+            checkpoint.save(state)
+        for run in runs:
+            os.remove(run)
+        if progress is not None:
+            progress(depth, sizes[-1], time.time() - begin)
+        if found:
+            return depth, sizes, nodes, False
+
+    return None, sizes, nodes, False
+
+def external_pdb(start, expand, index, table_size, directory, filename, max_depth=None,
+                 chunk=CHUNK_RECORDS, progress=None, checkpoint=None):
+    """
+    Pattern database from an external BFS
+
+    Args:
+        start: Record array of the goal patterns
+        expand: Neighbour function of the abstract state space (see external_bfs)
+        index: Function mapping a record array to int64 table indices
+        table_size: Number of table entries
+        directory: Directory of the layer files
+        filename: Output file of the database (uint8 distances, 255 = not reached),
+                  written through a memory map so the table does not need to fit in RAM
+        max_depth: Last distance to compute (None: all)
+        chunk: Parents expanded per run
+        progress: Optional callback progress(depth, layer_size, elapsed)
+        checkpoint: Optional Checkpoint of the BFS (see external_bfs), deleted once the
+                    database is written
+
+    Returns:
+        tuple: (np.memmap of the database, layer_sizes)
+    """
+    _, sizes, _, _ = external_bfs(start, expand, directory, max_depth=max_depth,
+                                  chunk=chunk, progress=progress, checkpoint=checkpoint)
+    table = np.memmap(filename + ".tmp", dtype=np.uint8, mode="w+", shape=(table_size,))
+    table[:] = 255
+    for depth in range(len(sizes)):
+        for records in read_layer(directory, depth, start.dtype, chunk):
+            table[index(records)] = depth
+    table.flush()
+    del table
+    os.replace(filename + ".tmp", filename)
+    if checkpoint is not None:
+        checkpoint.clear()
+    return np.memmap(filename, dtype=np.uint8, mode="r"), sizes
+
+def records_to_states(records):
+    """(N, 40) state arrays (cp, co, ep, eo) of pack_keys records"""
+    words = records.view(np.uint64).reshape(-1, 2)
+    shifts = np.arange(12, dtype=np.uint64) * np.uint64(5)
+    corners = ((words[:, :1] >> shifts[:8]) & np.uint64(31)).astype(np.int8)
+    edges = ((words[:, 1:] >> shifts) & np.uint64(31)).astype(np.int8)
+    return np.concatenate([corners // 3, corners % 3, edges // 2, edges % 2], axis=1)
+
+def expand_states_3x3(moves_dict):
+    """
+    Neighbour function on state records for external_bfs
+
+    Returns:
+        function: expand(records) -> records of every move applied to every record
+    """
+    _, index, offset, modulus = batch_moves(moves_dict)
+
+    def expand(records):
+        arr = records_to_states(records)
+        return pack_keys(((arr[:, index] + offset) % modulus).reshape(-1, 40))
+    return expand
+
+def external_bfs_search(start_state, goal_state, moves_dict, directory, start_time, time_limit,
+                        max_depth=None, chunk=CHUNK_RECORDS, checkpoint_interval=None):
+    """
+    Shortest path between two 3x3 states with an external BFS from the start
+
+    The path is rebuilt backwards from the goal: at every depth some neighbour
+    of the current state lies in the layer one move closer to the start.
+
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (RubikState)
+        moves_dict: Dictionary of moves (every move needs its inverse in the dictionary)
+        directory: Directory of the layer files (deleted again when the search ends)
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        max_depth: Give up after this many layers (None: no bound)
+        chunk: Parents expanded per run
+        checkpoint_interval: Optional seconds between checkpoints (CHECKPOINT_NAME in
+                             directory); on a timeout the files are then kept, and
+                             the same call later resumes the search
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    from RubikState.rubik_chen import states_to_array_3x3
+    from RubikState.compiled_moves import get_compiled_moves
+    from RubikState.checkpoint import Checkpoint
+
+    names = list(moves_dict.keys())
+    inverse = get_compiled_moves(moves_dict).inverse
+    if min(inverse) < 0:
+        raise ValueError("External BFS needs an inverse for every move")
+    expand = expand_states_3x3(moves_dict)
+    start = pack_keys(states_to_array_3x3([start_state]))
+    goal = pack_keys(states_to_array_3x3([goal_state]))
+    checkpoint = None
+    if checkpoint_interval is not None:
+        checkpoint = Checkpoint(os.path.join(directory, CHECKPOINT_NAME), "external_bfs",
+                                (start.tobytes(), goal.tobytes(), tuple(names), chunk), checkpoint_interval)
+
+    timed_out = False
+    try:
+        depth, _, nodes, timed_out = external_bfs(start, expand, directory, max_depth=max_depth, goal=goal,
+                                                  deadline=start_time + time_limit, chunk=chunk,
+                                                  checkpoint=checkpoint)
+        if depth is None:
+            return None, nodes
+
+        path = []
+        current = goal
+        for d in range(depth - 1, -1, -1):
+            # neighbours[m] is current after move m; current is that neighbour after inverse[m]
+            neighbours = expand(current)
+            m = int(np.flatnonzero(layer_contains(directory, d, goal.dtype, neighbours))[0])
+            path.append(names[inverse[m]])
+            current = neighbours[m:m + 1]
+        path.reverse()
+        return path, nodes
+    finally:
+        if not (timed_out and checkpoint is not None):
+            clear_layers(directory)
+            if checkpoint is not None:
+                checkpoint.clear()
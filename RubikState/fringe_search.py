@@ -0,0 +1,119 @@
+"""
+Fringe search shared by the 2x2 and 3x3 solvers
+
+States are the encoded keys of RubikState.compiled_moves. Fringe search
+(Björnsson, Enzenberger, Holte, Schaeffer 2005) visits nodes in the same
+threshold iterations and depth-first order as IDA*, but it remembers the
+fringe: every node whose f exceeded the threshold is put on the "later"
+list, and the next iteration starts from that list instead of the root. The
+nodes below the old threshold are never expanded again.
+
+A cache holds (g, parent, move) for every visited state. A state reached
+again with a g no better than the cached one is dropped; a better g replaces
+the cache entry and makes the old fringe entry stale. Queue entries carry
+their g so stale entries are recognised when they come up.
+
+Memory grows with the visited states, like A*; the gain over A* is that the
+lists are plain Python lists with no priority ordering.
+"""
+
+import time
+
+# How many generated nodes between two time-limit checks
+TIME_CHECK_INTERVAL = 4096
+
+def fringe_search(start_key, goal_key, compiled, heuristic, start_time, time_limit, endgame=None):
+    """
+    Fringe search on encoded states
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes
+        heuristic: Function h(key, g)
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        endgame: Optional EndgameTable (goal_key must be solved); it sharpens the
+                 heuristic and finishes the search by a table walk
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    deadline = start_time + time_limit
+    names = compiled.names
+    apply = compiled.apply
+    inverse = compiled.inverse
+    n = len(apply)
+    if endgame is not None:
+        heuristic = endgame.heuristic(heuristic)
+        tail = endgame.walk(start_key)
+        if tail is not None:
+            return [names[m] for m in tail], 1
+        depth = endgame.depth
+
+    def path_to(key):
+        moves = []
+        while True:
+            _, parent, m = cache[key]
+            if parent is None:
+                break
+            moves.append(m)
+            key = parent
+        moves.reverse()
+        return moves
+
+    cache = {start_key: (0, None, -1)}  # State -> (g, parent state, move)
+    h = heuristic(start_key, 0)
+    threshold = h
+    later = [(start_key, 0, h, -1)]  # (state, g, h, move into it)
+    nodes = 1
+    next_check = TIME_CHECK_INTERVAL
+
+    while later:
+        # The fringe of the last iteration, in the order IDA* would reach it
+        now = later
+        now.reverse()
+        later = []
+        next_threshold = None
+
+        while now:
+            key, g, h, last = now.pop()
+            if cache[key][0] != g:
+                continue  # Reached again with a smaller g
+            f = g + h
+            if f > threshold:
+                later.append((key, g, h, last))
+                if next_threshold is None or f < next_threshold:
+                    next_threshold = f
+                continue
+            if key == goal_key:
+                return [names[m] for m in path_to(key)], nodes
+            if endgame is not None and h <= depth:
+                tail = endgame.walk(key)
+                if tail is not None:
+                    return [names[m] for m in path_to(key) + tail], nodes
+
+            child_g = g + 1
+            back = inverse[last] if last >= 0 else -1
+            # Children go on the stack in reverse so move 0 is expanded first
+            for m in range(n - 1, -1, -1):
+                if m == back:
+                    continue  # Leads back to the parent
+                child = apply[m](key)
+                nodes += 1
+                old = cache.get(child)
+                if old is not None and old[0] <= child_g:
+                    continue
+                cache[child] = (child_g, key, m)
+                now.append((child, child_g, heuristic(child, child_g), m))
+
+            if nodes >= next_check:
+                if time.time() >= deadline:
+                    return None, nodes
+                next_check += TIME_CHECK_INTERVAL
+
+        if next_threshold is None:
+            break
+        threshold = next_threshold
+
+    return None, nodes
@@ -0,0 +1,122 @@
+"""
+Genetic algorithm shared by the 2x2 and 3x3 solvers
+
+An individual is a fixed-length int8 array of move indices. The whole
+population is evaluated at once: the sequences are played column by column
+on a (population, size) array of sticker keys (RubikState.compiled_moves),
+each move a gather with compiled.sources, and the state after every prefix is
+scored with local_search.StickerScorer. The fitness of a sequence is its best
+prefix score, so a sequence that passes through the goal is a solution, cut
+at that point.
+
+Each generation keeps the elite unchanged and fills the rest of the
+population with children of tournament-selected parents: one-point
+crossover, then every gene is replaced by a random move with the mutation
+rate. Memory is constant (two population arrays); solutions are long and
+not optimal.
+"""
+
+import time
+
+import numpy as np
+
+from RubikState.local_search import StickerScorer, simplify_moves
+
+def evaluate_population(scorer, genes):
+    """
+    Play every sequence of a population and score every prefix
+
+    Args:
+        scorer: StickerScorer of the search
+        genes: (population, length) move indices
+
+    Returns:
+        tuple: (best prefix score, length of the shortest prefix reaching it) per sequence
+    """
+    population, length = genes.shape
+    rows = np.arange(population)[:, None]
+    states = np.tile(scorer.start, (population, 1))
+    scores = np.empty((population, length + 1), dtype=np.int32)
+    scores[:, 0] = scorer.start_score
+    for step in range(length):
+        states = states[rows, scorer.sources[genes[:, step]]]
+        scores[:, step + 1] = scorer.score(states)
+    best = scores.argmin(axis=1)  # First minimum: shortest prefix
+    return scores[rows[:, 0], best], best
+
+def genetic_search(start_key, goal_key, compiled, start_time, time_limit, population=1000, length=40,
+                   generations=None, tournament=4, crossover_rate=0.9, mutation_rate=0.05, elite=10,
+                   seed=None, score_batch=None):
+    """
+    Genetic algorithm on move sequences
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves of the search
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        population: Number of sequences per generation
+        length: Moves per sequence (longest possible solution before simplification)
+        generations: Maximum number of generations (None: until the time limit)
+        tournament: Sequences drawn per tournament selection
+        crossover_rate: Probability that two parents are crossed rather than copied
+        mutation_rate: Probability that a gene is replaced by a random move
+        elite: Best sequences copied unchanged to the next generation
+        seed: Seed of the random generator
+        score_batch: Optional score of (N, 40) state arrays, see StickerScorer
+
+    Returns:
+        tuple: (list of move names or None, sequences_evaluated, stats)
+               stats is a dict with generations, best_score and sequences_per_second
+    """
+    if elite >= population:
+        raise ValueError("elite must be smaller than the population")
+    deadline = start_time + time_limit
+    rng = np.random.default_rng(seed)
+    scorer = StickerScorer(start_key, goal_key, compiled, score_batch)
+    n = len(compiled.sources)
+
+    genes = rng.integers(0, n, (population, length), dtype=np.int8)
+    evaluated = 0
+    generation = 0
+    solution = None
+    children_count = population - elite
+    positions = np.arange(length)
+
+    while True:
+        fitness, cut = evaluate_population(scorer, genes)
+        evaluated += population
+        generation += 1
+        order = np.argsort(fitness, kind="stable")
+        if fitness[order[0]] == 0:
+            solution = genes[order[0], :cut[order[0]]].tolist()
+            break
+        if time.time() >= deadline or (generations is not None and generation >= generations):
+            break
+
+        # Tournament selection: the fittest of tournament random draws, twice per child
+        draws = rng.integers(0, population, (2, children_count, tournament))
+        parents = np.take_along_axis(draws, fitness[draws].argmin(axis=2)[..., None], axis=2)[..., 0]
+        first, second = genes[parents[0]], genes[parents[1]]
+
+        # One-point crossover
+        crossed = rng.random(children_count) < crossover_rate
+        points = rng.integers(1, length, children_count)
+        children = np.where(crossed[:, None] & (positions >= points[:, None]), second, first)
+
+        # Mutation
+        mutated = rng.random(children.shape) < mutation_rate
+        children[mutated] = rng.integers(0, n, int(mutated.sum()), dtype=np.int8)
+
+        genes = np.concatenate([genes[order[:elite]], children])
+
+    elapsed = max(time.time() - start_time, 1e-9)
+    stats = {
+        "generations": generation,
+        "best_score": int(fitness[order[0]]),
+        "sequences_per_second": evaluated / elapsed,
+    }
+    if solution is None:
+        return None, evaluated, stats
+    return [compiled.names[m] for m in simplify_moves(compiled, solution)], evaluated, stats
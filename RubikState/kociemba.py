@@ -0,0 +1,432 @@
+"""
+Kociemba two-phase solver for the 3x3 Rubik's cube
+
+Phase 1 brings the cube into the subgroup G1 = <U, D, L2, R2, F2, B2>, where
+every corner and edge is oriented and the four E-slice edges (FR, FL, BL, BR)
+are in the E slice. It searches on the twist (2187), flip (2048) and
+UD-slice (495) coordinates. Phase 2 solves the cube inside G1 on the corner
+permutation (40320), U/D edge permutation (40320) and slice permutation (24)
+coordinates. Both phases are IDA* searches over move tables, guided by
+pruning tables built by a breadth-first search from the goal.
+
+The search moves are the 18 face turns (quarter and half turns). Half turns
+are written as two quarter turns in the returned path, since moves_dict only
+contains quarter turns.
+"""
+
+import os
+import time
+from itertools import combinations, permutations
+
+import numpy as np
+
+from RubikState.coordinates import permutation_rank_batch, orientation_rank_batch
+from RubikState.rubik_chen import MOVES_3x3, RubikState
+
+# Mặt theo từng trục: (U, D), (L, R), (F, B)
+FACES = ("U", "D", "L", "R", "F", "B")
+# Move index = face * 3 + (power - 1), power 1 = X, 2 = X2, 3 = X'
+N_MOVES = 18
+# Phase 2 moves: U, U2, U', D, D2, D', L2, R2, F2, B2
+PHASE2_MOVES = (0, 1, 2, 3, 4, 5, 7, 10, 13, 16)
+
+N_TWIST = 2187
+N_FLIP = 2048
+N_SLICE = 495
+N_PERM8 = 40320
+N_SLICE_PERM = 24
+
+# Phase 2 depth cap while no solution is known, keeps the first solution fast
+FIRST_PHASE2_DEPTH = 12
+# Phase 1 nodes between two time-limit checks
+TIME_CHECK_INTERVAL = 2048
+
+DEFAULT_TABLE_FILE = os.path.join(os.path.dirname(__file__), "kociemba_tables.npz")
+
+def face_turn_arrays(moves_dict):
+    """
+    Cubie arrays (cp, co, ep, eo) of the 18 face turns, in move index order
+
+    Each entry is the state reached from the solved cube, which in the
+    replacement convention of apply_move is also the move itself.
+    """
+    turns = []
+    for face in FACES:
+        state = RubikState()
+        for _ in range(3):
+            state = state.apply_move(face, moves_dict)
+            turns.append((np.array(state.cp), np.array(state.co),
+                          np.array(state.ep), np.array(state.eo)))
+    return turns
+
+def distance_table(move_a, move_b, goal, moves):
+    """
+    Breadth-first distances to goal over the product coordinate a * n_b + b
+
+    Args:
+        move_a: (n_a, N_MOVES) move table of the first coordinate
+        move_b: (n_b, N_MOVES) move table of the second coordinate
+        goal: Goal index in the product space
+        moves: Move indices allowed in the search
+
+    Returns:
+        np.ndarray: uint8 distances, one per product index
+    """
+    n_b = move_b.shape[0]
+    dist = np.full(move_a.shape[0] * n_b, 255, dtype=np.uint8)
+    dist[goal] = 0
+    frontier = np.array([goal], dtype=np.int64)
+    depth = 0
+    while frontier.size:
+        a, b = np.divmod(frontier, n_b)
+        for m in moves:
+            nxt = move_a[a, m].astype(np.int64) * n_b + move_b[b, m]
+            nxt = nxt[dist[nxt] == 255]
+            dist[nxt] = depth + 1
+        depth += 1
+        frontier = np.flatnonzero(dist == depth)
+    return dist
+
+def twist_move_table(turns):
+    """
+    Move table of the twist coordinate: co[0..6] in base 3 (co[7] follows from the sum)
+
+    Args:
+        turns: Cubie arrays from face_turn_arrays
+
+    Returns:
+        np.ndarray: (N_TWIST, N_MOVES) int16 table
+    """
+    digits = np.array(np.unravel_index(np.arange(N_TWIST), (3,) * 7)).T
+    co = np.hstack([digits, (-digits.sum(axis=1) % 3)[:, None]])
+    return np.stack([
+        orientation_rank_batch(((co[:, cp] + dco) % 3)[:, :7], 3) for cp, dco, _, _ in turns
+    ], axis=1).astype(np.int16)
+
+def flip_move_table(turns):
+    """
+    Move table of the flip coordinate: eo[0..10] in base 2 (eo[11] follows from the sum)
+
+    Args:
+        turns: Cubie arrays from face_turn_arrays
+
+    Returns:
+        np.ndarray: (N_FLIP, N_MOVES) int16 table
+    """
+    digits = np.array(np.unravel_index(np.arange(N_FLIP), (2,) * 11)).T
+    eo = np.hstack([digits, (digits.sum(axis=1) % 2)[:, None]])
+    return np.stack([
+        orientation_rank_batch(((eo[:, ep] + deo) % 2)[:, :11], 2) for _, _, ep, deo in turns
+    ], axis=1).astype(np.int16)
+
+def slice_move_table(turns):
+    """
+    Move table of the UD-slice coordinate: which 4 slots hold the E-slice edges (8..11)
+
+    Args:
+        turns: Cubie arrays from face_turn_arrays
+
+    Returns:
+        tuple: ((N_SLICE, N_MOVES) table, slot bitmask -> slice index array,
+                slice index of the solved cube)
+    """
+    combos = list(combinations(range(12), 4))
+    occupied = np.zeros((N_SLICE, 12), dtype=np.int64)
+    for i, combo in enumerate(combos):
+        occupied[i, list(combo)] = 1
+    bit_weights = 1 << np.arange(12)
+    slice_index = np.full(1 << 12, -1, dtype=np.int16)
+    slice_index[occupied @ bit_weights] = np.arange(N_SLICE)
+    slice_move = np.stack([
+        slice_index[occupied[:, ep] @ bit_weights] for _, _, ep, _ in turns
+    ], axis=1)
+    return slice_move, slice_index, combos.index((8, 9, 10, 11))
+
+def load_table_file(filename):
+    """
+    Load solver tables saved with save_table_file
+
+    Returns:
+        dict: name -> np.ndarray, or None if the file is missing or unreadable
+    """
+    if not os.path.exists(filename):
+        return None
+    try:
+        with np.load(filename) as data:
+            return {name: data[name] for name in data.files}
+    except Exception as e:
+        print(f"Error loading solver tables from {filename}: {e}")
+        return None
+
+def save_table_file(filename, arrays):
+    """Save solver tables atomically (failures only print a message)"""
+    try:
+        tmp = filename + ".tmp.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, filename)
+    except OSError as e:
+        print(f"Could not save solver tables to {filename}: {e}")
+
+class KociembaTables:
+    """
+    Move and pruning tables of the two-phase algorithm
+
+    Move tables are flat lists indexed by coordinate * N_MOVES + move,
+    pruning tables are bytes indexed by the product coordinate.
+    """
+    def __init__(self, moves_dict=None, filename=None):
+        self.moves_dict = moves_dict or MOVES_3x3
+        self.filename = filename
+
+        arrays = load_table_file(filename) if filename else None
+        if arrays is None:
+            arrays = self._build()
+            if filename:
+                save_table_file(filename, arrays)
+
+        self.twist_move = arrays["twist_move"].ravel().tolist()
+        self.flip_move = arrays["flip_move"].ravel().tolist()
+        self.slice_move = arrays["slice_move"].ravel().tolist()
+        self.cp_move = arrays["cp_move"].ravel().tolist()
+        self.ud_move = arrays["ud_move"].ravel().tolist()
+        self.slice_perm_move = arrays["slice_perm_move"].ravel().tolist()
+        self.twist_slice_prune = arrays["twist_slice_prune"].tobytes()
+        self.flip_slice_prune = arrays["flip_slice_prune"].tobytes()
+        self.cp_slice_prune = arrays["cp_slice_prune"].tobytes()
+        self.ud_slice_prune = arrays["ud_slice_prune"].tobytes()
+        self.slice_index = arrays["slice_index"].tolist()
+        self.slice_solved = int(arrays["slice_solved"])
+
+    def _build(self):
+        """Build all tables from the move definitions"""
+        turns = face_turn_arrays(self.moves_dict)
+
+        twist_move = twist_move_table(turns)
+        flip_move = flip_move_table(turns)
+        slice_move, slice_index, slice_solved = slice_move_table(turns)
+
+        # Phase 2 permutations, ranked in lexicographic order
+        perms8 = np.array(list(permutations(range(8))), dtype=np.int8)
+        perms4 = np.array(list(permutations(range(4))), dtype=np.int8)
+        cp_move = np.stack([
+            permutation_rank_batch(perms8[:, cp]) for cp, _, _, _ in turns
+        ], axis=1).astype(np.int32)
+        ud_move = np.zeros((N_PERM8, N_MOVES), dtype=np.int32)
+        slice_perm_move = np.zeros((N_SLICE_PERM, N_MOVES), dtype=np.int8)
+        for m in PHASE2_MOVES:
+            ep = turns[m][2]
+            ud_move[:, m] = permutation_rank_batch(perms8[:, ep[:8]])
+            slice_perm_move[:, m] = permutation_rank_batch(perms4[:, ep[8:] - 8])
+
+        all_moves = range(N_MOVES)
+        return {
+            "twist_move": twist_move,
+            "flip_move": flip_move,
+            "slice_move": slice_move,
+            "cp_move": cp_move,
+            "ud_move": ud_move,
+            "slice_perm_move": slice_perm_move,
+            "twist_slice_prune": distance_table(twist_move, slice_move, slice_solved, all_moves),
+            "flip_slice_prune": distance_table(flip_move, slice_move, slice_solved, all_moves),
+            "cp_slice_prune": distance_table(cp_move, slice_perm_move, 0, PHASE2_MOVES),
+            "ud_slice_prune": distance_table(ud_move, slice_perm_move, 0, PHASE2_MOVES),
+            "slice_index": slice_index,
+            "slice_solved": np.array(slice_solved),
+        }
+
+    def coordinates(self, state):
+        """
+        Phase 1 coordinates of a RubikState
+
+        Returns:
+            tuple: (twist, flip, slice)
+        """
+        twist = 0
+        for value in state.co[:7]:
+            twist = twist * 3 + value
+        flip = 0
+        for value in state.eo[:11]:
+            flip = flip * 2 + value
+        mask = 0
+        for slot, edge in enumerate(state.ep):
+            if edge >= 8:
+                mask |= 1 << slot
+        return twist, flip, self.slice_index[mask]
+
+_tables = None
+
+def get_kociemba_tables():
+    """Return the tables for MOVES_3x3, loading or building them on first use"""
+    global _tables
+    if _tables is None:
+        _tables = KociembaTables(MOVES_3x3, DEFAULT_TABLE_FILE)
+    return _tables
+
+def _phase2_coordinates(state, moves, turns):
+    """Apply phase 1 moves to cp/ep and return (cp rank, ud rank, slice perm rank)"""
+    cp = list(state.cp)
+    ep = list(state.ep)
+    for m in moves:
+        move_cp, _, move_ep, _ = turns[m]
+        cp = [cp[i] for i in move_cp]
+        ep = [ep[i] for i in move_ep]
+    return (int(permutation_rank_batch([cp])[0]),
+            int(permutation_rank_batch([ep[:8]])[0]),
+            int(permutation_rank_batch([[e - 8 for e in ep[8:]]])[0]))
+
+def kociemba_solve(state, tables, start_time, time_limit, target_length=20, improve_time=0.5):
+    """
+    Two-phase search, improving the solution until target_length or the deadline
+
+    Phase 1 solutions are tried in order of increasing length, and every new
+    solution bounds the phase 2 depth of the next ones, so the solution gets
+    shorter the longer the search runs.
+
+    Args:
+        state: RubikState to solve
+        tables: KociembaTables
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        target_length: Stop as soon as a solution of at most this many face turns is found
+        improve_time: Once a solution is known, stop improving it after this many
+                      seconds from start_time (None to use the whole time limit)
+
+    Returns:
+        tuple: (list of (face, power) or None, nodes_generated)
+    """
+    deadline = start_time + time_limit
+    soft_deadline = deadline if improve_time is None else min(deadline, start_time + improve_time)
+    turns = [(list(cp), None, list(ep), None) for cp, _, ep, _ in face_turn_arrays(tables.moves_dict)]
+
+    twist_move = tables.twist_move
+    flip_move = tables.flip_move
+    slice_move = tables.slice_move
+    twist_slice_prune = tables.twist_slice_prune
+    flip_slice_prune = tables.flip_slice_prune
+    cp_move = tables.cp_move
+    ud_move = tables.ud_move
+    slice_perm_move = tables.slice_perm_move
+    cp_slice_prune = tables.cp_slice_prune
+    ud_slice_prune = tables.ud_slice_prune
+
+    best = None
+    nodes = 0
+    next_check = TIME_CHECK_INTERVAL
+    timed_out = False
+    path1 = []
+    path2 = []
+
+    def allowed(m, last):
+        """Skip a turn of the last face, and opposite faces in decreasing order"""
+        if last < 0:
+            return True
+        face, last_face = m // 3, last // 3
+        return face != last_face and not (face // 2 == last_face // 2 and face < last_face)
+
+    def phase2(cp, ud, sp, togo, last):
+        nonlocal nodes
+        if togo == 0:
+            return cp == 0 and ud == 0 and sp == 0
+        for m in PHASE2_MOVES:
+            if path2:
+                if not allowed(m, last):
+                    continue
+            elif last >= 0 and m // 3 == last // 3:
+                # First phase 2 move: only the face of the last phase 1 move is
+                # redundant, the opposite face may not be postponed into phase 1
+                continue
+            nodes += 1
+            cp2 = cp_move[cp * N_MOVES + m]
+            ud2 = ud_move[ud * N_MOVES + m]
+            sp2 = slice_perm_move[sp * N_MOVES + m]
+            h = cp_slice_prune[cp2 * N_SLICE_PERM + sp2]
+            h2 = ud_slice_prune[ud2 * N_SLICE_PERM + sp2]
+            if h2 > h:
+                h = h2
+            if h >= togo:
+                continue
+            path2.append(m)
+            if phase2(cp2, ud2, sp2, togo - 1, m):
+                return True
+            path2.pop()
+        return False
+
+    def start_phase2():
+        nonlocal best
+        depth1 = len(path1)
+        limit = len(best) - 1 - depth1 if best is not None else FIRST_PHASE2_DEPTH
+        cp, ud, sp = _phase2_coordinates(state, path1, turns)
+        h = max(cp_slice_prune[cp * N_SLICE_PERM + sp], ud_slice_prune[ud * N_SLICE_PERM + sp])
+        last = path1[-1] if path1 else -1
+        for togo in range(h, limit + 1):
+            if phase2(cp, ud, sp, togo, last):
+                best = path1 + path2
+                path2.clear()
+                return
+
+    def phase1(twist, flip, slc, togo, last):
+        nonlocal nodes, next_check, timed_out
+        if togo == 0:
+            # A phase 1 ending in a G1 move would contain a shorter phase 1 solution
+            if last < 0 or last not in PHASE2_MOVES:
+                start_phase2()
+            return best is not None and len(best) <= target_length
+        for m in range(N_MOVES):
+            if not allowed(m, last):
+                continue
+            nodes += 1
+            if nodes >= next_check:
+                next_check += TIME_CHECK_INTERVAL
+                now = time.time()
+                if now >= deadline or (best is not None and now >= soft_deadline):
+                    timed_out = True
+                    return True
+            twist2 = twist_move[twist * N_MOVES + m]
+            flip2 = flip_move[flip * N_MOVES + m]
+            slc2 = slice_move[slc * N_MOVES + m]
+            h = twist_slice_prune[twist2 * N_SLICE + slc2]
+            h2 = flip_slice_prune[flip2 * N_SLICE + slc2]
+            if h2 > h:
+                h = h2
+            if h >= togo:
+                continue
+            path1.append(m)
+            done = phase1(twist2, flip2, slc2, togo - 1, m)
+            path1.pop()
+            if done:
+                return True
+        return False
+
+    twist, flip, slc = tables.coordinates(state)
+    h = max(twist_slice_prune[twist * N_SLICE + slc], flip_slice_prune[flip * N_SLICE + slc])
+    depth1 = h
+    while not timed_out:
+        if best is not None and depth1 >= len(best):
+            break
+        if phase1(twist, flip, slc, depth1, -1):
+            break
+        depth1 += 1
+
+    if best is None:
+        return None, nodes
+    return [(FACES[m // 3], m % 3 + 1) for m in best], nodes
+
+def face_turns_to_moves(turns):
+    """
+    Write (face, power) turns with the quarter turn names of moves_dict
+
+    Args:
+        turns: List of (face, power), power 1 = X, 2 = X2, 3 = X'
+
+    Returns:
+        list: Move names, half turns written as two quarter turns
+    """
+    moves = []
+    for face, power in turns:
+        if power == 1:
+            moves.append(face)
+        elif power == 2:
+            moves.extend((face, face))
+        else:
+            moves.append(face + "'")
+    return moves
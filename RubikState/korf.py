@@ -0,0 +1,550 @@
+"""
+Korf's optimal solver for the 3x3 Rubik's cube
+
+IDA* on integer coordinates with three pattern databases:
+- all corners: permutation (40320) * twist (2187)
+- edges 0..5 and edges 6..11: positions of the six edges (12P6 = 665280) * their flips (64)
+The heuristic is the maximum of the three lookups, plus the two edge lookups
+on the inverse state. Since a state and its inverse are the same distance
+from solved, the inverse lookups are admissible too; for the corner database
+they would give the same value, because it covers every corner.
+
+Pattern databases are distances computed by a breadth-first search in the
+chosen metric ("qtm": quarter turns only, or "htm": quarter and half turns),
+so the first solution found is minimal in that metric. Moves are pruned to
+one canonical order per sequence of commuting or repeated turns. A long
+search can write its threshold and position to a checkpoint
+(RubikState.checkpoint) and resume from it after a restart.
+"""
+
+import os
+import time
+from array import array
+from itertools import combinations, permutations
+from operator import itemgetter
+
+import numpy as np
+
+from RubikState.coordinates import permutation_rank, permutation_rank_batch
+from RubikState.kociemba import (
+    N_MOVES, N_TWIST, FACES, face_turn_arrays, face_turns_to_moves, twist_move_table,
+    distance_table, load_table_file, save_table_file
+)
+from RubikState.rubik_chen import MOVES_3x3
+
+N_EDGE_POSITIONS = 665280  # 12 * 11 * 10 * 9 * 8 * 7
+N_EDGE_FLIPS = 64
+EDGE_GROUPS = ((0, 1, 2, 3, 4, 5), (6, 7, 8, 9, 10, 11))
+
+# Trọng số của mã Lehmer rút gọn cho 6 vị trí trong 12: 11!/6!, 10!/6!, ..., 1
+PARTIAL_WEIGHTS = (55440, 5040, 504, 56, 7, 1)
+
+METRIC_MOVES = {
+    "qtm": tuple(face * 3 + power for face in range(6) for power in (0, 2)),
+    "htm": tuple(range(N_MOVES)),
+}
+
+# Generated nodes between two time-limit checks
+TIME_CHECK_INTERVAL = 4096
+
+def partial_rank(positions):
+    """
+    Rank 6 distinct slots in 0..11 (lexicographic order of itertools.permutations)
+
+    Args:
+        positions: Sequence of 6 distinct slots
+
+    Returns:
+        int: Rank in range [0, 665280)
+    """
+    rank = 0
+    used = 0
+    for k in range(6):
+        slot = positions[k]
+        rank += (slot - bin(used & ((1 << slot) - 1)).count("1")) * PARTIAL_WEIGHTS[k]
+        used |= 1 << slot
+    return rank
+
+def partial_rank_batch(positions):
+    """Vectorized partial_rank for an (N, 6) array of slots"""
+    positions = np.asarray(positions, dtype=np.int64)
+    smaller = np.zeros_like(positions)
+    for k in range(1, 6):
+        smaller[:, k] = (positions[:, :k] < positions[:, k:k + 1]).sum(axis=1)
+    return (positions - smaller) @ np.array(PARTIAL_WEIGHTS)
+
+def canonical_moves(metric):
+    """
+    Move pruning tables for a metric
+
+    Sequences that can be rewritten into a shorter or an equivalent earlier
+    one are skipped: in both metrics two turns of opposite faces are only
+    played in face order. With quarter turns a face may be turned twice in a
+    row (as X X, never X' X'), with half turns only once.
+
+    Returns:
+        tuple: (allowed, next_ctx, root_ctx) where allowed[ctx] lists the moves
+               permitted in context ctx and next_ctx[ctx][m] is the context after m
+    """
+    moves = METRIC_MOVES[metric]
+    if metric == "qtm":
+        root = 2 * N_MOVES  # Context = last move * 2 + (1 if the last two moves were equal)
+    else:
+        root = N_MOVES      # Context = last move
+    allowed = []
+    next_ctx = []
+    for ctx in range(root + 1):
+        if ctx == root:
+            allowed.append(moves)
+            next_ctx.append(tuple(m * 2 if metric == "qtm" else m for m in range(N_MOVES)))
+            continue
+        last, repeated = divmod(ctx, 2) if metric == "qtm" else (ctx, 0)
+        last_face = last // 3
+        permitted = []
+        for m in moves:
+            face = m // 3
+            if face == last_face:
+                if metric == "htm" or m != last or repeated or m % 3 != 0:
+                    continue
+            elif face // 2 == last_face // 2 and face < last_face:
+                continue
+            permitted.append(m)
+        allowed.append(tuple(permitted))
+        if metric == "qtm":
+            next_ctx.append(tuple(m * 2 + (1 if m == last else 0) for m in range(N_MOVES)))
+        else:
+            next_ctx.append(tuple(range(N_MOVES)))
+    return allowed, next_ctx, root
+
+def _edge_distance_table(position_move, flip_move, goal, moves, chunk=1 << 22):
+    """
+    Breadth-first distances over the edge coordinate position * 64 + flips
+
+    Args:
+        position_move: (N_EDGE_POSITIONS, N_MOVES) move table of the positions
+        flip_move: (N_EDGE_POSITIONS, N_MOVES) flips xor-ed by each move
+        goal: Goal index
+        moves: Move indices of the metric
+        chunk: Frontier entries expanded at once (bounds temporary memory)
+
+    Returns:
+        np.ndarray: uint8 distances
+    """
+    dist = np.full(N_EDGE_POSITIONS * N_EDGE_FLIPS, 255, dtype=np.uint8)
+    dist[goal] = 0
+    depth = 0
+    frontier = np.array([goal], dtype=np.int64)
+    while frontier.size:
+        for start in range(0, frontier.size, chunk):
+            position, flips = np.divmod(frontier[start:start + chunk], N_EDGE_FLIPS)
+            for m in moves:
+                nxt = (position_move[position, m].astype(np.int64) * N_EDGE_FLIPS +
+                       (flips ^ flip_move[position, m]))
+                nxt = nxt[dist[nxt] == 255]
+                dist[nxt] = depth + 1
+        depth += 1
+        frontier = np.flatnonzero(dist == depth)
+    return dist
+
+class KorfTables:
+    """
+    Move tables and pattern databases of the optimal solver
+
+    Move tables are indexed by coordinate * N_MOVES + move; the pattern
+    databases (bytes) by cp * 2187 + twist and by positions * 64 + flips.
+    """
+    def __init__(self, metric="qtm", moves_dict=None, filename=None):
+        if metric not in METRIC_MOVES:
+            raise ValueError(f"Unknown metric: {metric}")
+        self.metric = metric
+        self.moves_dict = moves_dict or MOVES_3x3
+        self.filename = filename
+
+        arrays = load_table_file(filename) if filename else None
+        if arrays is None:
+            print(f"Building {metric.upper()} pattern databases, this takes a minute or two...")
+            arrays = self._build()
+            if filename:
+                save_table_file(filename, arrays)
+
+        self.cp_move = arrays["cp_move"].ravel().tolist()
+        self.twist_move = arrays["twist_move"].ravel().tolist()
+        self.edge_position_move = array('i', arrays["edge_position_move"].astype(np.int32).tobytes())
+        self.edge_flip_move = arrays["edge_flip_move"].astype(np.uint8).tobytes()
+        self.corner_pdb = arrays["corner_pdb"].tobytes()
+        self.edge_pdbs = (arrays["edge_pdb_0"].tobytes(), arrays["edge_pdb_1"].tobytes())
+        self._build_inverse_tables()
+
+    def _build(self):
+        """Build the move tables and the pattern databases"""
+        turns = face_turn_arrays(self.moves_dict)
+        moves = METRIC_MOVES[self.metric]
+
+        perms8 = np.array(list(permutations(range(8))), dtype=np.int8)
+        cp_move = np.stack([
+            permutation_rank_batch(perms8[:, cp]) for cp, _, _, _ in turns
+        ], axis=1).astype(np.int32)
+        twist_move = twist_move_table(turns)
+
+        # Edge positions in the order of itertools.permutations, i.e. partial_rank
+        positions = np.array(list(permutations(range(12), 6)), dtype=np.int8)
+        position_move = np.zeros((N_EDGE_POSITIONS, N_MOVES), dtype=np.int32)
+        flip_move = np.zeros((N_EDGE_POSITIONS, N_MOVES), dtype=np.int8)
+        for m, (_, _, ep, eo) in enumerate(turns):
+            # The edge in slot s moves to the slot t with ep[t] == s and is flipped by eo[t]
+            destination = np.argsort(ep)[positions]
+            position_move[:, m] = partial_rank_batch(destination)
+            flip_move[:, m] = eo[destination] @ (1 << np.arange(6))
+
+        corner_pdb = distance_table(cp_move, twist_move, 0, moves)
+        edge_pdbs = [
+            _edge_distance_table(position_move, flip_move, partial_rank(group) * N_EDGE_FLIPS, moves)
+            for group in EDGE_GROUPS
+        ]
+        return {
+            "cp_move": cp_move,
+            "twist_move": twist_move,
+            "edge_position_move": position_move,
+            "edge_flip_move": flip_move,
+            "corner_pdb": corner_pdb,
+            "edge_pdb_0": edge_pdbs[0],
+            "edge_pdb_1": edge_pdbs[1],
+        }
+
+    def coordinates(self, state):
+        """
+        Coordinates of a RubikState
+
+        Returns:
+            tuple: (cp, twist, positions_0, flips_0, positions_1, flips_1)
+        """
+        twist = 0
+        for value in state.co[:7]:
+            twist = twist * 3 + value
+        coords = [permutation_rank(state.cp), twist]
+        slot_of = [0] * 12
+        for slot, edge in enumerate(state.ep):
+            slot_of[edge] = slot
+        for group in EDGE_GROUPS:
+            slots = [slot_of[edge] for edge in group]
+            flips = 0
+            for k, slot in enumerate(slots):
+                flips |= state.eo[slot] << k
+            coords += [partial_rank(slots), flips]
+        return tuple(coords)
+
+    def _build_inverse_tables(self):
+        """
+        Tables for the edge lookups on the inverse state
+
+        The edges 0..5 of the inverse sit in the slots given by the labels of
+        slots 0..5 of the state, with the flips found in those slots (same
+        for 6..11). The edges are tracked as 24 stickers, slot j holding
+        ep[j] * 2 + (k + eo[j]) % 2 at j + 12 * k, so a move is one itemgetter
+        and sticker values v = label * 2 + flip of 6 slots index a pattern
+        database with two lookups:
+            first[a] + second[first_set[a] + b]
+        for a and b the base-24 numbers of the first and last three values.
+        """
+        turns = face_turn_arrays(self.moves_dict)
+        self.edge_apply = [
+            itemgetter(*[int(ep[j]) + 12 * ((k + int(eo[j])) % 2) for k in range(2) for j in range(12)])
+            for _, _, ep, eo in turns
+        ]
+
+        values = np.array(np.unravel_index(np.arange(24 ** 3), (24,) * 3)).T
+        labels, flips = np.divmod(values, 2)
+        flip_bits = flips @ np.array([1, 2, 4])
+        weights = np.array(PARTIAL_WEIGHTS)
+        smaller = np.stack([np.zeros(len(labels), dtype=np.int64),
+                            labels[:, 0] < labels[:, 1],
+                            (labels[:, :2] < labels[:, 2:3]).sum(axis=1)], axis=1)
+        self.dual_first = ((labels - smaller) @ weights[:3] * N_EDGE_FLIPS + flip_bits).tolist()
+
+        # Labels of the first three slots only matter as a set for the last three
+        sets = list(combinations(range(12), 3))
+        set_index = np.zeros(12 ** 3, dtype=np.int64)
+        for i, (a, b, c) in enumerate(sets):
+            for order in permutations((a, b, c)):
+                set_index[(order[0] * 12 + order[1]) * 12 + order[2]] = i
+        self.dual_first_set = (set_index[(labels[:, 0] * 12 + labels[:, 1]) * 12 + labels[:, 2]] *
+                               24 ** 3).tolist()
+        second = np.zeros((len(sets), 24 ** 3), dtype=np.int32)
+        for i, chosen in enumerate(sets):
+            before = (labels[:, :, None] > np.array(chosen)).sum(axis=2)
+            c = labels - before - smaller
+            second[i] = (c @ weights[3:]) * N_EDGE_FLIPS + flip_bits * 8
+        self.dual_second = array('i', second.tobytes())
+
+    def edge_key(self, state):
+        """Edge stickers of a RubikState, as tracked for the inverse lookups"""
+        return tuple(state.ep[j] * 2 + (k + state.eo[j]) % 2 for k in range(2) for j in range(12))
+
+    def inverse_edge_heuristic(self, edges):
+        """
+        Maximum of the edge pattern databases on the inverse state
+
+        Args:
+            edges: Edge stickers (see edge_key)
+        """
+        first, first_set, second = self.dual_first, self.dual_first_set, self.dual_second
+        a = (edges[0] * 24 + edges[1]) * 24 + edges[2]
+        h = self.edge_pdbs[0][first[a] + second[first_set[a] + (edges[3] * 24 + edges[4]) * 24 + edges[5]]]
+        a = (edges[6] * 24 + edges[7]) * 24 + edges[8]
+        h1 = self.edge_pdbs[1][first[a] + second[first_set[a] + (edges[9] * 24 + edges[10]) * 24 + edges[11]]]
+        return h if h > h1 else h1
+
+    def batch_lookups(self, arr):
+        """
+        Pattern database values of a batch of states
+
+        Args:
+            arr: (N, 40) array of cp, co, ep, eo rows (see states_to_array_3x3)
+
+        Returns:
+            tuple: (corner, edges 0..5, edges 6..11) uint8 arrays of length N
+        """
+        arr = np.asarray(arr, dtype=np.int64)
+        twist = arr[:, 8:15] @ (3 ** np.arange(6, -1, -1))
+        corner = np.frombuffer(self.corner_pdb, dtype=np.uint8)[
+            permutation_rank_batch(arr[:, :8]) * N_TWIST + twist]
+        slot_of = np.argsort(arr[:, 16:28], axis=1)
+        flips = np.take_along_axis(arr[:, 28:40], slot_of, axis=1) @ (1 << np.arange(12))
+        edges = [np.frombuffer(pdb, dtype=np.uint8)[
+                     partial_rank_batch(slot_of[:, 6 * g:6 * g + 6]) * N_EDGE_FLIPS + ((flips >> (6 * g)) & 63)]
+                 for g, pdb in enumerate(self.edge_pdbs)]
+        return corner, edges[0], edges[1]
+
+    def key_heuristic(self):
+        """
+        Pattern database heuristic on the 48-sticker keys of compiled_moves
+
+        key[:8] holds cp * 3 + co and key[8:20] holds ep * 2 + eo per slot.
+        Admissible for searches with the moves of the tables' metric.
+
+        Returns:
+            function: h(key, g) -> int
+        """
+        corner_pdb = self.corner_pdb
+        edge_pdb_0, edge_pdb_1 = self.edge_pdbs
+
+        def h(key, g):
+            twist = 0
+            for value in key[:7]:
+                twist = twist * 3 + value % 3
+            best = corner_pdb[permutation_rank([value // 3 for value in key[:8]]) * N_TWIST + twist]
+            slot_of = [0] * 12
+            flips = 0
+            for slot in range(12):
+                value = key[8 + slot]
+                slot_of[value >> 1] = slot
+                flips |= (value & 1) << (value >> 1)
+            value = edge_pdb_0[partial_rank(slot_of[:6]) * N_EDGE_FLIPS + (flips & 63)]
+            if value > best:
+                best = value
+            value = edge_pdb_1[partial_rank(slot_of[6:]) * N_EDGE_FLIPS + (flips >> 6)]
+            return value if value > best else best
+        return h
+
+_tables = {}
+
+def get_korf_tables(metric="qtm"):
+    """Return the tables of a metric for MOVES_3x3, loading or building them on first use"""
+    if metric not in _tables:
+        filename = os.path.join(os.path.dirname(__file__), f"korf_tables_{metric}.npz")
+        _tables[metric] = KorfTables(metric, MOVES_3x3, filename)
+    return _tables[metric]
+
+def korf_ida_star(state, tables, start_time, time_limit, progress=None, inverse_lookups=True,
+                  checkpoint=None):
+    """
+    IDA* with pattern database heuristics
+
+    Args:
+        state: RubikState to solve
+        tables: KorfTables of the chosen metric
+        start_time: time.time() at the start of the search
+        time_limit: Time limit in seconds
+        progress: Optional callback progress(threshold, nodes, elapsed) called
+                  when an iteration starts
+        inverse_lookups: Also look up the edge databases on the inverse state
+        checkpoint: Optional Checkpoint receiving the threshold and the position in
+                    the iteration (path prefix and child cursors); the search resumes
+                    from it and deletes it once a solution is found
+
+    Returns:
+        tuple: (list of move indices (face * 3 + power - 1) or None, nodes_generated)
+    """
+    deadline = start_time + time_limit
+    allowed, next_ctx, root_ctx = canonical_moves(tables.metric)
+
+    cp_move = tables.cp_move
+    twist_move = tables.twist_move
+    edge_position_move = tables.edge_position_move
+    edge_flip_move = tables.edge_flip_move
+    corner_pdb = tables.corner_pdb
+    edge_pdb_0, edge_pdb_1 = tables.edge_pdbs
+    inverse_h = tables.inverse_edge_heuristic if inverse_lookups else None
+    edge_apply = tables.edge_apply
+
+    cp, twist, p0, f0, p1, f1 = tables.coordinates(state)
+    edge_key = tables.edge_key(state)
+    goal_p0 = partial_rank(EDGE_GROUPS[0])
+    goal_p1 = partial_rank(EDGE_GROUPS[1])
+    if cp == 0 and twist == 0 and p0 == goal_p0 and f0 == 0 and p1 == goal_p1 and f1 == 0:
+        return [], 1
+
+    threshold = max(corner_pdb[cp * N_TWIST + twist],
+                    edge_pdb_0[p0 * N_EDGE_FLIPS + f0],
+                    edge_pdb_1[p1 * N_EDGE_FLIPS + f1])
+    if inverse_h is not None:
+        threshold = max(threshold, inverse_h(edge_key))
+
+    nodes = 1
+    next_check = TIME_CHECK_INTERVAL
+    position = None
+    if checkpoint is not None:
+        saved = checkpoint.load()
+        if saved is not None:
+            threshold, position, nodes = saved["threshold"], saved["position"], saved["nodes"]
+    while True:
+        if progress is not None:
+            progress(threshold, nodes, time.time() - start_time)
+
+        size = threshold + 1
+        path = [0] * size
+        # Coordinates multiplied by N_MOVES, ready to index the move tables
+        cps = [0] * size
+        twists = [0] * size
+        p0s = [0] * size
+        f0s = [0] * size
+        p1s = [0] * size
+        f1s = [0] * size
+        children = [()] * size
+        cursor = [0] * size
+        ctxs = [0] * size
+        edge_keys = [None] * size
+        edge_keys[0] = edge_key
+        cps[0], twists[0], p0s[0], p1s[0] = cp * N_MOVES, twist * N_MOVES, p0 * N_MOVES, p1 * N_MOVES
+        f0s[0], f1s[0] = f0, f1
+        ctxs[0] = root_ctx
+        children[0] = allowed[root_ctx]
+        depth = 0
+        next_threshold = 255
+        if position is not None:
+            # Replay the path prefix of the checkpoint, then restore the cursors
+            prefix, cursors, next_threshold = position
+            for depth, m in enumerate(prefix):
+                g = depth + 1
+                base0, base1 = p0s[depth] + m, p1s[depth] + m
+                path[depth] = m
+                cps[g] = cp_move[cps[depth] + m] * N_MOVES
+                twists[g] = twist_move[twists[depth] + m] * N_MOVES
+                p0s[g] = edge_position_move[base0] * N_MOVES
+                f0s[g] = f0s[depth] ^ edge_flip_move[base0]
+                p1s[g] = edge_position_move[base1] * N_MOVES
+                f1s[g] = f1s[depth] ^ edge_flip_move[base1]
+                ctxs[g] = next_ctx[ctxs[depth]][m]
+                edge_keys[g] = edge_apply[m](edge_keys[depth])
+                children[g] = allowed[ctxs[g]]
+            depth = len(prefix)
+            cursor[:depth + 1] = cursors
+            position = None
+
+        while True:
+            i = cursor[depth]
+            moves_here = children[depth]
+            if i == len(moves_here):
+                if depth == 0:
+                    break
+                depth -= 1
+                continue
+            cursor[depth] = i + 1
+            m = moves_here[i]
+            g = depth + 1
+            nodes += 1
+            if nodes >= next_check:
+                timed_out = time.time() >= deadline
+                if checkpoint is not None and (timed_out or checkpoint.due()):
+                    # The current child i is generated again on resume
+                    checkpoint.save({"threshold": threshold, "nodes": nodes, "position": (
+                        tuple(path[:depth]), tuple(cursor[:depth]) + (i,), next_threshold)})
+                if timed_out:
+                    return None, nodes
+                next_check += TIME_CHECK_INTERVAL
+
+            budget = threshold - g
+            new_cp = cp_move[cps[depth] + m]
+            new_twist = twist_move[twists[depth] + m]
+            h = corner_pdb[new_cp * N_TWIST + new_twist]
+            if h > budget:
+                if g + h < next_threshold:
+                    next_threshold = g + h
+                continue
+            base = p0s[depth] + m
+            new_p0 = edge_position_move[base]
+            new_f0 = f0s[depth] ^ edge_flip_move[base]
+            h = edge_pdb_0[new_p0 * N_EDGE_FLIPS + new_f0]
+            if h > budget:
+                if g + h < next_threshold:
+                    next_threshold = g + h
+                continue
+            base = p1s[depth] + m
+            new_p1 = edge_position_move[base]
+            new_f1 = f1s[depth] ^ edge_flip_move[base]
+            h = edge_pdb_1[new_p1 * N_EDGE_FLIPS + new_f1]
+            if h > budget:
+                if g + h < next_threshold:
+                    next_threshold = g + h
+                continue
+
+            if budget == 0:
+                # Every database reads 0 only on the solved cube
+                if (new_cp == 0 and new_twist == 0 and new_p0 == goal_p0 and new_f0 == 0 and
+                        new_p1 == goal_p1 and new_f1 == 0):
+                    path[depth] = m
+                    if checkpoint is not None:
+                        checkpoint.clear()
+                    return path[:g], nodes
+                continue
+
+            if inverse_h is not None:
+                edges = edge_apply[m](edge_keys[depth])
+                h = inverse_h(edges)
+                if h > budget:
+                    if g + h < next_threshold:
+                        next_threshold = g + h
+                    continue
+
+            path[depth] = m
+            ctx = next_ctx[ctxs[depth]][m]
+            cps[g] = new_cp * N_MOVES
+            twists[g] = new_twist * N_MOVES
+            p0s[g] = new_p0 * N_MOVES
+            f0s[g] = new_f0
+            p1s[g] = new_p1 * N_MOVES
+            f1s[g] = new_f1
+            ctxs[g] = ctx
+            if inverse_h is not None:
+                edge_keys[g] = edges
+            children[g] = allowed[ctx]
+            cursor[g] = 0
+            depth = g
+
+        threshold = next_threshold
+        if time.time() >= deadline:
+            if checkpoint is not None:
+                checkpoint.save({"threshold": threshold, "nodes": nodes, "position": None})
+            return None, nodes
+
+def korf_moves_to_names(moves):
+    """
+    Write move indices with the quarter turn names of moves_dict
+
+    Args:
+        moves: Move indices, face * 3 + power - 1
+
+    Returns:
+        list: Move names, half turns written as two quarter turns
+    """
+    return face_turns_to_moves([(FACES[m // 3], m % 3 + 1) for m in moves])
@@ -0,0 +1,387 @@
+"""
+Local search shared by the 2x2 and 3x3 solvers
+
+A batch of independent walkers moves on the sticker arrays of
+RubikState.compiled_moves (one row per walker, every move is a column gather
+with compiled.sources), so one NumPy step advances and scores every walker
+at once. The goal is reached when the score is 0. The score is the number
+of misplaced plus misoriented cubies, measured relative to the goal with
+CompiledMoves.relative_to; it is much finer than heuristic_2x2 /
+heuristic_3x3, which divide it by 4 and leave plateaus everywhere.
+
+Memory is constant: each walker keeps its state and a path buffer of
+max_steps moves, and a walker whose path is full starts again from the
+start state. Nothing else is remembered, apart from the fixed-size tabu
+lists of tabu_search. Solutions are long; simplify_moves removes the
+obvious detours (a move and its inverse, three equal quarter turns).
+
+Three strategies:
+- random_restart_hill_climbing: steepest descent with a budget of sideways
+  moves; a stuck walker restarts from the start state after a few random moves
+- simulated_annealing: random moves, worse ones accepted with probability
+  exp(-delta / T) under a cooling schedule that reheats when T gets too low
+- tabu_search: best move whose state is not in the walker's list of recent
+  state hashes (a tabu state is allowed if it beats the walker's best score)
+"""
+
+import math
+import time
+
+import numpy as np
+
+from RubikState.compiled_moves import heuristic_terms
+
+COOLING_SCHEDULES = ("geometric", "linear", "logarithmic")
+
+# Sort key offsets: score * TIE_SCALE + random tie-break
+TIE_SCALE = 16
+BLOCKED = np.iinfo(np.int32).max
+
+HASH_1 = np.uint64(0x9E3779B97F4A7C15)
+HASH_2 = np.uint64(0xBF58476D1CE4E5B9)
+
+def simplify_moves(compiled, moves):
+    """
+    Remove a move followed by its inverse and turn three equal moves into the inverse
+
+    Args:
+        compiled: CompiledMoves of the moves
+        moves: List of move indices
+
+    Returns:
+        list: Equivalent, never longer list of move indices
+    """
+    inverse = compiled.inverse
+    # triple[m]: move equal to m played three times (-1 if none)
+    triple = []
+    for m, sources in enumerate(compiled.sources):
+        thrice = tuple(sources[sources[s]] for s in sources)
+        triple.append(inverse[m] if inverse[m] >= 0 and thrice == compiled.sources[inverse[m]] else -1)
+    out = []
+    for m in moves:
+        pending = m
+        while pending is not None:
+            m, pending = pending, None
+            if out and out[-1] == inverse[m]:
+                out.pop()
+            elif len(out) >= 2 and out[-1] == m and out[-2] == m and triple[m] >= 0:
+                del out[-2:]
+                pending = triple[m]
+            else:
+                out.append(m)
+    return out
+
+class StickerScorer:
+    """
+    Sticker arrays relative to a goal, with their scores
+
+    Attributes:
+        start: Start state relative to the goal (int8 sticker array, the goal is solved)
+        start_score: Score of the start state
+        sources: (moves, size) column gather of every move
+        slots: Number of leading entries holding the cubie encoding
+    """
+    def __init__(self, start_key, goal_key, compiled, score_batch=None):
+        """
+        Args:
+            start_key: Encoded start state
+            goal_key: Encoded goal state
+            compiled: CompiledMoves of the search
+            score_batch: Optional score of (N, 40) state arrays (cp, co, ep, eo), 0 only at
+                         solved (default counts misplaced and misoriented cubies)
+        """
+        to_goal = compiled.relative_to(goal_key)
+        self.start = np.array(to_goal(start_key), dtype=np.int8)
+        self.sources = np.array(compiled.sources, dtype=np.intp)
+        contrib, _ = heuristic_terms(compiled, start_key)
+        # Corner counts sit in the low 5 bits of contrib, edge counts above
+        self.table = np.array([[(c & 31) + (c >> 5) for c in row] for row in contrib], dtype=np.int32)
+        self.slot_index = np.arange(compiled.slots)
+        self.slots = compiled.slots
+        self.score_batch = score_batch
+        self.start_score = int(self.score(self.start[None])[0])
+
+    def score(self, states):
+        """Scores of (..., size) sticker arrays, 0 only at the goal"""
+        if self.score_batch is None:
+            return self.table[self.slot_index, states[..., :self.slots]].sum(axis=-1)
+        cubies = states[..., :self.slots].reshape(-1, self.slots)
+        arr = np.concatenate([cubies[:, :8] // 3, cubies[:, :8] % 3, cubies[:, 8:] // 2, cubies[:, 8:] % 2], axis=1)
+        return np.asarray(self.score_batch(arr), dtype=np.int32).reshape(states.shape[:-1])
+
+class _Walkers(StickerScorer):
+    """States, scores and path buffers of a batch of walkers"""
+    def __init__(self, start_key, goal_key, compiled, walkers, max_steps, rng, score_batch=None):
+        super().__init__(start_key, goal_key, compiled, score_batch)
+        self.inverse = np.array(compiled.inverse + [-1], dtype=np.intp)  # inverse[-1]: no last move
+        self.n = len(compiled.sources)
+        self.rng = rng
+
+        self.rows = np.arange(walkers)
+        self.states = np.tile(self.start, (walkers, 1))
+        self.scores = np.full(walkers, self.start_score, dtype=np.int32)
+        self.paths = np.zeros((walkers, max_steps), dtype=np.int8)
+        self.lengths = np.zeros(walkers, dtype=np.int64)
+        self.max_steps = max_steps
+        self.nodes = 0
+
+    def children(self):
+        """(walkers, moves, size) states after each move and their (walkers, moves) scores"""
+        children = self.states[:, self.sources]
+        self.nodes += children.shape[0] * children.shape[1]
+        return children, self.score(children)
+
+    def forbidden(self):
+        """Index of the move undoing each walker's last move (-1 if none)"""
+        last = np.where(self.lengths > 0, self.paths[self.rows, np.maximum(self.lengths - 1, 0)], -1)
+        return self.inverse[last]
+
+    def random_moves(self):
+        """A random move per walker, never the inverse of its last move"""
+        forbidden = self.forbidden()
+        moves = self.rng.integers(0, self.n - (forbidden >= 0))
+        return moves + ((forbidden >= 0) & (moves >= forbidden))
+
+    def move(self, walkers, moves, states=None, scores=None):
+        """Play moves[k] on walker walkers[k] (states and scores of the children if known)"""
+        if not len(walkers):
+            return
+        if states is None:
+            states = self.states[walkers[:, None], self.sources[moves]]
+            scores = self.score(states)
+            self.nodes += len(walkers)
+        self.states[walkers] = states
+        self.scores[walkers] = scores
+        self.paths[walkers, self.lengths[walkers]] = moves
+        self.lengths[walkers] += 1
+
+    def restart(self, walkers):
+        """Send walkers back to the start state"""
+        self.states[walkers] = self.start
+        self.scores[walkers] = self.start_score
+        self.lengths[walkers] = 0
+
+    def full(self):
+        """Walkers whose path buffer is full"""
+        return np.flatnonzero(self.lengths >= self.max_steps)
+
+    def solution(self):
+        """Path of a walker at the goal, None if there is none"""
+        done = np.flatnonzero(self.scores == 0)
+        if not len(done):
+            return None
+        walker = done[np.argmin(self.lengths[done])]
+        return self.paths[walker, :self.lengths[walker]].tolist()
+
+    def hashes(self, states):
+        """64-bit hashes of (..., size) sticker arrays (the cubie part identifies a state)"""
+        cubies = states[..., :self.slots].astype(np.uint64)
+        low = np.zeros(cubies.shape[:-1], dtype=np.uint64)
+        high = np.zeros(cubies.shape[:-1], dtype=np.uint64)
+        for slot in range(min(self.slots, 12)):
+            low |= cubies[..., slot] << np.uint64(5 * slot)
+        for slot in range(12, self.slots):
+            high |= cubies[..., slot] << np.uint64(5 * (slot - 12))
+        return (low * HASH_1) ^ ((high + HASH_2) * HASH_2)
+
+def _result(walkers, compiled, moves):
+    """Move names of a walker path after simplify_moves"""
+    return [compiled.names[m] for m in simplify_moves(compiled, moves)], walkers.nodes
+
+def random_restart_hill_climbing(start_key, goal_key, compiled, start_time, time_limit, walkers=256,
+                                 max_steps=200, max_sideways=20, restart_moves=3, seed=None, score_batch=None):
+    """
+    Steepest-descent hill climbing with random restarts
+
+    Every walker plays its best move (random among equal scores). Moves that
+    keep the score are allowed max_sideways times in a row; a walker with no
+    improving move left restarts from the start state with restart_moves
+    random moves.
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves of the search
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        walkers: Number of walkers moved together
+        max_steps: Path length after which a walker restarts
+        max_sideways: Consecutive moves without improvement allowed
+        restart_moves: Random moves played after a restart
+        seed: Seed of the random generator
+        score_batch: Optional score of (N, 40) state arrays (cp, co, ep, eo) relative
+                     to the goal, 0 only at the goal (default counts misplaced and
+                     misoriented cubies)
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    deadline = start_time + time_limit
+    rng = np.random.default_rng(seed)
+    batch = _Walkers(start_key, goal_key, compiled, walkers, max_steps, rng, score_batch)
+    sideways = np.zeros(walkers, dtype=np.int32)
+    kick = np.full(walkers, restart_moves, dtype=np.int32)
+
+    while time.time() < deadline:
+        moves = batch.solution()
+        if moves is not None:
+            return _result(batch, compiled, moves)
+
+        children, scores = batch.children()
+        keys = scores * TIE_SCALE + rng.integers(0, TIE_SCALE, scores.shape)
+        forbidden = batch.forbidden()
+        keys[batch.rows[forbidden >= 0], forbidden[forbidden >= 0]] = BLOCKED
+        best = keys.argmin(axis=1)
+        best_scores = scores[batch.rows, best]
+
+        kicking = kick > 0
+        improving = ~kicking & (best_scores < batch.scores)
+        level = ~kicking & (best_scores == batch.scores) & (sideways < max_sideways)
+        sideways[improving] = 0
+        sideways[level] += 1
+
+        climb = np.flatnonzero(improving | level)
+        batch.move(climb, best[climb], children[climb, best[climb]], best_scores[climb])
+        random_walkers = np.flatnonzero(kicking)
+        batch.move(random_walkers, batch.random_moves()[random_walkers])
+        kick[kicking] -= 1
+
+        stuck = np.flatnonzero(~kicking & ~improving & ~level)
+        stuck = np.union1d(stuck, batch.full())
+        batch.restart(stuck)
+        sideways[stuck] = 0
+        kick[stuck] = restart_moves
+
+    return None, batch.nodes
+
+def _cooling(schedule, temperature, rate):
+    """Temperature as a function of the step"""
+    if callable(schedule):
+        return schedule
+    if schedule == "geometric":
+        return lambda step: temperature * rate ** step
+    if schedule == "linear":
+        return lambda step: temperature - rate * step
+    if schedule == "logarithmic":
+        return lambda step: temperature / math.log(math.e + rate * step)
+    raise ValueError(f"Unknown cooling schedule: {schedule} (use one of {COOLING_SCHEDULES} or a function)")
+
+def simulated_annealing(start_key, goal_key, compiled, start_time, time_limit, walkers=256, max_steps=500,
+                        temperature=2.0, cooling="geometric", cooling_rate=0.995, min_temperature=0.05,
+                        seed=None, score_batch=None):
+    """
+    Simulated annealing
+
+    Each walker tries a random move (never the inverse of its last one) and
+    plays it if it does not raise the score, or else with probability
+    exp(-delta / T). The temperature follows the cooling schedule from the
+    start and is reset (reheated) once it falls below min_temperature.
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves of the search
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        walkers: Number of walkers moved together
+        max_steps: Path length after which a walker restarts
+        temperature: Initial temperature
+        cooling: "geometric" (T0 * rate ** step), "linear" (T0 - rate * step),
+                 "logarithmic" (T0 / ln(e + rate * step)) or a function step -> T
+        cooling_rate: Rate of the named schedules
+        min_temperature: Temperature that triggers a reheat
+        seed: Seed of the random generator
+        score_batch: Optional score of (N, 40) state arrays (cp, co, ep, eo) relative
+                     to the goal, 0 only at the goal (default counts misplaced and
+                     misoriented cubies)
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    deadline = start_time + time_limit
+    schedule = _cooling(cooling, temperature, cooling_rate)
+    rng = np.random.default_rng(seed)
+    batch = _Walkers(start_key, goal_key, compiled, walkers, max_steps, rng, score_batch)
+    step = 0
+
+    while time.time() < deadline:
+        moves = batch.solution()
+        if moves is not None:
+            return _result(batch, compiled, moves)
+
+        t = schedule(step)
+        if t < min_temperature:
+            step = 0
+            t = schedule(0)
+        step += 1
+
+        moves = batch.random_moves()
+        states = batch.states[batch.rows[:, None], batch.sources[moves]]
+        scores = batch.score(states)
+        batch.nodes += walkers
+        delta = scores - batch.scores
+        accept = (delta <= 0) | (rng.random(walkers) < np.exp(-np.maximum(delta, 0) / t))
+        chosen = np.flatnonzero(accept)
+        batch.move(chosen, moves[chosen], states[chosen], scores[chosen])
+        batch.restart(batch.full())
+
+    return None, batch.nodes
+
+def tabu_search(start_key, goal_key, compiled, start_time, time_limit, walkers=64, max_steps=500,
+                tenure=32, seed=None, score_batch=None):
+    """
+    Tabu search on state hashes
+
+    Every walker plays its best move, even a worse one, among the moves whose
+    state hash is not in its tabu list of the last tenure states; a tabu
+    state is still allowed when it beats the best score the walker reached.
+    A walker with every move tabu restarts from the start state.
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves of the search
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        walkers: Number of walkers moved together
+        max_steps: Path length after which a walker restarts
+        tenure: Length of each tabu list
+        seed: Seed of the random generator
+        score_batch: Optional score of (N, 40) state arrays (cp, co, ep, eo) relative
+                     to the goal, 0 only at the goal (default counts misplaced and
+                     misoriented cubies)
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    deadline = start_time + time_limit
+    rng = np.random.default_rng(seed)
+    batch = _Walkers(start_key, goal_key, compiled, walkers, max_steps, rng, score_batch)
+    start_hash = batch.hashes(batch.start[None])[0]
+    tabu = np.full((walkers, tenure), start_hash, dtype=np.uint64)  # Ring buffers of recent states
+    position = 0
+    best_seen = batch.scores.copy()
+
+    while time.time() < deadline:
+        moves = batch.solution()
+        if moves is not None:
+            return _result(batch, compiled, moves)
+
+        children, scores = batch.children()
+        hashes = batch.hashes(children)
+        allowed = ~(hashes[:, :, None] == tabu[:, None, :]).any(axis=2) | (scores < best_seen[:, None])
+        keys = np.where(allowed, scores * TIE_SCALE + rng.integers(0, TIE_SCALE, scores.shape), BLOCKED)
+        best = keys.argmin(axis=1)
+        movable = np.flatnonzero(keys[batch.rows, best] != BLOCKED)
+
+        tabu[:, position] = batch.hashes(batch.states)
+        position = (position + 1) % tenure
+        batch.move(movable, best[movable], children[movable, best[movable]], scores[movable, best[movable]])
+        np.minimum(best_seen, batch.scores, out=best_seen)
+
+        stuck = np.union1d(np.setdiff1d(batch.rows, movable), batch.full())
+        batch.restart(stuck)
+        tabu[stuck] = start_hash
+        best_seen[stuck] = batch.start_score
+
+    return None, batch.nodes
@@ -0,0 +1,261 @@
+"""
+Memory-bounded best-first search (SMA*) shared by the 2x2 and 3x3 solvers
+
+States are the encoded keys of RubikState.compiled_moves. The search is A*
+with a hard cap on the number of resident nodes (Russell 1992, simplified
+full-expansion variant):
+- the best leaf (lowest f, deepest) is expanded and all its children are
+  generated at once, with f = max(f(parent), g + h) (pathmax)
+- an interior node's f is the minimum of its children's f and of the
+  forgotten f of its pruned children, backed up towards the root
+- before an expansion that would exceed max_nodes resident nodes, the worst
+  leaves (highest f, shallowest) are dropped and their f is remembered by
+  their parents; a node with forgotten children stays in OPEN with the best
+  forgotten f and regenerates those children when that f becomes the best
+
+Duplicate states are only detected among resident nodes, and a node that
+cannot be deeper than the cap allows gets f = infinity. With an admissible
+heuristic the solution is optimal whenever the cap holds an optimal path.
+"""
+
+import time
+import heapq
+from array import array
+
+from RubikState.search_structures import BucketQueue
+
+# How many generated nodes between two time-limit checks
+TIME_CHECK_INTERVAL = 4096
+
+INF = float('inf')
+
+class _Nodes:
+    """
+    Resident nodes in parallel arrays with recycled slots
+
+    Slot versions invalidate queue entries: a slot's version changes whenever
+    its node stops being a leaf, changes f, or is freed.
+    """
+    def __init__(self):
+        self.keys = []
+        self.parent = array('i')
+        self.move = array('b')
+        self.g = array('i')
+        self.ctx = array('i')
+        self.f = []
+        self.children = []    # Resident child slots (empty for a leaf)
+        self.forgotten = []   # None or {move: backed-up f of a dropped child}
+        self.version = array('i')
+        self.free = []
+        self.resident = 0
+
+    def add(self, key, parent, move, g, ctx, f):
+        """Store a node in a free slot and return the slot"""
+        self.resident += 1
+        if self.free:
+            slot = self.free.pop()
+            self.keys[slot] = key
+            self.parent[slot] = parent
+            self.move[slot] = move
+            self.g[slot] = g
+            self.ctx[slot] = ctx
+            self.f[slot] = f
+            self.version[slot] += 1
+            return slot
+        self.keys.append(key)
+        self.parent.append(parent)
+        self.move.append(move)
+        self.g.append(g)
+        self.ctx.append(ctx)
+        self.f.append(f)
+        self.children.append([])
+        self.forgotten.append(None)
+        self.version.append(0)
+        return len(self.keys) - 1
+
+    def remove(self, slot):
+        """Free the slot of a leaf"""
+        self.resident -= 1
+        self.keys[slot] = None
+        self.forgotten[slot] = None
+        self.version[slot] += 1
+        self.free.append(slot)
+
+    def path(self, slot, move_names):
+        """Move names from the root to a resident node"""
+        moves = []
+        while self.parent[slot] != -1:
+            moves.append(move_names[self.move[slot]])
+            slot = self.parent[slot]
+        moves.reverse()
+        return moves
+
+def sma_star(start_key, goal_key, compiled, heuristic, start_time, time_limit, max_nodes=500000):
+    """
+    Simplified memory-bounded A*
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes
+        heuristic: Function h(key, g)
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        max_nodes: Maximum number of resident nodes (at least twice the number of moves)
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated, stats)
+               stats is a dict with max_resident_nodes, pruned_nodes and expanded_nodes
+    """
+    n_moves = len(compiled.apply)
+    if max_nodes < 2 * n_moves:
+        raise ValueError(f"max_nodes must be at least {2 * n_moves}")
+    deadline = start_time + time_limit
+    apply = compiled.apply
+    allowed = compiled.allowed
+    next_ctx = compiled.next_ctx
+
+    nodes = _Nodes()
+    keys, parent, move, g_of, ctx_of = nodes.keys, nodes.parent, nodes.move, nodes.g, nodes.ctx
+    f_of, children, forgotten, version = nodes.f, nodes.children, nodes.forgotten, nodes.version
+    root = nodes.add(start_key, -1, -1, 0, compiled.root_ctx, heuristic(start_key, 0))
+    resident = {start_key: root}  # State -> slot of its resident copy
+
+    # OPEN holds the leaves by f and the partly expanded nodes by their best forgotten
+    # f; worst holds (-f, g, version, slot) of the leaves, to find the leaf to drop.
+    # Both keep stale entries, checked against the slot version.
+    open_queue = BucketQueue(order="high_g")
+    worst = []
+
+    def enqueue(slot):
+        # Queue a node after a change of its f, children or forgotten children
+        version[slot] += 1
+        if not children[slot]:
+            if f_of[slot] != INF:
+                open_queue.push(f_of[slot], (slot, version[slot]), g_of[slot])
+            heapq.heappush(worst, (-f_of[slot], g_of[slot], version[slot], slot))
+        elif forgotten[slot]:
+            f = min(forgotten[slot].values())
+            if f != INF:
+                open_queue.push(f, (slot, version[slot]), g_of[slot])
+
+    def rebuild_queues():
+        # Drop stale entries once they far outnumber the resident nodes
+        nonlocal open_queue, worst
+        open_queue = BucketQueue(order="high_g")
+        worst = []
+        for slot in range(len(keys)):
+            if keys[slot] is not None:
+                enqueue(slot)
+
+    def backup(slot):
+        # Recompute f from children and forgotten values up to the root
+        while slot != -1:
+            values = [f_of[child] for child in children[slot]]
+            if forgotten[slot]:
+                values.extend(forgotten[slot].values())
+            f = min(values) if values else INF
+            if f == f_of[slot]:
+                return
+            f_of[slot] = f
+            if not children[slot]:
+                enqueue(slot)
+            slot = parent[slot]
+
+    def drop(slot):
+        # Forget a leaf into its parent, which goes back into OPEN
+        p = parent[slot]
+        key = keys[slot]
+        if resident.get(key) == slot:
+            del resident[key]
+        children[p].remove(slot)
+        if forgotten[p] is None:
+            forgotten[p] = {}
+        forgotten[p][move[slot]] = f_of[slot]
+        nodes.remove(slot)
+        enqueue(p)
+
+    enqueue(root)
+    generated = 1
+    expanded = 0
+    pruned = 0
+    max_resident = 1
+    next_check = TIME_CHECK_INTERVAL
+
+    while open_queue:
+        f, (slot, stamp) = open_queue.pop()
+        if version[slot] != stamp:
+            continue  # Stale entry
+        key = keys[slot]
+        if key == goal_key:
+            return nodes.path(slot, compiled.names), generated, {
+                "max_resident_nodes": max_resident, "pruned_nodes": pruned, "expanded_nodes": expanded
+            }
+
+        expanded += 1
+        version[slot] += 1  # Keep the worst-leaf search away from this node
+        g = g_of[slot] + 1
+        ctx = ctx_of[slot]
+
+        # Make room for the children by dropping the worst leaves
+        while nodes.resident + len(allowed[ctx]) > max_nodes and worst:
+            _, _, stamp, victim = heapq.heappop(worst)
+            if version[victim] == stamp and victim != root and victim != slot:
+                drop(victim)
+                pruned += 1
+
+        memory = forgotten[slot]
+        if not children[slot] and memory is None:
+            # First expansion: every child, with pathmax
+            regenerate = [(m, f) for m in allowed[ctx]]
+        else:
+            # Regenerate the forgotten children with the best backed-up f
+            best = min(memory.values())
+            regenerate = [(m, value) for m, value in memory.items() if value == best]
+            for m, _ in regenerate:
+                del memory[m]
+            if not memory:
+                forgotten[slot] = None
+
+        for m, bound in regenerate:
+            child = apply[m](key)
+            generated += 1
+            child_ctx = next_ctx[ctx][m]
+            old = resident.get(child)
+            if old is not None and (g_of[old] < g or g_of[old] == g and ctx_of[old] == child_ctx):
+                continue  # Dominated by a resident copy
+            if child != goal_key and g + 1 + n_moves > max_nodes:
+                child_f = INF  # The cap cannot hold the expansion of the child
+            else:
+                child_f = max(bound, g + heuristic(child, g))
+            child_slot = nodes.add(child, slot, m, g, child_ctx, child_f)
+            resident[child] = child_slot
+            children[slot].append(child_slot)
+            enqueue(child_slot)
+
+        if nodes.resident > max_resident:
+            max_resident = nodes.resident
+        if children[slot] or forgotten[slot]:
+            enqueue(slot)
+            backup(slot)
+        elif slot != root:
+            # Every child is dominated by a resident copy: dead end
+            p = parent[slot]
+            f_of[slot] = INF
+            drop(slot)
+            pruned += 1
+            backup(p)
+        else:
+            break
+
+        if len(worst) > 4 * max_nodes:
+            rebuild_queues()
+
+        if generated >= next_check:
+            if time.time() >= deadline:
+                break
+            next_check += TIME_CHECK_INTERVAL
+
+    return None, generated, {
+        "max_resident_nodes": max_resident, "pruned_nodes": pruned, "expanded_nodes": expanded
+    }
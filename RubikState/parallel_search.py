@@ -0,0 +1,153 @@
+"""
+Parallel IDA* by splitting each iteration at the root
+
+For every threshold the canonical paths of the first split_depth moves that
+pass the f <= threshold test are enumerated in the main process, and the
+subtree below each prefix is searched by bounded_dfs in a worker of a
+ProcessPoolExecutor. The workers compile the move tables once, in the pool
+initializer (with the fork start method they inherit the parent's read-only
+tables). All subtrees of an iteration use the same threshold, so the first
+solution returned by any worker is optimal; a shared event then stops the
+other workers at their next time check and queued prefixes are cancelled.
+"""
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from RubikState.compiled_moves import get_compiled_moves, make_heuristic
+from RubikState.depth_first import bounded_dfs
+
+# Worker state, set by _init_worker
+_compiled = None
+_heuristic = None
+_goal_key = None
+_stop = None
+
+def _init_worker(moves_dict, start_key, goal_key, stop):
+    """Pool initializer: compile the moves and build the heuristic once per worker"""
+    global _compiled, _heuristic, _goal_key, _stop
+    _compiled = get_compiled_moves(moves_dict)
+    _heuristic = make_heuristic(_compiled, start_key)
+    _goal_key = goal_key
+    _stop = stop
+
+def _search_prefix(prefix, key, ctx, threshold, deadline):
+    """
+    Search the subtree below one path prefix (runs in a worker)
+
+    Returns:
+        tuple: (move indices from the start or None, next_threshold, nodes, timed_out)
+    """
+    moves, next_threshold, nodes, timed_out = bounded_dfs(
+        key, _goal_key, _compiled, _heuristic, threshold, deadline,
+        root_g=len(prefix), root_ctx=ctx, stop=_stop
+    )
+    if moves is not None:
+        moves = list(prefix) + moves
+    return moves, next_threshold, nodes, timed_out
+
+def split_prefixes(start_key, goal_key, compiled, heuristic, threshold, split_depth):
+    """
+    Enumerate the canonical path prefixes of an iteration
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes
+        heuristic: Function h(key, g)
+        threshold: Inclusive bound on f = g + h
+        split_depth: Length of the prefixes
+
+    Returns:
+        tuple: (prefixes, solution, next_threshold, nodes)
+               prefixes is a list of (move indices, key, ctx) at split_depth,
+               solution the move indices of a goal met above split_depth (or None)
+    """
+    apply = compiled.apply
+    allowed = compiled.allowed
+    next_ctx = compiled.next_ctx
+    layer = [((), start_key, compiled.root_ctx)]
+    next_threshold = float('inf')
+    nodes = 1
+
+    for g in range(1, split_depth + 1):
+        next_layer = []
+        for prefix, key, ctx in layer:
+            for m in allowed[ctx]:
+                child = apply[m](key)
+                nodes += 1
+                f = g + heuristic(child, g)
+                if f > threshold:
+                    if f < next_threshold:
+                        next_threshold = f
+                    continue
+                if child == goal_key:
+                    return [], list(prefix) + [m], threshold, nodes
+                next_layer.append((prefix + (m,), child, next_ctx[ctx][m]))
+        layer = next_layer
+    return layer, None, next_threshold, nodes
+
+def parallel_ida_star(start_key, goal_key, moves_dict, start_time, time_limit,
+                      workers=None, split_depth=3):
+    """
+    IDA* with the subtrees of each iteration searched in parallel
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        moves_dict: Dictionary of moves (compiled again in every worker)
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+        workers: Number of worker processes (default os.cpu_count())
+        split_depth: Length of the path prefixes handed to the workers
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated)
+    """
+    compiled = get_compiled_moves(moves_dict)
+    heuristic = make_heuristic(compiled, start_key)
+    if start_key == goal_key:
+        return [], 1
+
+    deadline = start_time + time_limit
+    threshold = heuristic(start_key, 0)
+    total_nodes = 0
+    context = multiprocessing.get_context()
+    stop = context.Event()
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(moves_dict, start_key, goal_key, stop)) as pool:
+        while time.time() < deadline:
+            prefixes, solution, next_threshold, nodes = split_prefixes(
+                start_key, goal_key, compiled, heuristic, threshold, split_depth
+            )
+            total_nodes += nodes
+            if solution is not None:
+                return [compiled.names[m] for m in solution], total_nodes
+
+            pending = {pool.submit(_search_prefix, prefix, key, ctx, threshold, deadline)
+                       for prefix, key, ctx in prefixes}
+            timed_out = False
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    moves, sub_threshold, nodes, sub_timed_out = future.result()
+                    total_nodes += nodes
+                    if moves is not None:
+                        # Stop the running subtrees and drop the queued ones
+                        stop.set()
+                        for other in pending:
+                            other.cancel()
+                        return [compiled.names[m] for m in moves], total_nodes
+                    timed_out = timed_out or sub_timed_out
+                    if sub_threshold < next_threshold:
+                        next_threshold = sub_threshold
+
+            if timed_out or next_threshold == float('inf'):
+                break
+            threshold = next_threshold
+
+    return None, total_nodes
@@ -0,0 +1,183 @@
+"""
+Enhanced partial-expansion A* (EPEA*) shared by the 2x2 and 3x3 solvers
+
+States are the encoded keys of RubikState.compiled_moves and the heuristic is
+the one of make_heuristic (Felner et al. 2012, Goldenberg et al. 2014).
+Plain A* generates, hashes and queues every child of an expanded node,
+although most of them have f above the current f and are never expanded.
+EPEA* stores a value F with each queued node and only generates the children
+whose f lies in (previous F, F]; the node goes back into the queue with the
+smallest f among its other children, or leaves it for good.
+
+The f of a child is known without generating it from operator tables built
+once per move set: a move only changes the slots it turns, and the misplaced
+and misoriented count of each turned slot after the move only depends on the
+cubie value it reads before the move. Each node keeps its count total, so a
+child's total is the parent's plus a handful of lookups, and its h follows
+from the same formula as make_heuristic. The parity and orientation term
+only depends on the parity of g.
+
+The interval (previous F, F] generates every child once, even where the
+heuristic is not consistent, so EPEA* returns solutions of the same length
+as A* with the same heuristic. They are optimal only when the heuristic is
+admissible. make_heuristic is not: a state one quarter turn from solved has
+h = 2, so the solutions can be longer than optimal.
+"""
+
+import time
+from operator import getitem, itemgetter
+
+from RubikState.compiled_moves import heuristic_terms
+from RubikState.search_structures import NodeArena, BucketQueue
+
+# How many generated nodes between two time-limit checks
+TIME_CHECK_INTERVAL = 4096
+
+def operator_tables(compiled, contrib):
+    """
+    Change of the heuristic count total made by each move
+
+    Args:
+        compiled: CompiledMoves of the search
+        contrib: Per-slot count tables of heuristic_terms
+
+    Returns:
+        list: Per move (read, deltas): read(key) returns the cubie values of the
+              slots the move reads, deltas the matching tables value -> change of
+              the total, so the total after move m is
+              total + sum(map(getitem, deltas, read(key)))
+    """
+    # Slot and sticker number k of every sticker index
+    sticker = {}
+    for i, stickers in enumerate(compiled.corner_index):
+        for k, index in enumerate(stickers):
+            sticker[index] = (i, k, 3)
+    for j, stickers in enumerate(compiled.edge_index):
+        for k, index in enumerate(stickers):
+            sticker[index] = (8 + j, k, 2)
+
+    tables = []
+    for sources in compiled.sources:
+        read = []
+        deltas = []
+        for slot in range(compiled.slots):
+            source, k, orientations = sticker[sources[slot]]
+            if source == slot and k == 0:
+                continue  # Slot not turned by the move
+            # Slot receives sticker k of source: same cubie, orientation shifted by k
+            deltas.append(tuple(
+                contrib[slot][v - v % orientations + (v % orientations + k) % orientations] - contrib[source][v]
+                for v in range(24)
+            ))
+            read.append(source)
+        tables.append((itemgetter(*read), tuple(deltas)))
+    return tables
+
+def epea_star(start_key, goal_key, compiled, start_time, time_limit):
+    """
+    Enhanced partial-expansion A* with the heuristic of make_heuristic
+
+    Args:
+        start_key: Encoded start state
+        goal_key: Encoded goal state
+        compiled: CompiledMoves used to expand nodes (compiled.uniform must be true)
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+
+    Returns:
+        tuple: (list of move names or None, nodes_generated, stats)
+               stats is a dict with expanded_nodes, reinserted_nodes and
+               surplus_nodes (children whose f was computed but that were never
+               generated)
+    """
+    if not compiled.uniform:
+        raise ValueError("EPEA* needs a move set whose moves all change parities the same way")
+    deadline = start_time + time_limit
+    apply = compiled.apply
+    inverse = compiled.inverse
+    n = len(apply)
+    contrib, extra = heuristic_terms(compiled, start_key)
+    tables = operator_tables(compiled, contrib)
+
+    def h_of(total, g):
+        hc = (total & 31) >> 2
+        he = total >> 7
+        if he > hc:
+            hc = he
+        x = extra[g & 1]
+        return hc if hc > x else x
+
+    arena = NodeArena()
+    totals = [sum(map(getitem, contrib, start_key))]
+    best = {start_key: 0}  # State -> best g found
+    queue = BucketQueue(order="high_g")
+    queue.push(h_of(totals[0], 0), (arena.add(start_key), -1))
+
+    generated = 1
+    expanded = 0
+    reinserted = 0
+    computed = 0
+    next_check = TIME_CHECK_INTERVAL
+    found = None
+
+    while queue:
+        F, (node, lower) = queue.pop()
+        key = arena.states[node]
+        g = arena.g[node]
+        if best[key] < g:
+            continue  # A shorter path to the state was found since
+        if key == goal_key:
+            found = node
+            break
+
+        expanded += 1
+        total = totals[node]
+        back = inverse[arena.move[node]] if node else -1
+        child_g = g + 1
+        x = extra[child_g & 1]
+        next_f = None
+        for m in range(n):
+            if m == back:
+                continue  # Leads back to the parent
+            read, deltas = tables[m]
+            child_total = total + sum(map(getitem, deltas, read(key)))
+            hc = (child_total & 31) >> 2
+            he = child_total >> 7
+            if he > hc:
+                hc = he
+            f = child_g + (hc if hc > x else x)
+            if f > F:
+                if next_f is None or f < next_f:
+                    next_f = f
+                continue
+            if f <= lower:
+                continue  # Generated at an earlier expansion of this node
+
+            child = apply[m](key)
+            generated += 1
+            old = best.get(child)
+            if old is not None and old <= child_g:
+                continue
+            best[child] = child_g
+            totals.append(child_total)
+            queue.push(f, (arena.add(child, node, m, child_g), -1), child_g)
+
+        if lower == -1:
+            computed += n - (back >= 0)
+        if next_f is not None:
+            reinserted += 1
+            queue.push(next_f, (node, F), g)
+
+        if generated >= next_check:
+            if time.time() >= deadline:
+                break
+            next_check += TIME_CHECK_INTERVAL
+
+    stats = {
+        "expanded_nodes": expanded,
+        "reinserted_nodes": reinserted,
+        "surplus_nodes": computed - generated + 1,
+    }
+    if found is not None:
+        return arena.path(found, compiled.names), generated, stats
+    return None, generated, stats
@@ -1,3 +1,7 @@
+import numpy as np
+
+from RubikState.coordinates import calculate_parity_batch
+
 # Thứ tự góc trong Rubik 2x2 (tương tự Rubik 3x3):
 # 0=URF: Góc Trên-Phải-Trước (Up-Right-Front)
 # 1=ULF: Góc Trên-Trái-Trước (Up-Left-Front)
@@ -180,4 +184,35 @@ def heuristic_2x2(state):
     h_orient = 1 if corner_orient_sum != 0 else 0
     
     # Lấy giá trị lớn nhất
-    return max(h_corner, corner_parity, h_orient)
\ No newline at end of file
+    return max(h_corner, corner_parity, h_orient)
+
+def states_to_array_2x2(states):
+    """
+    Chuyển danh sách trạng thái thành mảng (N, 16): 8 cột cp rồi 8 cột co.
+    Nếu đầu vào đã là mảng NumPy thì trả về nguyên dạng.
+    """
+    if isinstance(states, np.ndarray):
+        return states
+    return np.array([state.cp + state.co for state in states], dtype=np.int8).reshape(-1, 16)
+
+def heuristic_2x2_batch(states):
+    """
+    Phiên bản vector hóa của heuristic_2x2.
+
+    Args:
+        states: Danh sách Rubik2x2State hoặc mảng (N, 16) theo states_to_array_2x2
+
+    Returns:
+        np.ndarray: Mảng int8 (N,) chứa giá trị heuristic của từng trạng thái
+    """
+    arr = states_to_array_2x2(states)
+    cp = arr[:, :8]
+    co = arr[:, 8:16]
+    
+    corner_total = (cp != np.arange(8)).sum(axis=1) + (co != 0).sum(axis=1)
+    h_corner = corner_total // 4
+    
+    corner_parity = calculate_parity_batch(cp)
+    h_orient = (co.sum(axis=1, dtype=np.int32) % 3 != 0)
+    
+    return np.maximum(np.maximum(h_corner, corner_parity), h_orient).astype(np.int8)
@@ -18,6 +18,10 @@ Cạnh (Edges):
 - Cạnh: 0 = đúng hướng, 1 = bị lật
 """
 
+import numpy as np
+
+from RubikState.coordinates import calculate_parity_batch
+
 # Thứ tự góc: 0=URF, 1=ULF, 2=ULB, 3=URB, 4=DRF, 5=DLF, 6=DLB, 7=DRB
 # Định hướng góc: 0=đúng hướng, 1=xoay 1 lần theo chiều kim đồng hồ, 2=xoay 2 lần
 # Thứ tự cạnh: 0=UR, 1=UF, 2=UL, 3=UB, 4=DR, 5=DF, 6=DL, 7=DB, 8=FR, 9=FL, 10=BL, 11=BR
@@ -247,6 +251,44 @@ def heuristic_3x3(state):
     # Lấy giá trị lớn nhất
     return max(h_corner, h_edge, h_parity, h_orient)
 
+def states_to_array_3x3(states):
+    """
+    Chuyển danh sách trạng thái thành mảng (N, 40): cp (8), co (8), ep (12), eo (12).
+    Nếu đầu vào đã là mảng NumPy thì trả về nguyên dạng.
+    """
+    if isinstance(states, np.ndarray):
+        return states
+    return np.array([state.cp + state.co + state.ep + state.eo for state in states],
+                    dtype=np.int8).reshape(-1, 40)
+
+def heuristic_3x3_batch(states):
+    """
+    Phiên bản vector hóa của heuristic_3x3.
+
+    Args:
+        states: Danh sách RubikState hoặc mảng (N, 40) theo states_to_array_3x3
+
+    Returns:
+        np.ndarray: Mảng int8 (N,) chứa giá trị heuristic của từng trạng thái
+    """
+    arr = states_to_array_3x3(states)
+    cp = arr[:, :8]
+    co = arr[:, 8:16]
+    ep = arr[:, 16:28]
+    eo = arr[:, 28:40]
+    
+    h_corner = ((cp != np.arange(8)).sum(axis=1) + (co != 0).sum(axis=1)) // 4
+    h_edge = ((ep != np.arange(12)).sum(axis=1) + (eo != 0).sum(axis=1)) // 4
+    
+    # Dấu hoán vị bằng cách đếm nghịch thế trên toàn bộ mảng
+    h_parity = calculate_parity_batch(cp) != calculate_parity_batch(ep)
+    
+    h_orient = ((co.sum(axis=1, dtype=np.int32) % 3 != 0) |
+                (eo.sum(axis=1, dtype=np.int32) % 2 != 0))
+    
+    return np.maximum(np.maximum(h_corner, h_edge),
+                      np.maximum(h_parity, h_orient)).astype(np.int8)
+
 def calculate_prime_moves():
     """
     Tính toán định nghĩa cho các phép xoay ngược (prime moves) bằng cách áp dụng phép xoay thuận 3 lần.
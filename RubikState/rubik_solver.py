@@ -14,26 +14,51 @@ from RubikState.rubik_solver_3x3 import solve_3x3, test_scramble_3x3
 from RubikState.rubik_solver_2x2 import (
     a_star_search_2x2,
     bfs_search_2x2,
+    bidirectional_bfs_search_2x2,
+    mm_search_2x2,
     dfs_search_2x2,
     ucs_search_2x2,
     greedy_best_first_search_2x2,
+    weighted_a_star_search_2x2,
+    ara_star_search_2x2,
+    sma_star_search_2x2,
     ids_search_2x2,
     ida_star_search_2x2,
+    fringe_search_2x2,
+    batched_ida_star_search_2x2,
+    parallel_ida_star_search_2x2,
     hill_climbing_max_search_2x2,
-    hill_climbing_random_search_2x2
+    hill_climbing_random_search_2x2,
+    local_search_2x2,
+    genetic_search_2x2
 )
 
 # Import individual algorithm functions from 3x3 solver
 from RubikState.rubik_solver_3x3 import (
     a_star_search_3x3,
     bfs_search_3x3,
+    bidirectional_bfs_search_3x3,
+    mm_search_3x3,
     dfs_search_3x3,
     ucs_search_3x3,
     greedy_best_first_search_3x3,
+    weighted_a_star_search_3x3,
+    ara_star_search_3x3,
+    sma_star_search_3x3,
+    beam_search_3x3,
     ids_search_3x3,
     ida_star_search_3x3,
+    fringe_search_3x3,
+    batched_ida_star_search_3x3,
+    parallel_ida_star_search_3x3,
+    distributed_ida_star_search_3x3,
+    kociemba_search_3x3,
+    thistlethwaite_search_3x3,
+    optimal_search_3x3,
     hill_climbing_max_search_3x3,
-    hill_climbing_random_search_3x3
+    hill_climbing_random_search_3x3,
+    local_search_3x3,
+    genetic_search_3x3
 )
 
 # Load the pattern database for 2x2 cube
@@ -67,6 +92,18 @@ def bfs(state, time_limit=30):
         return bfs_search_2x2(state, time_limit=time_limit)
     return bfs_search_3x3(state, time_limit=time_limit)
 
+def bidirectional_bfs(state, time_limit=30):
+    """Bidirectional BFS algorithm for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return bidirectional_bfs_search_2x2(state, time_limit=time_limit)
+    return bidirectional_bfs_search_3x3(state, time_limit=time_limit)
+
+def mm(state, time_limit=30):
+    """Bidirectional heuristic search (MM) for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return mm_search_2x2(state, time_limit=time_limit)
+    return mm_search_3x3(state, time_limit=time_limit)
+
 def dfs(state, time_limit=30):
     """DFS algorithm for any Rubik's cube (auto detects type)"""
     if isinstance(state, Rubik2x2State):
@@ -91,12 +128,96 @@ def ida_star(state, time_limit=30):
         return ida_star_search_2x2(state, time_limit=time_limit)
     return ida_star_search_3x3(state, time_limit=time_limit)
 
+def fringe_search(state, time_limit=30):
+    """Fringe Search algorithm for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return fringe_search_2x2(state, time_limit=time_limit)
+    return fringe_search_3x3(state, time_limit=time_limit)
+
+def batched_ida_star(state, time_limit=30):
+    """Batched IDA* algorithm for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return batched_ida_star_search_2x2(state, time_limit=time_limit)
+    return batched_ida_star_search_3x3(state, time_limit=time_limit)
+
+def parallel_ida_star(state, time_limit=30):
+    """Parallel IDA* algorithm for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return parallel_ida_star_search_2x2(state, time_limit=time_limit)
+    return parallel_ida_star_search_3x3(state, time_limit=time_limit)
+
+def distributed_ida_star(state, time_limit=30):
+    """Distributed IDA* algorithm over local TCP workers for 3x3 Rubik's cube"""
+    if isinstance(state, Rubik2x2State):
+        # For 2x2 cube, the process pool version is enough
+        return parallel_ida_star_search_2x2(state, time_limit=time_limit)
+    return distributed_ida_star_search_3x3(state, time_limit=time_limit)
+
+def kociemba(state, time_limit=30):
+    """Kociemba two-phase algorithm for 3x3 Rubik's cube"""
+    if isinstance(state, Rubik2x2State):
+        # For 2x2 cube, fall back to IDA*
+        return ida_star_search_2x2(state, time_limit=time_limit)
+    return kociemba_search_3x3(state, time_limit=time_limit)
+
+def thistlethwaite(state, time_limit=30):
+    """Thistlethwaite four-phase algorithm for 3x3 Rubik's cube"""
+    if isinstance(state, Rubik2x2State):
+        # For 2x2 cube, fall back to IDA*
+        return ida_star_search_2x2(state, time_limit=time_limit)
+    return thistlethwaite_search_3x3(state, time_limit=time_limit)
+
+def optimal(state, time_limit=30):
+    """Korf's optimal solver (pattern database IDA*) for 3x3 Rubik's cube"""
+    if isinstance(state, Rubik2x2State):
+        # For 2x2 cube, IDA* is already optimal
+        return ida_star_search_2x2(state, time_limit=time_limit)
+    return optimal_search_3x3(state, time_limit=time_limit)
+
 def greedy_best_first(state, time_limit=30):
     """Greedy Best-First algorithm for any Rubik's cube (auto detects type)"""
     if isinstance(state, Rubik2x2State):
         return greedy_best_first_search_2x2(state, time_limit=time_limit)
     return greedy_best_first_search_3x3(state, time_limit=time_limit)
 
+def weighted_a_star(state, time_limit=30):
+    """Weighted A* algorithm for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return weighted_a_star_search_2x2(state, time_limit=time_limit)
+    return weighted_a_star_search_3x3(state, time_limit=time_limit)
+
+def ara_star(state, time_limit=30):
+    """Anytime Repairing A* algorithm for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return ara_star_search_2x2(state, time_limit=time_limit)
+    return ara_star_search_3x3(state, time_limit=time_limit)
+
+def epea_star(state, time_limit=30):
+    """Enhanced partial-expansion A* (EPEA*) for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return a_star_search_2x2(state, time_limit=time_limit, partial_expansion=True)
+    return a_star_search_3x3(state, time_limit=time_limit, partial_expansion=True)
+
+def sma_star(state, time_limit=30):
+    """Memory-bounded A* (SMA*) algorithm for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return sma_star_search_2x2(state, time_limit=time_limit)
+    return sma_star_search_3x3(state, time_limit=time_limit)
+
+def external_bfs(state, time_limit=30):
+    """Disk-backed BFS (delayed duplicate detection) for 3x3 Rubik's cube"""
+    if isinstance(state, Rubik2x2State):
+        # For 2x2 cube, the in-memory BFS is enough
+        return bfs_search_2x2(state, time_limit=time_limit)
+    return solve_3x3(state, "external_bfs", time_limit)
+
+def beam_search(state, time_limit=30):
+    """Vectorized beam search for 3x3 Rubik's cube"""
+    if isinstance(state, Rubik2x2State):
+        # For 2x2 cube, fall back to IDA*
+        return ida_star_search_2x2(state, time_limit=time_limit)
+    return beam_search_3x3(state, time_limit=time_limit)
+
 def hill_climbing_max(state, time_limit=30):
     """Hill Climbing Max algorithm for any Rubik's cube (auto detects type)"""
     if isinstance(state, Rubik2x2State):
@@ -109,6 +230,18 @@ def hill_climbing_random(state, time_limit=30):
         return hill_climbing_random_search_2x2(state, time_limit=time_limit)
     return hill_climbing_random_search_3x3(state, time_limit=time_limit)
 
+def local_search(state, method="annealing", time_limit=30):
+    """Local search (random restarts, simulated annealing or tabu) for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return local_search_2x2(state, time_limit=time_limit, method=method)
+    return local_search_3x3(state, time_limit=time_limit, method=method)
+
+def genetic(state, time_limit=30):
+    """Genetic algorithm for any Rubik's cube (auto detects type)"""
+    if isinstance(state, Rubik2x2State):
+        return genetic_search_2x2(state, time_limit=time_limit)
+    return genetic_search_3x3(state, time_limit=time_limit)
+
 def solve_rubik(start_state, algorithm="a_star", time_limit=30):
     """
     Unified solver for any type of Rubik's cube
@@ -131,6 +264,41 @@ def solve_rubik(start_state, algorithm="a_star", time_limit=30):
     else:
         raise ValueError("Unsupported Rubik's cube state type")
         
+def compare_move_ordering(state, algorithm="ida_star", time_limit=30):
+    """
+    Run a depth-first solver without and with heuristic move ordering and report the node counts
+    
+    Args:
+        state: RubikState or Rubik2x2State
+        algorithm: "ida_star", "ids" or "dfs"
+        time_limit: Time limit in seconds for each run
+        
+    Returns:
+        dict: {False: (path, nodes, last_iteration_nodes, time_taken), True: ...}
+              last_iteration_nodes is None for dfs
+    """
+    is_2x2 = isinstance(state, Rubik2x2State)
+    solvers = {
+        "ida_star": ida_star_search_2x2 if is_2x2 else ida_star_search_3x3,
+        "ids": ids_search_2x2 if is_2x2 else ids_search_3x3,
+        "dfs": dfs_search_2x2 if is_2x2 else dfs_search_3x3,
+    }
+    if algorithm not in solvers:
+        raise ValueError(f"Move ordering is not available for {algorithm}")
+    
+    results = {}
+    for ordered in (False, True):
+        stats = {} if algorithm != "dfs" else None
+        options = {"stats": stats} if stats is not None else {}
+        path, nodes, time_taken = solvers[algorithm](state, time_limit=time_limit, move_ordering=ordered,
+                                                     **options)
+        last = stats.get("last_iteration_nodes") if stats is not None else None
+        results[ordered] = (path, nodes, last, time_taken)
+        length = len(path) if path is not None else "-"
+        print(f"{algorithm} {'ordered' if ordered else 'fixed order'}: {length} moves, {nodes} nodes"
+              + (f" ({last} in the last iteration)" if last is not None else "") + f", {time_taken:.2f}s")
+    return results
+
 def test_scramble(scramble_moves, cube_size=3, algorithm="a_star", time_limit=30):
     """
     Test solver with a specific scramble sequence
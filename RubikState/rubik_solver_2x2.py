@@ -7,15 +7,29 @@ specifically optimized for solving the 2x2 Rubik's cube.
 
 import time
 import random
-import heapq
 import os
 import pickle
 from collections import deque
 
+from RubikState.search_structures import NodeArena, BucketQueue, TranspositionTable
+from RubikState.compiled_moves import get_compiled_moves, make_heuristic
+from RubikState.depth_first import ida_star, iterative_deepening, depth_limited_dfs, goal_predecessors, MoveOrdering
+from RubikState.parallel_search import parallel_ida_star
+from RubikState.bidirectional import bidirectional_bfs, mm_search, mm_heuristics
+from RubikState.anytime_search import ara_star
+from RubikState.memory_bounded import sma_star
+from RubikState.partial_expansion import epea_star
+from RubikState.fringe_search import fringe_search
+from RubikState.batched_ida import BATCH_NODES, batched_ida_star
+from RubikState.checkpoint import Checkpoint, CHECKPOINT_INTERVAL
+from RubikState.local_search import random_restart_hill_climbing, simulated_annealing, tabu_search
+from RubikState.genetic import genetic_search
+
 # Import 2x2 specific classes and constants
 from RubikState.rubik_2x2 import Rubik2x2State, SOLVED_STATE_2x2, MOVES_2x2, heuristic_2x2
 
-def a_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30):
+def a_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, partial_expansion=False,
+                      stats=None):
     """
     A* search algorithm for 2x2 Rubik's cube
     
@@ -24,6 +38,12 @@ def a_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=
         goal_state: Goal state (default is SOLVED_STATE_2x2)
         moves_dict: Dictionary of moves (default is MOVES_2x2)
         time_limit: Time limit in seconds (default is 30)
+        partial_expansion: Run enhanced partial-expansion A* (see RubikState.partial_expansion),
+                           which only generates the children whose f equals the f of the
+                           expanded node; solutions of the same length as A*, several
+                           times fewer generated nodes (default is False)
+        stats: Optional dict, filled with expanded_nodes, reinserted_nodes and surplus_nodes
+               in partial_expansion mode (default prints them in one line)
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -32,34 +52,50 @@ def a_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=
     goal_state = goal_state or SOLVED_STATE_2x2
     moves_dict = moves_dict or MOVES_2x2
     
+    if partial_expansion:
+        start_time = time.time()
+        compiled = get_compiled_moves(moves_dict)
+        path, visited_nodes, search_stats = epea_star(
+            compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit
+        )
+        if stats is None:
+            print(f"EPEA*: {search_stats['expanded_nodes']} expansions, "
+                  f"{search_stats['surplus_nodes']} surplus children not generated")
+        else:
+            stats.update(search_stats)
+        return path, visited_nodes, time.time() - start_time
+    
     # Get list of move names
     move_names = list(moves_dict.keys())
     
     # Count visited nodes
     nodes_visited = 0
     
-    # Priority queue for A*: (f_value, state_hash, state, path)
-    # Using state hash to avoid direct comparison of state objects
+    # Nodes live in the arena; the bucket queue holds node indices keyed by f_value
+    # and pops the deepest node first among equal f_values
+    arena = NodeArena()
     h_value = heuristic_2x2(start_state)
-    queue = [(h_value, hash(start_state), start_state, [])]
+    queue = BucketQueue(order="high_g")
+    queue.push(h_value, arena.add(start_state))
     
     # Dictionary to track visited states and their g_values
     visited = {start_state: 0}  # state -> g_value
 
     start_time = time.time()
     while queue and time.time() - start_time < time_limit:
-        f_value, _, state, path = heapq.heappop(queue)
-        g_value = len(path)
+        f_value, node = queue.pop()
+        state = arena.states[node]
+        g_value = arena.g[node]
         
         if state == goal_state:
             end_time = time.time()
-            return path, nodes_visited, end_time - start_time
+            return arena.path(node, move_names), nodes_visited, end_time - start_time
         
         # If we already found a better path to this state, skip it
         if g_value > visited.get(state, float('inf')):
             continue
 
-        for move in move_names:
+        for move_index, move in enumerate(move_names):
             nodes_visited += 1
             new_state = state.apply_move(move, moves_dict)
             new_g_value = g_value + 1
@@ -72,7 +108,7 @@ def a_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=
             visited[new_state] = new_g_value
             h_score = heuristic_2x2(new_state)
             f_score = new_g_value + h_score
-            heapq.heappush(queue, (f_score, hash(new_state), new_state, path + [move]))
+            queue.push(f_score, arena.add(new_state, node, move_index, new_g_value), new_g_value)
 
     return None, nodes_visited, time.time() - start_time
 
@@ -99,38 +135,45 @@ def bfs_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30)
     # Count visited nodes
     nodes_visited = 0
     
-    queue = deque([(start_state, [])])  # (state, path)
+    arena = NodeArena()
+    queue = deque([arena.add(start_state)])  # node indices
     visited = {start_state}
     
     start_time = time.time()
     while queue and time.time() - start_time < time_limit:
-        state, path = queue.popleft()
+        node = queue.popleft()
+        state = arena.states[node]
         nodes_visited += 1
         
         if state == goal_state:
             end_time = time.time()
-            return path, nodes_visited, end_time - start_time
+            return arena.path(node, move_names), nodes_visited, end_time - start_time
         
-        for move in move_names:
+        g_value = arena.g[node] + 1
+        for move_index, move in enumerate(move_names):
             new_state = state.apply_move(move, moves_dict)
             
             if new_state not in visited:
                 visited.add(new_state)
-                queue.append((new_state, path + [move]))
+                queue.append(arena.add(new_state, node, move_index, g_value))
     
     end_time = time.time()
     return None, nodes_visited, end_time - start_time
 
-def dfs_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, max_depth=20):
+def bidirectional_bfs_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30):
     """
-    DFS algorithm for 2x2 Rubik's cube
+    Bidirectional BFS algorithm for 2x2 Rubik's cube
+    
+    Alternately expands the smaller of a forward frontier from the start state
+    and a backward frontier from the goal (using inverse moves) until they
+    meet, then joins the two half-paths. Each side only goes half as deep as
+    plain BFS, so much longer optimal solutions fit in memory.
     
     Args:
         start_state: Starting state (Rubik2x2State)
         goal_state: Goal state (default is SOLVED_STATE_2x2)
         moves_dict: Dictionary of moves (default is MOVES_2x2)
         time_limit: Time limit in seconds (default is 30)
-        max_depth: Maximum search depth (default is 20)
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -140,38 +183,102 @@ def dfs_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30,
     moves_dict = moves_dict or MOVES_2x2
     
     start_time = time.time()
-    visited = set()
-    node_count = 0
+    compiled = get_compiled_moves(moves_dict)
     
-    def dfs_recursive(state, path, depth):
-        nonlocal node_count
-        
-        if time.time() - start_time > time_limit:
-            return None
-        
-        node_count += 1
-        
-        if state == goal_state:
-            return path
-        
-        if depth >= max_depth:
-            return None
-        
-        for move in moves_dict:
-            new_state = state.apply_move(move, moves_dict)
-            if new_state not in visited:
-                visited.add(new_state)
-                result = dfs_recursive(new_state, path + [move], depth + 1)
-                if result:
-                    return result
-                visited.remove(new_state)  # Backtrack
-        
-        return None
+    path, visited_nodes = bidirectional_bfs(
+        compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def mm_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, stats=None, pdb=None):
+    """
+    Bidirectional heuristic search (MM) for 2x2 Rubik's cube
+    
+    A* from the start state and from the goal at the same time, each side
+    ordered by max(f, 2g) so that both stop at the middle of the solution
+    (see RubikState.bidirectional.mm_search). Both sides use the corner
+    pattern database, the backward side on the state seen relative to the
+    start state; it is admissible, so the solution is optimal. Without a
+    database (moves other than MOVES_2x2) both sides fall back to
+    heuristic_2x2, which is not admissible: the solution is then not
+    guaranteed optimal. The database is generated on first use, which is not
+    counted against time_limit.
+    
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        stats: Optional dict, filled with forward_expanded and backward_expanded
+               (default prints them in one line)
+        pdb: Pattern database (default is get_corner_pattern_database() for MOVES_2x2)
     
-    visited.add(start_state)
-    result = dfs_recursive(start_state, [], 0)
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
     
-    return result, node_count, time.time() - start_time
+    if pdb is None and moves_dict is MOVES_2x2:
+        pdb = get_corner_pattern_database()
+    heuristic = pdb.key_heuristic() if pdb is not None else None
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    goal_key = compiled.encode(goal_state)
+    heuristic_forward, heuristic_backward = mm_heuristics(compiled, start_key, goal_key, heuristic)
+    
+    path, visited_nodes, search_stats = mm_search(
+        start_key, goal_key, compiled, heuristic_forward, heuristic_backward, start_time, time_limit
+    )
+    if stats is None:
+        print(f"MM: expanded {search_stats['forward_expanded']} forward, "
+              f"{search_stats['backward_expanded']} backward")
+    else:
+        stats.update(search_stats)
+    return path, visited_nodes, time.time() - start_time
+
+def dfs_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, max_depth=20,
+                   move_ordering=False):
+    """
+    DFS algorithm for 2x2 Rubik's cube
+    
+    Iterative depth-first search limited to max_depth moves, on compiled move
+    tables with canonical move pruning. Cycles are only checked against the
+    current path, so the search is complete within max_depth (see
+    RubikState.depth_first.depth_limited_dfs). The solution is not optimal.
+    
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        max_depth: Maximum search depth (default is 20)
+        move_ordering: Try the children with the smallest heuristic first, ties broken by
+                       history and killer moves (see RubikState.depth_first.MoveOrdering)
+                       (default is False)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    goal_key = compiled.encode(goal_state)
+    start_key = compiled.encode(start_state)
+    ordering = MoveOrdering(compiled, make_heuristic(compiled, start_key)) if move_ordering else None
+    
+    moves, node_count, _ = depth_limited_dfs(
+        start_key, goal_key, compiled, max_depth, start_time + time_limit,
+        goal_predecessors(compiled, goal_key), ordering=ordering
+    )
+    path = [compiled.names[m] for m in moves] if moves is not None else None
+    return path, node_count, time.time() - start_time
 
 def ucs_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30):
     """
@@ -194,14 +301,19 @@ def ucs_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30)
     start_time = time.time()
     nodes_visited = 0
     
-    # Create priority queue with (cost, hash of state, state, path)
-    queue = [(0, hash(start_state), start_state, [])]
+    move_names = list(moves_dict.keys())
+    
+    # Bucket queue of node indices keyed by cost, first-in first-out on ties
+    arena = NodeArena()
+    queue = BucketQueue(order="fifo")
+    queue.push(0, arena.add(start_state))
     
     # Dictionary to track visited states and their lowest costs
     visited = {start_state: 0}  # state -> cost
     
     while queue and time.time() - start_time < time_limit:
-        cost, _, state, path = heapq.heappop(queue)
+        cost, node = queue.pop()
+        state = arena.states[node]
         nodes_visited += 1
         
         # If current state has higher cost than the best known state, skip
@@ -209,16 +321,16 @@ def ucs_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30)
             continue
             
         if state == goal_state:
-            return path, nodes_visited, time.time() - start_time
+            return arena.path(node, move_names), nodes_visited, time.time() - start_time
             
-        for move in moves_dict:
+        for move_index, move in enumerate(move_names):
             new_state = state.apply_move(move, moves_dict)
             new_cost = cost + 1
             
             # Only update if not visited or found a shorter path
             if new_state not in visited or new_cost < visited[new_state]:
                 visited[new_state] = new_cost
-                heapq.heappush(queue, (new_cost, hash(new_state), new_state, path + [move]))
+                queue.push(new_cost, arena.add(new_state, node, move_index, new_cost))
     
     return None, nodes_visited, time.time() - start_time
 
@@ -241,39 +353,80 @@ def greedy_best_first_search_2x2(start_state, goal_state=None, moves_dict=None,
     
     start_time = time.time()
     
-    # Create priority queue with (heuristic, hash of state, state, path)
+    move_names = list(moves_dict.keys())
+    
+    # Bucket queue of node indices keyed by heuristic value, ties broken by state hash
+    arena = NodeArena()
     h = heuristic_2x2(start_state)
-    queue = [(h, hash(start_state), start_state, [])]
+    queue = BucketQueue(order="key")
+    queue.push(h, arena.add(start_state), key=hash(start_state))
     
     visited = set([start_state])
     node_count = 0
     
     while queue and time.time() - start_time < time_limit:
-        _, _, state, path = heapq.heappop(queue)
+        _, node = queue.pop()
+        state = arena.states[node]
         node_count += 1
         
         if state == goal_state:
-            return path, node_count, time.time() - start_time
+            return arena.path(node, move_names), node_count, time.time() - start_time
         
-        for move in moves_dict:
+        g_value = arena.g[node] + 1
+        for move_index, move in enumerate(move_names):
             new_state = state.apply_move(move, moves_dict)
             if new_state not in visited:
                 visited.add(new_state)
                 h = heuristic_2x2(new_state)
-                heapq.heappush(queue, (h, hash(new_state), new_state, path + [move]))
+                queue.push(h, arena.add(new_state, node, move_index, g_value), key=hash(new_state))
     
     return None, node_count, time.time() - start_time
 
-def ids_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, max_depth=20):
+def weighted_a_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, weight=2.0):
     """
-    Iterative Deepening Search algorithm for 2x2 Rubik's cube
+    Weighted A* search algorithm for 2x2 Rubik's cube
+    
+    Orders the frontier by f = g + weight * h, which reaches a solution with
+    far fewer expansions than A*. With a consistent heuristic the solution is
+    at most weight times longer than an optimal one (see RubikState.anytime_search);
+    heuristic_2x2 is not admissible, so that bound is not guaranteed with it.
     
     Args:
         start_state: Starting state (Rubik2x2State)
         goal_state: Goal state (default is SOLVED_STATE_2x2)
         moves_dict: Dictionary of moves (default is MOVES_2x2)
         time_limit: Time limit in seconds (default is 30)
-        max_depth: Maximum search depth (default is 20)
+        weight: Weight of the heuristic, 1 is plain A* (default is 2.0)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    return ara_star_search_2x2(start_state, goal_state, moves_dict, time_limit, weight=weight,
+                               final_weight=weight)
+
+def ara_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, weight=3.0,
+                        final_weight=1.0, weight_step=0.5, on_solution=None):
+    """
+    Anytime Repairing A* (ARA*) for 2x2 Rubik's cube
+    
+    Runs weighted A* with weight, then lowers the weight by weight_step down to
+    final_weight, reusing the previous search each time. Every solution found
+    is reported through on_solution; the last one is returned when the time
+    limit is reached or the search with final_weight finishes.
+    
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        weight: Weight of the first search (default is 3.0)
+        final_weight: Weight of the last search, 1 gives an optimal solution with a
+                      consistent heuristic (default is 1.0)
+        weight_step: Decrease of the weight after each search (default is 0.5)
+        on_solution: Callback on_solution(path, bound, elapsed) for every improved
+                     solution, bound being its suboptimality factor (proven only
+                     for a consistent heuristic)
+                     (default prints one line per solution)
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -283,55 +436,131 @@ def ids_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30,
     moves_dict = moves_dict or MOVES_2x2
     
     start_time = time.time()
-    node_count = 0
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    heuristic = make_heuristic(compiled, start_key)
+    
+    if on_solution is None:
+        def on_solution(path, bound, elapsed):
+            print(f"ARA*: {len(path)} moves, at most {bound} x optimal, {elapsed:.1f}s")
+    
+    path, visited_nodes, _ = ara_star(
+        start_key, compiled.encode(goal_state), compiled, heuristic, start_time, time_limit,
+        weight=weight, final_weight=final_weight, weight_step=weight_step, on_solution=on_solution
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def sma_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, max_nodes=500000,
+                      stats=None):
+    """
+    Memory-bounded A* (SMA*) for 2x2 Rubik's cube
     
-    for depth in range(1, max_depth + 1):
-        visited = set()
-        visited.add(start_state)
-        
-        def dls(state, path, current_depth):
-            nonlocal node_count
-            
-            if time.time() - start_time > time_limit:
-                return None
-            
-            node_count += 1
-            
-            if state == goal_state:
-                return path
-            
-            if current_depth == depth:
-                return None
-            
-            for move in moves_dict:
-                new_state = state.apply_move(move, moves_dict)
-                if new_state not in visited:
-                    visited.add(new_state)
-                    result = dls(new_state, path + [move], current_depth + 1)
-                    if result:
-                        return result
-                    visited.remove(new_state)  # Backtrack
-            
-            return None
-        
-        result = dls(start_state, [], 0)
-        if result:
-            return result, node_count, time.time() - start_time
-        
-        if time.time() - start_time > time_limit:
-            break
+    Best-first search like A*, but at most max_nodes nodes are kept in memory:
+    when the cap is reached the leaves with the highest f are dropped and their
+    f is backed up into their parents, which regenerate them later if needed
+    (see RubikState.memory_bounded). The solution is optimal as long as the
+    cap can hold an optimal path.
     
-    return None, node_count, time.time() - start_time
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        max_nodes: Maximum number of nodes kept in memory (default is 500000)
+        stats: Optional dict, filled with max_resident_nodes, pruned_nodes and expanded_nodes
+               (default prints them in one line)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    heuristic = make_heuristic(compiled, start_key)
+    
+    path, visited_nodes, search_stats = sma_star(
+        start_key, compiled.encode(goal_state), compiled, heuristic, start_time, time_limit,
+        max_nodes=max_nodes
+    )
+    if stats is None:
+        print(f"SMA*: max resident nodes {search_stats['max_resident_nodes']}, "
+              f"pruned {search_stats['pruned_nodes']}")
+    else:
+        stats.update(search_stats)
+    return path, visited_nodes, time.time() - start_time
+
+def ids_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, max_depth=20,
+                   table_memory_mb=16, move_ordering=False, stats=None):
+    """
+    Iterative Deepening Search algorithm for 2x2 Rubik's cube
+    
+    Runs the depth-limited DFS with limits 0, 1, ..., max_depth. The states one
+    move before the goal are looked up in a table built once, so an iteration
+    never generates the states at its depth limit; the first solution is optimal.
+    Subtrees already searched through another move order are cut with a
+    bounded transposition table.
+    
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        max_depth: Maximum search depth (default is 20)
+        table_memory_mb: Memory cap of the transposition table in MB, 0 disables it (default is 16)
+        move_ordering: Try the children with the smallest heuristic first, ties broken by
+                       history and killer moves (see RubikState.depth_first.MoveOrdering)
+                       (default is False)
+        stats: Optional dict, filled with iterations and last_iteration_nodes
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    ordering = MoveOrdering(compiled, make_heuristic(compiled, start_key)) if move_ordering else None
+    table = TranspositionTable(table_memory_mb << 20) if table_memory_mb else None
+    
+    path, visited_nodes = iterative_deepening(
+        start_key, compiled.encode(goal_state), compiled,
+        start_time, time_limit, max_depth=max_depth, ordering=ordering, stats=stats, table=table
+    )
+    return path, visited_nodes, time.time() - start_time
 
-def ida_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30):
+def ida_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, table_memory_mb=16,
+                        move_ordering=False, stats=None, checkpoint_file=None,
+                        checkpoint_interval=CHECKPOINT_INTERVAL):
     """
     IDA* Search algorithm for 2x2 Rubik's cube
     
+    Runs an iterative depth-first search on compiled move tables with canonical
+    move pruning (see RubikState.depth_first). The next threshold is the
+    smallest f-value that exceeded the previous one. A bounded transposition
+    table cuts duplicate subtrees and keeps backed-up h bounds between iterations.
+    
     Args:
         start_state: Starting state (Rubik2x2State)
         goal_state: Goal state (default is SOLVED_STATE_2x2)
         moves_dict: Dictionary of moves (default is MOVES_2x2)
         time_limit: Time limit in seconds (default is 30)
+        table_memory_mb: Memory cap of the transposition table in MB, 0 disables it (default is 16)
+        move_ordering: Try the children with the smallest heuristic first, ties broken by
+                       history and killer moves (see RubikState.depth_first.MoveOrdering)
+                       (default is False)
+        stats: Optional dict, filled with iterations and last_iteration_nodes
+        checkpoint_file: Optional file receiving the threshold and the position in the
+                         iteration every checkpoint_interval seconds and on a timeout; a
+                         later call with the same arguments resumes from it (disables the
+                         transposition table and move ordering) (default is None)
+        checkpoint_interval: Seconds between two checkpoints (default is CHECKPOINT_INTERVAL)
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -341,80 +570,131 @@ def ida_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limi
     moves_dict = moves_dict or MOVES_2x2
     
     start_time = time.time()
-    visited_nodes = 0
-    threshold = heuristic_2x2(start_state)
-    
-    while time.time() - start_time < time_limit:
-        visited = set()
-        path, found, new_threshold, nodes = _dfs_with_limit_2x2(
-            start_state, goal_state, [], 0, threshold, visited, 
-            moves_dict, start_time, time_limit
-        )
-        visited_nodes += nodes
-        
-        if found:
-            return path, visited_nodes, time.time() - start_time
-        
-        if new_threshold == float('inf'):
-            return None, visited_nodes, time.time() - start_time
-        
-        threshold = new_threshold
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    goal_key = compiled.encode(goal_state)
+    heuristic = make_heuristic(compiled, start_key)
+    table = TranspositionTable(table_memory_mb << 20) if table_memory_mb else None
+    checkpoint = None
+    if checkpoint_file:
+        checkpoint = Checkpoint(checkpoint_file, "ida_star", (start_key, goal_key, tuple(compiled.names)),
+                                checkpoint_interval)
+        table = None
+        move_ordering = False
+    
+    path, visited_nodes = ida_star(
+        start_key, goal_key, compiled, heuristic, start_time, time_limit,
+        table=table, move_ordering=move_ordering, stats=stats, checkpoint=checkpoint
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def fringe_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30):
+    """
+    Fringe Search algorithm for 2x2 Rubik's cube
+    
+    Same threshold iterations and optimal solutions as IDA*, but the nodes
+    whose f exceeded the threshold are kept on a list and the next iteration
+    resumes from them instead of the root (see RubikState.fringe_search).
+    Every visited state is cached with its g, so nothing below the old
+    threshold is expanded twice, at the price of memory like A*.
+    
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
     
-    return None, visited_nodes, time.time() - start_time
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    heuristic = make_heuristic(compiled, start_key)
+    
+    path, visited_nodes = fringe_search(
+        start_key, compiled.encode(goal_state), compiled, heuristic, start_time, time_limit
+    )
+    return path, visited_nodes, time.time() - start_time
 
-def _dfs_with_limit_2x2(state, goal_state, path, g, threshold, visited, moves_dict, start_time, time_limit):
+def batched_ida_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30,
+                                batch=BATCH_NODES, stats=None):
     """
-    Helper function for IDA* search for 2x2, performs depth-first search up to a limit
+    Batched IDA* Search algorithm for 2x2 Rubik's cube
+    
+    Same threshold iterations and solution lengths as ida_star_search_2x2, but
+    the bounded tree is expanded batch by batch as NumPy arrays of cubie
+    values: moves are gathers, pruning and h are table lookups over the whole
+    batch (see RubikState.batched_ida). Much higher nodes/sec than the
+    node-by-node search, without a transposition table.
     
     Args:
-        state: Current state
-        goal_state: Target state
-        path: Current path
-        g: Current cost
-        threshold: Current f-value threshold
-        visited: Set of visited states
-        moves_dict: Dictionary of moves
-        start_time: Start time of the search
-        time_limit: Time limit for the search
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        batch: Parents expanded per batch, bounds the memory (default is BATCH_NODES)
+        stats: Optional dict, filled with iterations and nodes_per_second
+               (default prints them in one line)
     
     Returns:
-        tuple: (path, found, new_threshold, nodes_visited)
+        tuple: (path, nodes_visited, time_taken)
     """
-    if time.time() - start_time >= time_limit:
-        return None, False, float('inf'), 0
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
     
-    if state == goal_state:
-        return path, True, threshold, 1
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    
+    path, visited_nodes, search_stats = batched_ida_star(
+        compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit,
+        batch=batch
+    )
+    if stats is None:
+        print(f"Batched IDA*: {search_stats['iterations']} iterations, "
+              f"{search_stats['nodes_per_second']:.0f} nodes/s")
+    else:
+        stats.update(search_stats)
+    return path, visited_nodes, time.time() - start_time
+
+def parallel_ida_star_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, workers=None,
+                                 split_depth=3):
+    """
+    Parallel IDA* Search algorithm for 2x2 Rubik's cube
     
-    visited.add(state)
-    nodes_visited = 1
+    Each IDA* iteration is split into the canonical paths of the first
+    split_depth moves, and the subtrees below them are searched by a pool of
+    worker processes (see RubikState.parallel_search). The first solution
+    found stops the other workers; it is optimal like the one of IDA*.
     
-    f = g + heuristic_2x2(state)
-    if f > threshold:
-        return None, False, f, nodes_visited
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        workers: Number of worker processes (default is the number of CPUs)
+        split_depth: Length of the path prefixes handed to the workers (default is 3)
     
-    min_threshold = float('inf')
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
     
-    for move in moves_dict:
-        new_state = state.apply_move(move, moves_dict)
-        if new_state in visited:
-            continue
-            
-        new_path, found, new_threshold, nodes = _dfs_with_limit_2x2(
-            new_state, goal_state, path + [move], g + 1, threshold, visited.copy(), 
-            moves_dict, start_time, time_limit
-        )
-        
-        nodes_visited += nodes
-        
-        if found:
-            return new_path, True, threshold, nodes_visited
-            
-        if new_threshold < min_threshold:
-            min_threshold = new_threshold
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
     
-    visited.remove(state)  # Backtrack
-    return None, False, min_threshold, nodes_visited
+    path, visited_nodes = parallel_ida_star(
+        compiled.encode(start_state), compiled.encode(goal_state), moves_dict, start_time, time_limit,
+        workers=workers, split_depth=split_depth
+    )
+    return path, visited_nodes, time.time() - start_time
 
 def hill_climbing_max_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, max_iterations=1000):
     """
@@ -573,6 +853,19 @@ def pdb_heuristic_2x2(state, pdb):
     # Return the maximum since both subproblems must be solved
     return max(cp_value, co_value)
 
+def pdb_heuristic_2x2_batch(states, pdb):
+    """
+    Vectorized pattern database heuristic for 2x2 Rubik's cube
+    
+    Args:
+        states: List of Rubik2x2State or (N, 16) array of states
+        pdb: Pattern database
+        
+    Returns:
+        np.ndarray: (N,) int8 array of heuristic values
+    """
+    return pdb.get_heuristic_batch(states)
+
 def a_star_pdb_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, pdb=None):
     """
     A* algorithm for 2x2 Rubik's Cube using Pattern Database heuristic
@@ -597,31 +890,36 @@ def a_star_pdb_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30,
     start_time = time.time()
     nodes_explored = 0
     
-    # Priority queue for A*: (f_value, state_hash, state, path)
+    move_names = list(moves_dict.keys())
+    
+    # Bucket queue for A*: node indices keyed by f_value, deepest node first on ties
     # f_value = g_value (path length) + h_value (heuristic)
+    arena = NodeArena()
     h_value = pdb_heuristic_2x2(start_state, pdb)
-    frontier = [(h_value, hash(start_state), start_state, [])]
+    frontier = BucketQueue(order="high_g")
+    frontier.push(h_value, arena.add(start_state))
     
     # Dictionary to track visited states and their shortest paths
     visited = {start_state: 0}  # state -> g_value
     
     while frontier and time.time() - start_time < time_limit:
-        f_value, _, state, path = heapq.heappop(frontier)
+        f_value, node = frontier.pop()
+        state = arena.states[node]
         nodes_explored += 1
         
-        g_value = len(path)
+        g_value = arena.g[node]
         
         # Check if we reached the goal
         if state == goal_state:
             end_time = time.time()
-            return path, nodes_explored, end_time - start_time
+            return arena.path(node, move_names), nodes_explored, end_time - start_time
         
         # If we already found a better path to this state, skip it
         if g_value > visited.get(state, float('inf')):
             continue
         
         # Try all possible moves
-        for move in moves_dict:
+        for move_index, move in enumerate(move_names):
             new_state = state.apply_move(move, moves_dict)
             new_g_value = g_value + 1
             
@@ -632,11 +930,32 @@ def a_star_pdb_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30,
             # Update visited and add to frontier
             visited[new_state] = new_g_value
             h_value = pdb_heuristic_2x2(new_state, pdb)
-            heapq.heappush(frontier, (new_g_value + h_value, hash(new_state), new_state, path + [move]))
+            frontier.push(new_g_value + h_value, arena.add(new_state, node, move_index, new_g_value), new_g_value)
     
     end_time = time.time()
     return None, nodes_explored, end_time - start_time
 
+_corner_pattern_database = None
+
+def get_corner_pattern_database():
+    """
+    Complete corner pattern database of MOVES_2x2, generated on first use
+    
+    Generated rather than loaded: the orientation table stored in
+    rubik_2x2_pdb.pkl overestimates some distances, so it is not admissible.
+    
+    Returns:
+        PatternDatabase
+    """
+    global _corner_pattern_database
+    if _corner_pattern_database is None:
+        from pdb_rubik_2x2 import PatternDatabase
+        pdb = PatternDatabase()
+        pdb.generate_corner_permutation_database()
+        pdb.generate_corner_orientation_database()
+        _corner_pattern_database = pdb
+    return _corner_pattern_database
+
 def load_pattern_database(file_path=None):
     """
     Load the pattern database for 2x2 Rubik's cube from a file
@@ -684,6 +1003,91 @@ def load_pattern_database(file_path=None):
         print(f"Error loading Pattern Database: {e}")
         return None
 
+def local_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, method="annealing",
+                     seed=None, **options):
+    """
+    Local search for 2x2 Rubik's cube
+    
+    A batch of walkers climbs towards the goal with random restarts, simulated
+    annealing or tabu search (see RubikState.local_search). Memory stays
+    constant and the search keeps going until the time limit instead of
+    stopping at the first plateau, but solutions are long and not optimal.
+    
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        method: "random_restart" (hill climbing with random restarts), "annealing"
+                (simulated annealing) or "tabu" (tabu search) (default is "annealing")
+        seed: Seed of the random generator (default is None)
+        **options: Parameters of the chosen strategy (walkers, max_steps, cooling, tenure...)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
+    
+    searches = {
+        "random_restart": random_restart_hill_climbing,
+        "annealing": simulated_annealing,
+        "tabu": tabu_search,
+    }
+    if method not in searches:
+        raise ValueError(f"Unknown local search method: {method}")
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    path, visited_nodes = searches[method](
+        compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit,
+        seed=seed, **options
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def genetic_search_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30, population=1000,
+                       length=40, generations=None, seed=None, stats=None):
+    """
+    Genetic algorithm for 2x2 Rubik's cube
+    
+    Evolves fixed-length move sequences with tournament selection, one-point
+    crossover, mutation and elitism; the whole population is played and
+    scored as one NumPy batch per generation (see RubikState.genetic).
+    Solutions are long and not optimal.
+    
+    Args:
+        start_state: Starting state (Rubik2x2State)
+        goal_state: Goal state (default is SOLVED_STATE_2x2)
+        moves_dict: Dictionary of moves (default is MOVES_2x2)
+        time_limit: Time limit in seconds (default is 30)
+        population: Sequences per generation (default is 1000)
+        length: Moves per sequence (default is 40)
+        generations: Maximum number of generations, None runs until the time limit (default is None)
+        seed: Seed of the random generator (default is None)
+        stats: Optional dict, filled with generations, best_score and sequences_per_second
+               (default prints them in one line)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken), nodes_visited being the evaluated sequences
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_2x2
+    moves_dict = moves_dict or MOVES_2x2
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    path, evaluated, search_stats = genetic_search(
+        compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit,
+        population=population, length=length, generations=generations, seed=seed
+    )
+    if stats is None:
+        print(f"GA: {search_stats['generations']} generations, "
+              f"{search_stats['sequences_per_second']:.0f} sequences/s")
+    else:
+        stats.update(search_stats)
+    return path, evaluated, time.time() - start_time
+
 def solve_2x2(start_state, algorithm="a_star", time_limit=30):
     """
     Main function to solve a 2x2 Rubik's cube with the specified algorithm
@@ -712,20 +1116,46 @@ def solve_2x2(start_state, algorithm="a_star", time_limit=30):
         return a_star_search_2x2(start_state, time_limit=time_limit)
     elif algorithm.lower() == "bfs":
         return bfs_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "bidirectional_bfs" or algorithm.lower() == "bibfs":
+        return bidirectional_bfs_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "mm":
+        return mm_search_2x2(start_state, time_limit=time_limit)
     elif algorithm.lower() == "dfs":
         return dfs_search_2x2(start_state, time_limit=time_limit)
     elif algorithm.lower() == "ucs":
         return ucs_search_2x2(start_state, time_limit=time_limit)
     elif algorithm.lower() == "greedy":
         return greedy_best_first_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "weighted_a_star":
+        return weighted_a_star_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "ara_star":
+        return ara_star_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "epea_star":
+        return a_star_search_2x2(start_state, time_limit=time_limit, partial_expansion=True)
+    elif algorithm.lower() == "sma_star":
+        return sma_star_search_2x2(start_state, time_limit=time_limit)
     elif algorithm.lower() == "ids":
         return ids_search_2x2(start_state, time_limit=time_limit)
     elif algorithm.lower() == "ida_star":
         return ida_star_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "fringe" or algorithm.lower() == "fringe_search":
+        return fringe_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "batched_ida_star":
+        return batched_ida_star_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "parallel_ida_star":
+        return parallel_ida_star_search_2x2(start_state, time_limit=time_limit)
     elif algorithm.lower() == "hill_climbing" or algorithm.lower() == "hill_max":
         return hill_climbing_max_search_2x2(start_state, time_limit=time_limit)
     elif algorithm.lower() == "hill_random":
         return hill_climbing_random_search_2x2(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "random_restart":
+        return local_search_2x2(start_state, time_limit=time_limit, method="random_restart")
+    elif algorithm.lower() == "simulated_annealing" or algorithm.lower() == "annealing":
+        return local_search_2x2(start_state, time_limit=time_limit, method="annealing")
+    elif algorithm.lower() == "tabu" or algorithm.lower() == "tabu_search":
+        return local_search_2x2(start_state, time_limit=time_limit, method="tabu")
+    elif algorithm.lower() == "genetic" or algorithm.lower() == "ga":
+        return genetic_search_2x2(start_state, time_limit=time_limit)
     else:
         print(f"Unknown algorithm: {algorithm}, using A* instead")
         return a_star_search_2x2(start_state, time_limit=time_limit)
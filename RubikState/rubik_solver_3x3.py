@@ -7,15 +7,43 @@ specifically optimized for solving the 3x3 Rubik's cube.
 
 import time
 import random
-import heapq
 import os
 import pickle
+import tempfile
 from collections import deque
 
+from RubikState.search_structures import NodeArena, BucketQueue, TranspositionTable
+from RubikState.compiled_moves import get_compiled_moves, make_heuristic
+from RubikState.depth_first import ida_star, iterative_deepening, depth_limited_dfs, goal_predecessors, MoveOrdering
+from RubikState.parallel_search import parallel_ida_star
+from RubikState.distributed_search import distributed_ida_star
+from RubikState.bidirectional import bidirectional_bfs, mm_search, mm_heuristics
+from RubikState.anytime_search import ara_star
+from RubikState.memory_bounded import sma_star
+from RubikState.partial_expansion import epea_star
+from RubikState.fringe_search import fringe_search
+from RubikState.batched_ida import BATCH_NODES, batched_ida_star
+from RubikState.checkpoint import Checkpoint, CHECKPOINT_INTERVAL
+from RubikState.local_search import random_restart_hill_climbing, simulated_annealing, tabu_search
+from RubikState.genetic import genetic_search
+from RubikState.beam_search import beam_search, pdb_score_batch
+from RubikState.kociemba import KociembaTables, get_kociemba_tables, kociemba_solve, face_turns_to_moves
+from RubikState.thistlethwaite import ThistlethwaiteTables, get_thistlethwaite_tables, thistlethwaite_solve
+from RubikState.korf import KorfTables, get_korf_tables, korf_ida_star, korf_moves_to_names
+from RubikState.endgame import ENDGAME_DEPTH, get_endgame_table
+from RubikState.external_bfs import external_bfs_search
+
 # Import 3x3 specific classes and constants
 from RubikState.rubik_chen import RubikState, SOLVED_STATE_3x3, MOVES_3x3, heuristic_3x3
 
-def a_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30):
+def _endgame_table(goal_state, moves_dict, endgame_depth):
+    """Endgame table of a search, None if disabled or the search does not end on solved with MOVES_3x3"""
+    if not endgame_depth or moves_dict is not MOVES_3x3 or goal_state != SOLVED_STATE_3x3:
+        return None
+    return get_endgame_table(endgame_depth)
+
+def a_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, endgame_depth=ENDGAME_DEPTH,
+                      partial_expansion=False, stats=None):
     """
     A* search algorithm for 3x3 Rubik's cube
     
@@ -24,6 +52,15 @@ def a_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=
         goal_state: Goal state (default is SOLVED_STATE_3x3)
         moves_dict: Dictionary of moves (default is MOVES_3x3)
         time_limit: Time limit in seconds (default is 30)
+        endgame_depth: Depth of the endgame table (RubikState.endgame) giving exact
+                       distances near solved, 0 disables it; not used with
+                       partial_expansion (default is ENDGAME_DEPTH)
+        partial_expansion: Run enhanced partial-expansion A* (see RubikState.partial_expansion),
+                           which only generates the children whose f equals the f of the
+                           expanded node; solutions of the same length as A*, several
+                           times fewer generated nodes (default is False)
+        stats: Optional dict, filled with expanded_nodes, reinserted_nodes and surplus_nodes
+               in partial_expansion mode (default prints them in one line)
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -32,34 +69,61 @@ def a_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=
     goal_state = goal_state or SOLVED_STATE_3x3
     moves_dict = moves_dict or MOVES_3x3
     
+    if partial_expansion:
+        start_time = time.time()
+        compiled = get_compiled_moves(moves_dict)
+        path, visited_nodes, search_stats = epea_star(
+            compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit
+        )
+        if stats is None:
+            print(f"EPEA*: {search_stats['expanded_nodes']} expansions, "
+                  f"{search_stats['surplus_nodes']} surplus children not generated")
+        else:
+            stats.update(search_stats)
+        return path, visited_nodes, time.time() - start_time
+    
     # Get list of move names
     move_names = list(moves_dict.keys())
     
     # Count visited nodes
     nodes_visited = 0
     
-    # Priority queue for A*: (f_value, state_hash, state, path)
-    # Using state hash to avoid direct comparison of state objects
-    h_value = heuristic_3x3(start_state)
-    queue = [(h_value, hash(start_state), start_state, [])]
+    # With the endgame table h is exact near solved, and the first popped node
+    # of the table is finished by a table walk
+    endgame = _endgame_table(goal_state, moves_dict, endgame_depth)
+    heuristic = endgame.state_heuristic(heuristic_3x3) if endgame else heuristic_3x3
+    
+    # Nodes live in the arena; the bucket queue holds node indices keyed by f_value
+    # and pops the deepest node first among equal f_values
+    arena = NodeArena()
+    h_value = heuristic(start_state)
+    queue = BucketQueue(order="high_g")
+    queue.push(h_value, arena.add(start_state))
     
     # Dictionary to track visited states and their g_values
     visited = {start_state: 0}  # state -> g_value
 
     start_time = time.time()
     while queue and time.time() - start_time < time_limit:
-        f_value, _, state, path = heapq.heappop(queue)
-        g_value = len(path)
+        f_value, node = queue.pop()
+        state = arena.states[node]
+        g_value = arena.g[node]
         
         if state == goal_state:
             end_time = time.time()
-            return path, nodes_visited, end_time - start_time
+            return arena.path(node, move_names), nodes_visited, end_time - start_time
         
         # If we already found a better path to this state, skip it
         if g_value > visited.get(state, float('inf')):
             continue
+        
+        if endgame and f_value - g_value <= endgame.depth:
+            tail = endgame.walk(endgame.compiled.encode(state))
+            if tail is not None:
+                path = arena.path(node, move_names) + [move_names[m] for m in tail]
+                return path, nodes_visited, time.time() - start_time
 
-        for move in move_names:
+        for move_index, move in enumerate(move_names):
             nodes_visited += 1
             new_state = state.apply_move(move, moves_dict)
             new_g_value = g_value + 1
@@ -70,21 +134,31 @@ def a_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=
             
             # Update visited and add to frontier
             visited[new_state] = new_g_value
-            h_score = heuristic_3x3(new_state)
+            h_score = heuristic(new_state)
             f_score = new_g_value + h_score
-            heapq.heappush(queue, (f_score, hash(new_state), new_state, path + [move]))
+            queue.push(f_score, arena.add(new_state, node, move_index, new_g_value), new_g_value)
 
     return None, nodes_visited, time.time() - start_time
 
-def bfs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30):
+def bfs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, external_dir=None,
+                   checkpoint_interval=None):
     """
     BFS algorithm for 3x3 Rubik's cube
     
+    With external_dir the search runs layer by layer on disk with delayed
+    duplicate detection (see RubikState.external_bfs): memory stays bounded
+    whatever the depth, and nodes_visited counts the generated children.
+    
     Args:
         start_state: Starting state (RubikState)
         goal_state: Goal state (default is SOLVED_STATE_3x3)
         moves_dict: Dictionary of moves (default is MOVES_3x3)
         time_limit: Time limit in seconds (default is 30)
+        external_dir: Directory for the layer files of the disk-backed search
+                      (default is None, in-memory search)
+        checkpoint_interval: Seconds between two checkpoints of the disk-backed search;
+                             on a timeout its files stay in external_dir and the same
+                             call resumes it (default is None, no checkpoints)
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -93,44 +167,59 @@ def bfs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30)
     goal_state = goal_state or SOLVED_STATE_3x3
     moves_dict = moves_dict or MOVES_3x3
     
+    if external_dir is not None:
+        start_time = time.time()
+        path, nodes_visited = external_bfs_search(
+            start_state, goal_state, moves_dict, external_dir, start_time, time_limit,
+            checkpoint_interval=checkpoint_interval
+        )
+        return path, nodes_visited, time.time() - start_time
+    
     # Get list of move names
     move_names = list(moves_dict.keys())
     
     # Count visited nodes
     nodes_visited = 0
     
-    queue = deque([(start_state, [])])  # (state, path)
+    arena = NodeArena()
+    queue = deque([arena.add(start_state)])  # node indices
     visited = {start_state}
     
     start_time = time.time()
     while queue and time.time() - start_time < time_limit:
-        state, path = queue.popleft()
+        node = queue.popleft()
+        state = arena.states[node]
         nodes_visited += 1
         
         if state == goal_state:
             end_time = time.time()
-            return path, nodes_visited, end_time - start_time
+            return arena.path(node, move_names), nodes_visited, end_time - start_time
         
-        for move in move_names:
+        g_value = arena.g[node] + 1
+        for move_index, move in enumerate(move_names):
             new_state = state.apply_move(move, moves_dict)
             
             if new_state not in visited:
                 visited.add(new_state)
-                queue.append((new_state, path + [move]))
+                queue.append(arena.add(new_state, node, move_index, g_value))
     
     end_time = time.time()
     return None, nodes_visited, end_time - start_time
 
-def dfs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, max_depth=20):
+def bidirectional_bfs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30):
     """
-    DFS algorithm for 3x3 Rubik's cube
+    Bidirectional BFS algorithm for 3x3 Rubik's cube
+    
+    Alternately expands the smaller of a forward frontier from the start state
+    and a backward frontier from the goal (using inverse moves) until they
+    meet, then joins the two half-paths. Each side only goes half as deep as
+    plain BFS, so much longer optimal solutions fit in memory.
     
     Args:
         start_state: Starting state (RubikState)
         goal_state: Goal state (default is SOLVED_STATE_3x3)
         moves_dict: Dictionary of moves (default is MOVES_3x3)
         time_limit: Time limit in seconds (default is 30)
-        max_depth: Maximum search depth (default is 20)
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -140,38 +229,103 @@ def dfs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30,
     moves_dict = moves_dict or MOVES_3x3
     
     start_time = time.time()
-    visited = set()
-    node_count = 0
+    compiled = get_compiled_moves(moves_dict)
     
-    def dfs_recursive(state, path, depth):
-        nonlocal node_count
-        
-        if time.time() - start_time > time_limit:
-            return None
-        
-        node_count += 1
-        
-        if state == goal_state:
-            return path
-        
-        if depth >= max_depth:
-            return None
-        
-        for move in moves_dict:
-            new_state = state.apply_move(move, moves_dict)
-            if new_state not in visited:
-                visited.add(new_state)
-                result = dfs_recursive(new_state, path + [move], depth + 1)
-                if result:
-                    return result
-                visited.remove(new_state)  # Backtrack
-        
-        return None
+    path, visited_nodes = bidirectional_bfs(
+        compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def mm_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, stats=None):
+    """
+    Bidirectional heuristic search (MM) for 3x3 Rubik's cube
+    
+    A* from the start state and from the goal at the same time, each side
+    ordered by max(f, 2g) so that both stop at the middle of the solution
+    (see RubikState.bidirectional.mm_search). Both sides use the pattern
+    databases of the optimal solver (RubikState.korf), the backward side on
+    the state seen relative to the start state; they are admissible, so the
+    solution is optimal. Moves other than MOVES_3x3 fall back to
+    heuristic_3x3, which is not admissible: the solution is then not
+    guaranteed optimal. The databases are built on first use, which is not
+    counted against time_limit.
     
-    visited.add(start_state)
-    result = dfs_recursive(start_state, [], 0)
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        stats: Optional dict, filled with forward_expanded and backward_expanded
+               (default prints them in one line)
     
-    return result, node_count, time.time() - start_time
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    heuristic = get_korf_tables("qtm").key_heuristic() if moves_dict is MOVES_3x3 else None
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    goal_key = compiled.encode(goal_state)
+    heuristic_forward, heuristic_backward = mm_heuristics(compiled, start_key, goal_key, heuristic)
+    
+    path, visited_nodes, search_stats = mm_search(
+        start_key, goal_key, compiled, heuristic_forward, heuristic_backward, start_time, time_limit
+    )
+    if stats is None:
+        print(f"MM: expanded {search_stats['forward_expanded']} forward, "
+              f"{search_stats['backward_expanded']} backward")
+    else:
+        stats.update(search_stats)
+    return path, visited_nodes, time.time() - start_time
+
+def dfs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, max_depth=20,
+                   endgame_depth=ENDGAME_DEPTH, move_ordering=False):
+    """
+    DFS algorithm for 3x3 Rubik's cube
+    
+    Iterative depth-first search limited to max_depth moves, on compiled move
+    tables with canonical move pruning. Cycles are only checked against the
+    current path, so the search is complete within max_depth (see
+    RubikState.depth_first.depth_limited_dfs). The solution is not optimal.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        max_depth: Maximum search depth (default is 20)
+        endgame_depth: Depth of the endgame table (RubikState.endgame) finishing
+                       the last moves by lookup, 0 disables it (default is ENDGAME_DEPTH)
+        move_ordering: Try the children with the smallest heuristic first, ties broken by
+                       history and killer moves (see RubikState.depth_first.MoveOrdering)
+                       (default is False)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    endgame = _endgame_table(goal_state, moves_dict, endgame_depth)
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    goal_key = compiled.encode(goal_state)
+    start_key = compiled.encode(start_state)
+    ordering = MoveOrdering(compiled, make_heuristic(compiled, start_key)) if move_ordering else None
+    
+    moves, node_count, _ = depth_limited_dfs(
+        start_key, goal_key, compiled, max_depth, start_time + time_limit,
+        goal_predecessors(compiled, goal_key), endgame=endgame, ordering=ordering
+    )
+    path = [compiled.names[m] for m in moves] if moves is not None else None
+    return path, node_count, time.time() - start_time
 
 def ucs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30):
     """
@@ -194,14 +348,19 @@ def ucs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30)
     start_time = time.time()
     nodes_visited = 0
     
-    # Create priority queue with (cost, hash of state, state, path)
-    queue = [(0, hash(start_state), start_state, [])]
+    move_names = list(moves_dict.keys())
+    
+    # Bucket queue of node indices keyed by cost, first-in first-out on ties
+    arena = NodeArena()
+    queue = BucketQueue(order="fifo")
+    queue.push(0, arena.add(start_state))
     
     # Dictionary to track visited states and their lowest costs
     visited = {start_state: 0}  # state -> cost
     
     while queue and time.time() - start_time < time_limit:
-        cost, _, state, path = heapq.heappop(queue)
+        cost, node = queue.pop()
+        state = arena.states[node]
         nodes_visited += 1
         
         # If current state has higher cost than the best known state, skip
@@ -209,16 +368,16 @@ def ucs_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30)
             continue
             
         if state == goal_state:
-            return path, nodes_visited, time.time() - start_time
+            return arena.path(node, move_names), nodes_visited, time.time() - start_time
             
-        for move in moves_dict:
+        for move_index, move in enumerate(move_names):
             new_state = state.apply_move(move, moves_dict)
             new_cost = cost + 1
             
             # Only update if not visited or found a shorter path
             if new_state not in visited or new_cost < visited[new_state]:
                 visited[new_state] = new_cost
-                heapq.heappush(queue, (new_cost, hash(new_state), new_state, path + [move]))
+                queue.push(new_cost, arena.add(new_state, node, move_index, new_cost))
     
     return None, nodes_visited, time.time() - start_time
 
@@ -241,39 +400,230 @@ def greedy_best_first_search_3x3(start_state, goal_state=None, moves_dict=None,
     
     start_time = time.time()
     
-    # Create priority queue with (heuristic, hash of state, state, path)
+    move_names = list(moves_dict.keys())
+    
+    # Bucket queue of node indices keyed by heuristic value, ties broken by state hash
+    arena = NodeArena()
     h = heuristic_3x3(start_state)
-    queue = [(h, hash(start_state), start_state, [])]
+    queue = BucketQueue(order="key")
+    queue.push(h, arena.add(start_state), key=hash(start_state))
     
     visited = set([start_state])
     node_count = 0
     
     while queue and time.time() - start_time < time_limit:
-        _, _, state, path = heapq.heappop(queue)
+        _, node = queue.pop()
+        state = arena.states[node]
         node_count += 1
         
         if state == goal_state:
-            return path, node_count, time.time() - start_time
+            return arena.path(node, move_names), node_count, time.time() - start_time
         
-        for move in moves_dict:
+        g_value = arena.g[node] + 1
+        for move_index, move in enumerate(move_names):
             new_state = state.apply_move(move, moves_dict)
             if new_state not in visited:
                 visited.add(new_state)
                 h = heuristic_3x3(new_state)
-                heapq.heappush(queue, (h, hash(new_state), new_state, path + [move]))
+                queue.push(h, arena.add(new_state, node, move_index, g_value), key=hash(new_state))
     
     return None, node_count, time.time() - start_time
 
-def ids_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, max_depth=20):
+def weighted_a_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, weight=2.0, use_pdb=False):
+    """
+    Weighted A* search algorithm for 3x3 Rubik's cube
+    
+    Orders the frontier by f = g + weight * h, which reaches a solution with
+    far fewer expansions than A*. With a consistent heuristic the solution is
+    at most weight times longer than an optimal one (see RubikState.anytime_search);
+    heuristic_3x3 is not admissible, so that bound is not guaranteed with it.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        weight: Weight of the heuristic, 1 is plain A* (default is 2.0)
+        use_pdb: Use the pattern databases of the optimal solver as heuristic instead of
+                 heuristic_3x3 (MOVES_3x3 and SOLVED_STATE_3x3 only, built on first use, which
+                 is not counted against time_limit) (default is False)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    return ara_star_search_3x3(start_state, goal_state, moves_dict, time_limit, weight=weight,
+                               final_weight=weight, use_pdb=use_pdb)
+
+def ara_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, weight=3.0,
+                        final_weight=1.0, weight_step=0.5, use_pdb=False, on_solution=None):
+    """
+    Anytime Repairing A* (ARA*) for 3x3 Rubik's cube
+    
+    Runs weighted A* with weight, then lowers the weight by weight_step down to
+    final_weight, reusing the previous search each time. Every solution found
+    is reported through on_solution; the last one is returned when the time
+    limit is reached or the search with final_weight finishes.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        weight: Weight of the first search (default is 3.0)
+        final_weight: Weight of the last search, 1 gives an optimal solution with a
+                      consistent heuristic (default is 1.0)
+        weight_step: Decrease of the weight after each search (default is 0.5)
+        use_pdb: Use the pattern databases of the optimal solver as heuristic instead of
+                 heuristic_3x3 (MOVES_3x3 and SOLVED_STATE_3x3 only, built on first use, which
+                 is not counted against time_limit) (default is False)
+        on_solution: Callback on_solution(path, bound, elapsed) for every improved
+                     solution, bound being its suboptimality factor (proven only
+                     for a consistent heuristic)
+                     (default prints one line per solution)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    if use_pdb:
+        if moves_dict is not MOVES_3x3 or goal_state != SOLVED_STATE_3x3:
+            raise ValueError("Pattern database heuristic needs MOVES_3x3 and SOLVED_STATE_3x3")
+        heuristic = get_korf_tables("qtm").key_heuristic()
+    else:
+        heuristic = make_heuristic(compiled, start_key)
+    
+    start_time = time.time()
+    if on_solution is None:
+        def on_solution(path, bound, elapsed):
+            print(f"ARA*: {len(path)} moves, at most {bound} x optimal, {elapsed:.1f}s")
+    
+    path, visited_nodes, _ = ara_star(
+        start_key, compiled.encode(goal_state), compiled, heuristic, start_time, time_limit,
+        weight=weight, final_weight=final_weight, weight_step=weight_step, on_solution=on_solution
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def sma_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, max_nodes=500000, use_pdb=False,
+                      stats=None):
+    """
+    Memory-bounded A* (SMA*) for 3x3 Rubik's cube
+    
+    Best-first search like A*, but at most max_nodes nodes are kept in memory:
+    when the cap is reached the leaves with the highest f are dropped and their
+    f is backed up into their parents, which regenerate them later if needed
+    (see RubikState.memory_bounded). The solution is optimal as long as the
+    cap can hold an optimal path.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        max_nodes: Maximum number of nodes kept in memory (default is 500000)
+        use_pdb: Use the pattern databases of the optimal solver as heuristic instead of
+                 heuristic_3x3 (MOVES_3x3 and SOLVED_STATE_3x3 only, built on first use, which
+                 is not counted against time_limit) (default is False)
+        stats: Optional dict, filled with max_resident_nodes, pruned_nodes and expanded_nodes
+               (default prints them in one line)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    if use_pdb:
+        if moves_dict is not MOVES_3x3 or goal_state != SOLVED_STATE_3x3:
+            raise ValueError("Pattern database heuristic needs MOVES_3x3 and SOLVED_STATE_3x3")
+        heuristic = get_korf_tables("qtm").key_heuristic()
+    else:
+        heuristic = make_heuristic(compiled, start_key)
+    
+    start_time = time.time()
+    path, visited_nodes, search_stats = sma_star(
+        start_key, compiled.encode(goal_state), compiled, heuristic, start_time, time_limit,
+        max_nodes=max_nodes
+    )
+    if stats is None:
+        print(f"SMA*: max resident nodes {search_stats['max_resident_nodes']}, "
+              f"pruned {search_stats['pruned_nodes']}")
+    else:
+        stats.update(search_stats)
+    return path, visited_nodes, time.time() - start_time
+
+def beam_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, beam_width=10000,
+                    max_depth=40, use_pdb=True):
+    """
+    Beam search algorithm for 3x3 Rubik's cube
+    
+    Keeps the beam_width best states of each depth and expands them as one
+    NumPy batch (see RubikState.beam_search). Fast and memory-bounded, but not
+    optimal and not complete: it may miss a solution that exists.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        beam_width: States kept per depth (default is 10000)
+        max_depth: Maximum solution length (default is 40)
+        use_pdb: Score states with the pattern databases of the optimal solver
+                 (MOVES_3x3 and SOLVED_STATE_3x3 only, built on first use, which is
+                 not counted against time_limit), otherwise with heuristic_3x3_batch
+                 (default is True)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    score = None
+    if use_pdb:
+        if moves_dict is not MOVES_3x3 or goal_state != SOLVED_STATE_3x3:
+            raise ValueError("Pattern database heuristic needs MOVES_3x3 and SOLVED_STATE_3x3")
+        score = pdb_score_batch(get_korf_tables("qtm"))
+    
+    start_time = time.time()
+    path, visited_nodes = beam_search(
+        start_state, goal_state, moves_dict, start_time, time_limit, beam_width=beam_width,
+        max_depth=max_depth, heuristic_batch=score
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def ids_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, max_depth=20,
+                   table_memory_mb=16, endgame_depth=ENDGAME_DEPTH, move_ordering=False, stats=None):
     """
     Iterative Deepening Search algorithm for 3x3 Rubik's cube
     
+    Runs the depth-limited DFS with limits 0, 1, ..., max_depth. The states one
+    move before the goal are looked up in a table built once, so an iteration
+    never generates the states at its depth limit; the first solution is optimal.
+    Subtrees already searched through another move order are cut with a
+    bounded transposition table.
+    
     Args:
         start_state: Starting state (RubikState)
         goal_state: Goal state (default is SOLVED_STATE_3x3)
         moves_dict: Dictionary of moves (default is MOVES_3x3)
         time_limit: Time limit in seconds (default is 30)
         max_depth: Maximum search depth (default is 20)
+        table_memory_mb: Memory cap of the transposition table in MB, 0 disables it (default is 16)
+        endgame_depth: Depth of the endgame table (RubikState.endgame) replacing the
+                       last levels of every iteration, 0 disables it (default is ENDGAME_DEPTH)
+        move_ordering: Try the children with the smallest heuristic first, ties broken by
+                       history and killer moves (see RubikState.depth_first.MoveOrdering)
+                       (default is False)
+        stats: Optional dict, filled with iterations and last_iteration_nodes
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -282,56 +632,95 @@ def ids_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30,
     goal_state = goal_state or SOLVED_STATE_3x3
     moves_dict = moves_dict or MOVES_3x3
     
+    endgame = _endgame_table(goal_state, moves_dict, endgame_depth)
+    
     start_time = time.time()
-    node_count = 0
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    ordering = MoveOrdering(compiled, make_heuristic(compiled, start_key)) if move_ordering else None
+    table = TranspositionTable(table_memory_mb << 20) if table_memory_mb else None
+    
+    path, visited_nodes = iterative_deepening(
+        start_key, compiled.encode(goal_state), compiled,
+        start_time, time_limit, max_depth=max_depth,
+        endgame=endgame, ordering=ordering, stats=stats, table=table
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def ida_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, table_memory_mb=16,
+                        endgame_depth=ENDGAME_DEPTH, move_ordering=False, stats=None, checkpoint_file=None,
+                        checkpoint_interval=CHECKPOINT_INTERVAL):
+    """
+    IDA* Search algorithm for 3x3 Rubik's cube
     
-    for depth in range(1, max_depth + 1):
-        visited = set()
-        visited.add(start_state)
-        
-        def dls(state, path, current_depth):
-            nonlocal node_count
-            
-            if time.time() - start_time > time_limit:
-                return None
-            
-            node_count += 1
-            
-            if state == goal_state:
-                return path
-            
-            if current_depth == depth:
-                return None
-            
-            for move in moves_dict:
-                new_state = state.apply_move(move, moves_dict)
-                if new_state not in visited:
-                    visited.add(new_state)
-                    result = dls(new_state, path + [move], current_depth + 1)
-                    if result:
-                        return result
-                    visited.remove(new_state)  # Backtrack
-            
-            return None
-        
-        result = dls(start_state, [], 0)
-        if result:
-            return result, node_count, time.time() - start_time
-        
-        if time.time() - start_time > time_limit:
-            break
+    Runs an iterative depth-first search on compiled move tables with canonical
+    move pruning (see RubikState.depth_first). The next threshold is the
+    smallest f-value that exceeded the previous one. A bounded transposition
+    table cuts duplicate subtrees and keeps backed-up h bounds between iterations.
     
-    return None, node_count, time.time() - start_time
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        table_memory_mb: Memory cap of the transposition table in MB, 0 disables it (default is 16)
+        endgame_depth: Depth of the endgame table (RubikState.endgame) giving exact
+                       distances near solved, 0 disables it (default is ENDGAME_DEPTH)
+        move_ordering: Try the children with the smallest heuristic first, ties broken by
+                       history and killer moves (see RubikState.depth_first.MoveOrdering)
+                       (default is False)
+        stats: Optional dict, filled with iterations and last_iteration_nodes
+        checkpoint_file: Optional file receiving the threshold and the position in the
+                         iteration every checkpoint_interval seconds and on a timeout; a
+                         later call with the same arguments resumes from it (disables the
+                         transposition table and move ordering) (default is None)
+        checkpoint_interval: Seconds between two checkpoints (default is CHECKPOINT_INTERVAL)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    endgame = _endgame_table(goal_state, moves_dict, endgame_depth)
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    goal_key = compiled.encode(goal_state)
+    heuristic = make_heuristic(compiled, start_key)
+    table = TranspositionTable(table_memory_mb << 20) if table_memory_mb else None
+    checkpoint = None
+    if checkpoint_file:
+        checkpoint = Checkpoint(checkpoint_file, "ida_star",
+                                (start_key, goal_key, tuple(compiled.names), endgame_depth), checkpoint_interval)
+        table = None
+        move_ordering = False
+    
+    path, visited_nodes = ida_star(
+        start_key, goal_key, compiled, heuristic, start_time, time_limit,
+        table=table, endgame=endgame, move_ordering=move_ordering, stats=stats, checkpoint=checkpoint
+    )
+    return path, visited_nodes, time.time() - start_time
 
-def ida_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30):
+def fringe_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, endgame_depth=ENDGAME_DEPTH):
     """
-    IDA* Search algorithm for 3x3 Rubik's cube
+    Fringe Search algorithm for 3x3 Rubik's cube
+    
+    Same threshold iterations and optimal solutions as IDA*, but the nodes
+    whose f exceeded the threshold are kept on a list and the next iteration
+    resumes from them instead of the root (see RubikState.fringe_search).
+    Every visited state is cached with its g, so nothing below the old
+    threshold is expanded twice, at the price of memory like A*.
     
     Args:
         start_state: Starting state (RubikState)
         goal_state: Goal state (default is SOLVED_STATE_3x3)
         moves_dict: Dictionary of moves (default is MOVES_3x3)
         time_limit: Time limit in seconds (default is 30)
+        endgame_depth: Depth of the endgame table (RubikState.endgame) giving exact
+                       distances near solved, 0 disables it (default is ENDGAME_DEPTH)
     
     Returns:
         tuple: (path, nodes_visited, time_taken)
@@ -340,81 +729,273 @@ def ida_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limi
     goal_state = goal_state or SOLVED_STATE_3x3
     moves_dict = moves_dict or MOVES_3x3
     
+    endgame = _endgame_table(goal_state, moves_dict, endgame_depth)
+    
     start_time = time.time()
-    visited_nodes = 0
-    threshold = heuristic_3x3(start_state)
-    
-    while time.time() - start_time < time_limit:
-        visited = set()
-        path, found, new_threshold, nodes = _dfs_with_limit_3x3(
-            start_state, goal_state, [], 0, threshold, visited, 
-            moves_dict, start_time, time_limit
-        )
-        visited_nodes += nodes
-        
-        if found:
-            return path, visited_nodes, time.time() - start_time
-        
-        if new_threshold == float('inf'):
-            return None, visited_nodes, time.time() - start_time
-        
-        threshold = new_threshold
+    compiled = get_compiled_moves(moves_dict)
+    start_key = compiled.encode(start_state)
+    heuristic = make_heuristic(compiled, start_key)
+    
+    path, visited_nodes = fringe_search(
+        start_key, compiled.encode(goal_state), compiled, heuristic, start_time, time_limit,
+        endgame=endgame
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def batched_ida_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30,
+                                batch=BATCH_NODES, use_pdb=True, stats=None):
+    """
+    Batched IDA* Search algorithm for 3x3 Rubik's cube
+    
+    Same threshold iterations and solution lengths as ida_star_search_3x3, but
+    the bounded tree is expanded batch by batch as NumPy arrays of cubie
+    values: moves are gathers, pruning and h are table lookups over the whole
+    batch (see RubikState.batched_ida). Much higher nodes/sec than the
+    node-by-node search, without a transposition table.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        batch: Parents expanded per batch, bounds the memory (default is BATCH_NODES)
+        use_pdb: Raise h with the pattern databases of the optimal solver
+                 (MOVES_3x3 only, built on first use, which is not counted
+                 against time_limit) (default is True)
+        stats: Optional dict, filled with iterations and nodes_per_second
+               (default prints them in one line)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
     
-    return None, visited_nodes, time.time() - start_time
+    tables = None
+    if use_pdb:
+        if moves_dict is not MOVES_3x3:
+            raise ValueError("Pattern databases need MOVES_3x3")
+        tables = get_korf_tables("qtm")
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    
+    path, visited_nodes, search_stats = batched_ida_star(
+        compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit,
+        tables=tables, batch=batch
+    )
+    if stats is None:
+        print(f"Batched IDA*: {search_stats['iterations']} iterations, "
+              f"{search_stats['nodes_per_second']:.0f} nodes/s")
+    else:
+        stats.update(search_stats)
+    return path, visited_nodes, time.time() - start_time
 
-def _dfs_with_limit_3x3(state, goal_state, path, g, threshold, visited, moves_dict, start_time, time_limit):
+def parallel_ida_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, workers=None,
+                                 split_depth=3):
     """
-    Helper function for IDA* search for 3x3, performs depth-first search up to a limit
+    Parallel IDA* Search algorithm for 3x3 Rubik's cube
+    
+    Each IDA* iteration is split into the canonical paths of the first
+    split_depth moves, and the subtrees below them are searched by a pool of
+    worker processes (see RubikState.parallel_search). The first solution
+    found stops the other workers; it is optimal like the one of IDA*.
     
     Args:
-        state: Current state
-        goal_state: Target state
-        path: Current path
-        g: Current cost
-        threshold: Current f-value threshold
-        visited: Set of visited states
-        moves_dict: Dictionary of moves
-        start_time: Start time of the search
-        time_limit: Time limit for the search
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        workers: Number of worker processes (default is the number of CPUs)
+        split_depth: Length of the path prefixes handed to the workers (default is 3)
     
     Returns:
-        tuple: (path, found, new_threshold, nodes_visited)
+        tuple: (path, nodes_visited, time_taken)
     """
-    if time.time() - start_time >= time_limit:
-        return None, False, float('inf'), 0
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
     
-    if state == goal_state:
-        return path, True, threshold, 1
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
     
-    visited.add(state)
-    nodes_visited = 1
+    path, visited_nodes = parallel_ida_star(
+        compiled.encode(start_state), compiled.encode(goal_state), moves_dict, start_time, time_limit,
+        workers=workers, split_depth=split_depth
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def distributed_ida_star_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, workers=2,
+                                    remote_workers=0, host="127.0.0.1", port=0, split_depth=3):
+    """
+    Distributed IDA* Search algorithm for 3x3 Rubik's cube
     
-    f = g + heuristic_3x3(state)
-    if f > threshold:
-        return None, False, f, nodes_visited
+    A coordinator sends the path prefixes of each IDA* iteration to workers
+    over TCP and balances them by work stealing (see
+    RubikState.distributed_search). Workers are processes on this machine,
+    plus remote_workers started on other hosts with
+    python -m RubikState.distributed_search HOST PORT.
     
-    min_threshold = float('inf')
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        workers: Worker processes started on this machine (default is 2)
+        remote_workers: Workers expected from other hosts (default is 0)
+        host: Address the coordinator listens on (default is "127.0.0.1")
+        port: Port the coordinator listens on, 0 picks a free one (default is 0)
+        split_depth: Length of the path prefixes sent as tasks (default is 3)
     
-    for move in moves_dict:
-        new_state = state.apply_move(move, moves_dict)
-        if new_state in visited:
-            continue
-            
-        new_path, found, new_threshold, nodes = _dfs_with_limit_3x3(
-            new_state, goal_state, path + [move], g + 1, threshold, visited.copy(), 
-            moves_dict, start_time, time_limit
-        )
-        
-        nodes_visited += nodes
-        
-        if found:
-            return new_path, True, threshold, nodes_visited
-            
-        if new_threshold < min_threshold:
-            min_threshold = new_threshold
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    start_time = time.time()
+    path, visited_nodes = distributed_ida_star(
+        start_state, goal_state, moves_dict, start_time, time_limit, workers=workers,
+        remote_workers=remote_workers, host=host, port=port, split_depth=split_depth
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def kociemba_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, target_length=20,
+                        improve_time=0.5):
+    """
+    Kociemba two-phase algorithm for 3x3 Rubik's cube
+    
+    Phase 1 reaches the subgroup <U, D, L2, R2, F2, B2>, phase 2 solves the
+    cube inside it (see RubikState.kociemba). The search keeps looking for
+    shorter solutions until one has at most target_length face turns, or
+    improve_time seconds have passed since the start. Solutions are not
+    optimal, but arbitrary states are solved in about 20 face turns. The
+    tables are built on first use, which is not counted against time_limit.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state, must be SOLVED_STATE_3x3 (default)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        target_length: Face turns (half turns count as one) to stop at (default is 20)
+        improve_time: Seconds after which the best solution found is returned (default is 0.5)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+               Half turns appear as two quarter turns in the path
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    if goal_state != SOLVED_STATE_3x3:
+        raise ValueError("Kociemba solver only solves to SOLVED_STATE_3x3")
+    
+    if moves_dict is MOVES_3x3:
+        tables = get_kociemba_tables()
+    else:
+        tables = KociembaTables(moves_dict)
+    
+    start_time = time.time()
+    turns, visited_nodes = kociemba_solve(
+        start_state, tables, start_time, time_limit, target_length=target_length, improve_time=improve_time
+    )
+    path = face_turns_to_moves(turns) if turns is not None else None
+    return path, visited_nodes, time.time() - start_time
+
+def thistlethwaite_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30):
+    """
+    Thistlethwaite four-phase algorithm for 3x3 Rubik's cube
+    
+    Each phase moves the cube into a smaller subgroup by following a small
+    precomputed distance table (see RubikState.thistlethwaite), so a solve
+    is a few hundred table lookups. Solutions are around 30-45 face turns.
+    The tables are built on first use, which is not counted against time_limit.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state, must be SOLVED_STATE_3x3 (default)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+               nodes_visited counts table lookups, half turns appear as two quarter turns
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    if goal_state != SOLVED_STATE_3x3:
+        raise ValueError("Thistlethwaite solver only solves to SOLVED_STATE_3x3")
+    
+    if moves_dict is MOVES_3x3:
+        tables = get_thistlethwaite_tables()
+    else:
+        tables = ThistlethwaiteTables(moves_dict)
+    
+    start_time = time.time()
+    turns, visited_nodes = thistlethwaite_solve(start_state, tables, start_time, time_limit)
+    path = face_turns_to_moves(turns) if turns is not None else None
+    return path, visited_nodes, time.time() - start_time
+
+def optimal_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, metric="qtm",
+                       progress=None, inverse_lookups=True, checkpoint_file=None,
+                       checkpoint_interval=CHECKPOINT_INTERVAL):
+    """
+    Korf's optimal solver for 3x3 Rubik's cube
+    
+    IDA* over integer coordinates with the maximum of a corner pattern
+    database and two 6-edge pattern databases, also looked up on the inverse
+    state (see RubikState.korf). The solution is minimal in the chosen metric.
+    The databases are built on first use (a minute or two, then cached on disk);
+    that time is not counted against time_limit.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state, must be SOLVED_STATE_3x3 (default)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds for the search (default is 30)
+        metric: "qtm" (quarter turns) or "htm" (half turns count as one move) (default is "qtm")
+        progress: Callback progress(threshold, nodes, elapsed) called at each
+                  IDA* iteration (default prints one line per iteration)
+        inverse_lookups: Also use the edge databases on the inverse state (default is True)
+        checkpoint_file: Optional file receiving the threshold and the position in the
+                         iteration every checkpoint_interval seconds and on a timeout; a
+                         later call with the same arguments resumes from it (default is None)
+        checkpoint_interval: Seconds between two checkpoints (default is CHECKPOINT_INTERVAL)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+               Half turns appear as two quarter turns in the path
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    if goal_state != SOLVED_STATE_3x3:
+        raise ValueError("Optimal solver only solves to SOLVED_STATE_3x3")
+    
+    if moves_dict is MOVES_3x3:
+        tables = get_korf_tables(metric)
+    else:
+        tables = KorfTables(metric, moves_dict)
+    start_time = time.time()
     
-    visited.remove(state)  # Backtrack
-    return None, False, min_threshold, nodes_visited
+    if progress is None:
+        def progress(threshold, nodes, elapsed):
+            print(f"Optimal search: depth {threshold}, {nodes} nodes, {elapsed:.1f}s")
+    
+    checkpoint = None
+    if checkpoint_file:
+        checkpoint = Checkpoint(checkpoint_file, "korf_ida_star",
+                                (metric, tables.coordinates(start_state), inverse_lookups), checkpoint_interval)
+    
+    moves, visited_nodes = korf_ida_star(
+        start_state, tables, time.time(), time_limit, progress=progress, inverse_lookups=inverse_lookups,
+        checkpoint=checkpoint
+    )
+    path = korf_moves_to_names(moves) if moves is not None else None
+    return path, visited_nodes, time.time() - start_time
 
 def hill_climbing_max_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, max_iterations=1000):
     """
@@ -556,6 +1137,110 @@ def hill_climbing_random_search_3x3(start_state, goal_state=None, moves_dict=Non
     # No path found
     return None, nodes_visited, time.time() - start_time
 
+def local_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, method="annealing",
+                     seed=None, use_pdb=True, **options):
+    """
+    Local search for 3x3 Rubik's cube
+    
+    A batch of walkers climbs towards the goal with random restarts, simulated
+    annealing or tabu search (see RubikState.local_search). Memory stays
+    constant and the search keeps going until the time limit instead of
+    stopping at the first plateau, but solutions are long and not optimal.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        method: "random_restart" (hill climbing with random restarts), "annealing"
+                (simulated annealing) or "tabu" (tabu search) (default is "annealing")
+        seed: Seed of the random generator (default is None)
+        use_pdb: Score states with the pattern databases of the optimal solver
+                 (MOVES_3x3 only, built on first use, which is not counted against
+                 time_limit), otherwise count misplaced and misoriented cubies
+                 (default is True)
+        **options: Parameters of the chosen strategy (walkers, max_steps, cooling, tenure...)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken)
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    searches = {
+        "random_restart": random_restart_hill_climbing,
+        "annealing": simulated_annealing,
+        "tabu": tabu_search,
+    }
+    if method not in searches:
+        raise ValueError(f"Unknown local search method: {method}")
+    
+    if use_pdb:
+        if moves_dict is not MOVES_3x3:
+            raise ValueError("Pattern database score needs MOVES_3x3")
+        options.setdefault("score_batch", pdb_score_batch(get_korf_tables("qtm")))
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    path, visited_nodes = searches[method](
+        compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit,
+        seed=seed, **options
+    )
+    return path, visited_nodes, time.time() - start_time
+
+def genetic_search_3x3(start_state, goal_state=None, moves_dict=None, time_limit=30, population=1000,
+                       length=40, generations=None, seed=None, use_pdb=True, stats=None):
+    """
+    Genetic algorithm for 3x3 Rubik's cube
+    
+    Evolves fixed-length move sequences with tournament selection, one-point
+    crossover, mutation and elitism; the whole population is played and
+    scored as one NumPy batch per generation (see RubikState.genetic).
+    Solutions are long and not optimal.
+    
+    Args:
+        start_state: Starting state (RubikState)
+        goal_state: Goal state (default is SOLVED_STATE_3x3)
+        moves_dict: Dictionary of moves (default is MOVES_3x3)
+        time_limit: Time limit in seconds (default is 30)
+        population: Sequences per generation (default is 1000)
+        length: Moves per sequence (default is 40)
+        generations: Maximum number of generations, None runs until the time limit (default is None)
+        seed: Seed of the random generator (default is None)
+        use_pdb: Score states with the pattern databases of the optimal solver
+                 (MOVES_3x3 only, built on first use, which is not counted against
+                 time_limit), otherwise count misplaced and misoriented cubies
+                 (default is True)
+        stats: Optional dict, filled with generations, best_score and sequences_per_second
+               (default prints them in one line)
+    
+    Returns:
+        tuple: (path, nodes_visited, time_taken), nodes_visited being the evaluated sequences
+    """
+    # Set defaults if not provided
+    goal_state = goal_state or SOLVED_STATE_3x3
+    moves_dict = moves_dict or MOVES_3x3
+    
+    score = None
+    if use_pdb:
+        if moves_dict is not MOVES_3x3:
+            raise ValueError("Pattern database score needs MOVES_3x3")
+        score = pdb_score_batch(get_korf_tables("qtm"))
+    
+    start_time = time.time()
+    compiled = get_compiled_moves(moves_dict)
+    path, evaluated, search_stats = genetic_search(
+        compiled.encode(start_state), compiled.encode(goal_state), compiled, start_time, time_limit,
+        population=population, length=length, generations=generations, seed=seed, score_batch=score
+    )
+    if stats is None:
+        print(f"GA: {search_stats['generations']} generations, "
+              f"{search_stats['sequences_per_second']:.0f} sequences/s")
+    else:
+        stats.update(search_stats)
+    return path, evaluated, time.time() - start_time
+
 def solve_3x3(start_state, algorithm="a_star", time_limit=30):
     """
     Main function to solve a 3x3 Rubik's cube with the specified algorithm
@@ -575,20 +1260,59 @@ def solve_3x3(start_state, algorithm="a_star", time_limit=30):
         return a_star_search_3x3(start_state, time_limit=time_limit)
     elif algorithm.lower() == "bfs":
         return bfs_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "external_bfs":
+        with tempfile.TemporaryDirectory(prefix="rubik_bfs_") as directory:
+            return bfs_search_3x3(start_state, time_limit=time_limit, external_dir=directory)
+    elif algorithm.lower() == "bidirectional_bfs" or algorithm.lower() == "bibfs":
+        return bidirectional_bfs_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "mm":
+        return mm_search_3x3(start_state, time_limit=time_limit)
     elif algorithm.lower() == "dfs":
         return dfs_search_3x3(start_state, time_limit=time_limit)
     elif algorithm.lower() == "ucs":
         return ucs_search_3x3(start_state, time_limit=time_limit)
     elif algorithm.lower() == "greedy":
         return greedy_best_first_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "weighted_a_star":
+        return weighted_a_star_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "ara_star":
+        return ara_star_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "epea_star":
+        return a_star_search_3x3(start_state, time_limit=time_limit, partial_expansion=True)
+    elif algorithm.lower() == "sma_star":
+        return sma_star_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "beam" or algorithm.lower() == "beam_search":
+        return beam_search_3x3(start_state, time_limit=time_limit)
     elif algorithm.lower() == "ids":
         return ids_search_3x3(start_state, time_limit=time_limit)
     elif algorithm.lower() == "ida_star":
         return ida_star_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "fringe" or algorithm.lower() == "fringe_search":
+        return fringe_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "batched_ida_star":
+        return batched_ida_star_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "parallel_ida_star":
+        return parallel_ida_star_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "distributed_ida_star":
+        return distributed_ida_star_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "kociemba":
+        return kociemba_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "thistlethwaite":
+        return thistlethwaite_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "optimal":
+        return optimal_search_3x3(start_state, time_limit=time_limit)
     elif algorithm.lower() == "hill_climbing" or algorithm.lower() == "hill_max":
         return hill_climbing_max_search_3x3(start_state, time_limit=time_limit)
     elif algorithm.lower() == "hill_random":
         return hill_climbing_random_search_3x3(start_state, time_limit=time_limit)
+    elif algorithm.lower() == "random_restart":
+        return local_search_3x3(start_state, time_limit=time_limit, method="random_restart")
+    elif algorithm.lower() == "simulated_annealing" or algorithm.lower() == "annealing":
+        return local_search_3x3(start_state, time_limit=time_limit, method="annealing")
+    elif algorithm.lower() == "tabu" or algorithm.lower() == "tabu_search":
+        return local_search_3x3(start_state, time_limit=time_limit, method="tabu")
+    elif algorithm.lower() == "genetic" or algorithm.lower() == "ga":
+        return genetic_search_3x3(start_state, time_limit=time_limit)
     else:
         print(f"Unknown algorithm: {algorithm}, using A* instead")
         return a_star_search_3x3(start_state, time_limit=time_limit)
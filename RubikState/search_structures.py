@@ -0,0 +1,205 @@
+"""
+Shared data structures for the Rubik's cube search algorithms
+
+These containers are used by both the 2x2 and the 3x3 solvers.
+"""
+
+import heapq
+from array import array
+from collections import deque
+
+class NodeArena:
+    """
+    Struct-of-arrays storage for search nodes.
+
+    Every generated node gets an integer index. The arena keeps the parent
+    index, the index of the move that produced the node and its g-value in
+    compact typed arrays, so queue entries only need to carry the index and
+    the path is rebuilt once, when the goal is reached.
+    """
+    def __init__(self):
+        self.parent = array('i')  # Parent node index (-1 for the root)
+        self.move = array('b')    # Index of the last move in move_names (-1 for the root)
+        self.g = array('i')       # Path cost from the root
+        self.states = []          # State stored at each node
+
+    def __len__(self):
+        return len(self.states)
+
+    def add(self, state, parent=-1, move=-1, g=0):
+        """
+        Store a new node and return its index
+
+        Args:
+            state: State of the node
+            parent: Index of the parent node (-1 for the root)
+            move: Index of the move applied to the parent (-1 for the root)
+            g: Path cost from the root
+
+        Returns:
+            int: Index of the new node
+        """
+        self.parent.append(parent)
+        self.move.append(move)
+        self.g.append(g)
+        self.states.append(state)
+        return len(self.states) - 1
+
+    def path(self, node, move_names):
+        """
+        Rebuild the move sequence from the root to a node
+
+        Args:
+            node: Index of the node
+            move_names: List of move names indexed by the stored move indices
+
+        Returns:
+            list: Move names from the root to the node
+        """
+        moves = []
+        parent = self.parent
+        move = self.move
+        while parent[node] != -1:
+            moves.append(move_names[move[node]])
+            node = parent[node]
+        moves.reverse()
+        return moves
+
+class BucketQueue:
+    """
+    Priority queue for small non-negative integer priorities.
+
+    Items are kept in one bucket per priority value, so push and pop are
+    O(1) amortized and never compare items. The order inside a bucket is:
+    - "lifo": most recently pushed item first
+    - "fifo": oldest item first
+    - "high_g": item with the highest g first (LIFO among equal g), the usual
+      A* tiebreak since deeper nodes with the same f are closer to the goal
+    - "key": item with the smallest key first (a heap per bucket). Greedy
+      best-first search uses hash(state) as the key: its heuristic has few
+      distinct values, and taking either end of a bucket keeps expanding one
+      family of similar states, while the hash order spreads the search
+    """
+    def __init__(self, order="lifo"):
+        if order not in ("lifo", "fifo", "high_g", "key"):
+            raise ValueError(f"Unknown bucket order: {order}")
+        self.order = order
+        self._buckets = []  # priority -> bucket (list, deque, or list of lists by g)
+        self._min = 0       # No non-empty bucket below this priority
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def push(self, priority, item, g=0, key=0):
+        """
+        Add an item
+
+        Args:
+            priority: Non-negative integer priority (lower is popped first)
+            item: Item to store
+            g: Depth of the item, only used by the "high_g" order
+            key: Tiebreak of the item, only used by the "key" order
+        """
+        buckets = self._buckets
+        while len(buckets) <= priority:
+            buckets.append(deque() if self.order == "fifo" else [])
+        if self.order == "high_g":
+            bucket = buckets[priority]
+            while len(bucket) <= g:
+                bucket.append([])
+            bucket[g].append(item)
+        elif self.order == "key":
+            heapq.heappush(buckets[priority], (key, item))
+        else:
+            buckets[priority].append(item)
+        if priority < self._min:
+            self._min = priority
+        self._size += 1
+
+    def pop(self):
+        """
+        Remove and return an item with the lowest priority
+
+        Returns:
+            tuple: (priority, item)
+        """
+        if not self._size:
+            raise IndexError("pop from empty BucketQueue")
+        buckets = self._buckets
+        priority = self._min
+        if self.order == "high_g":
+            while True:
+                bucket = buckets[priority]
+                while bucket and not bucket[-1]:
+                    bucket.pop()
+                if bucket:
+                    break
+                priority += 1
+            item = bucket[-1].pop()
+        else:
+            while not buckets[priority]:
+                priority += 1
+            if self.order == "fifo":
+                item = buckets[priority].popleft()
+            elif self.order == "key":
+                item = heapq.heappop(buckets[priority])[1]
+            else:
+                item = buckets[priority].pop()
+        self._min = priority
+        self._size -= 1
+        return priority, item
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table for the iterative-deepening searches.
+
+    Entries are addressed by a 64-bit state hash (hash(key) of the encoded
+    state) and live in parallel typed arrays, so the memory used is fixed at
+    construction and never grows. Each entry keeps:
+    - the smallest g at which the state was reached in the current iteration,
+      with the move pruning context it was reached in
+    - a backed-up lower bound on the remaining cost, valid for that context,
+      which survives from one iteration to the next
+
+    Replacement is depth-preferred: an entry of the current iteration is only
+    overwritten by a node with the same or a smaller g (a larger subtree).
+    """
+    ENTRY_BYTES = 13  # hash 8 + g 1 + bound 1 + ctx 1 + iteration 2
+
+    def __init__(self, max_bytes):
+        """
+        Args:
+            max_bytes: Hard cap on the memory used by the entries
+        """
+        slots = 1
+        while slots * 2 * self.ENTRY_BYTES <= max_bytes:
+            slots *= 2
+        if slots * self.ENTRY_BYTES > max_bytes:
+            raise ValueError(f"Transposition table needs at least {self.ENTRY_BYTES} bytes")
+        self.mask = slots - 1
+        self.hashes = array('q', bytes(8 * slots))
+        self.g = array('B', bytes(slots))
+        self.bound = array('B', bytes(slots))
+        self.ctx = array('B', bytes(slots))
+        self.stamp = array('H', bytes(2 * slots))  # Iteration of the entry, 0 = empty
+        self.iteration = 0
+
+    def __len__(self):
+        return self.mask + 1
+
+    @property
+    def memory_bytes(self):
+        """Bytes used by the entry arrays"""
+        return len(self) * self.ENTRY_BYTES
+
+    def new_iteration(self):
+        """Start a new iteration: g-values stored so far stop pruning, bounds are kept"""
+        self.iteration += 1
+        if self.iteration > 0xFFFF:
+            # Stamp overflow: restart numbering, old entries become empty
+            self.stamp = array('H', bytes(2 * len(self)))
+            self.iteration = 1
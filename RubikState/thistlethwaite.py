@@ -0,0 +1,253 @@
+"""
+Thistlethwaite four-phase solver for the 3x3 Rubik's cube
+
+The cube goes through the nested subgroups
+    G0 = <L, R, F, B, U, D>
+    G1 = <L2, R2, F, B, U, D>       edges oriented
+    G2 = <L2, R2, F2, B2, U, D>     corners oriented, E-slice edges in the E slice
+    G3 = <L2, R2, F2, B2, U2, D2>   corners in their half-turn orbit, M/S-slice edges in their slice
+    G4 = solved
+Edge orientation in MOVES_3x3 is flipped by L and R quarter turns, so the
+quarter turns are dropped in the order L/R, then F/B, then U/D.
+
+Each phase has a distance table indexed by its coordinate, built once by a
+breadth-first search from the phase goal. Solving a phase only needs table
+lookups: any move that lowers the distance is played until it reaches 0, so
+a solve costs a few hundred lookups and gives about 45 face turns.
+"""
+
+import os
+import time
+from itertools import combinations, permutations
+
+import numpy as np
+
+from RubikState.coordinates import permutation_rank, permutation_rank_batch
+from RubikState.kociemba import (
+    N_MOVES, N_SLICE, FACES, face_turn_arrays, distance_table, twist_move_table,
+    flip_move_table, slice_move_table, face_turns_to_moves, load_table_file, save_table_file
+)
+from RubikState.rubik_chen import MOVES_3x3
+
+# Move index = face * 3 + (power - 1), faces U, D, L, R, F, B (see kociemba)
+PHASE_MOVES = (
+    tuple(range(N_MOVES)),                            # G0 -> G1
+    (0, 1, 2, 3, 4, 5, 7, 10, 12, 13, 14, 15, 16, 17),  # G1 -> G2
+    (0, 1, 2, 3, 4, 5, 7, 10, 13, 16),                # G2 -> G3
+    (1, 4, 7, 10, 13, 16),                            # G3 -> G4
+)
+
+# Slots of the M-slice edges (UF, UB, DF, DB), S-slice edges (UR, UL, DR, DL), E-slice edges
+M_SLOTS = (1, 3, 5, 7)
+S_SLOTS = (0, 2, 4, 6)
+E_SLOTS = (8, 9, 10, 11)
+
+N_CORNER_COSET = 420
+N_EDGE_LABEL = 70
+N_HALF_TURN_CORNERS = 96
+
+DEFAULT_TABLE_FILE = os.path.join(os.path.dirname(__file__), "thistlethwaite_tables.npz")
+
+def _half_turn_corner_group(turns):
+    """Corner permutations reachable with half turns only, identity first"""
+    identity = tuple(range(8))
+    group = [identity]
+    seen = {identity}
+    for cp in group:
+        for m in PHASE_MOVES[3]:
+            move_cp = turns[m][0]
+            new_cp = tuple(cp[i] for i in move_cp)
+            if new_cp not in seen:
+                seen.add(new_cp)
+                group.append(new_cp)
+    return group
+
+class ThistlethwaiteTables:
+    """
+    Distance tables of the four phases and the maps used to compute their coordinates
+
+    Phase coordinates:
+    1. flip (2048)
+    2. twist (2187) * UD-slice (495)
+    3. corner coset of the half-turn corner group (420) * M-slice edge slots (70)
+    4. corner permutation in the half-turn group (96) * M, S, E slice permutations (24 each)
+    """
+    def __init__(self, moves_dict=None, filename=None):
+        self.moves_dict = moves_dict or MOVES_3x3
+        self.filename = filename
+
+        arrays = load_table_file(filename) if filename else None
+        if arrays is None:
+            arrays = self._build()
+            if filename:
+                save_table_file(filename, arrays)
+
+        self.distances = [arrays[f"phase{i}_distance"].tobytes() for i in range(1, 5)]
+        self.slice_index = arrays["slice_index"].tolist()
+        self.corner_coset = arrays["corner_coset"].tolist()
+        self.edge_label = arrays["edge_label"].tolist()
+        self.half_turn_corner = arrays["half_turn_corner"].tolist()
+
+    @property
+    def memory_bytes(self):
+        """Bytes used by the distance tables"""
+        return sum(len(table) for table in self.distances)
+
+    def _build(self):
+        """Build the tables with a breadth-first search over move tables of each phase"""
+        turns = face_turn_arrays(self.moves_dict)
+        perms8 = np.array(list(permutations(range(8))), dtype=np.int8)
+        perms4 = np.array(list(permutations(range(4))), dtype=np.int8)
+
+        # Phase 1: flip only
+        flip_move = flip_move_table(turns)
+        phase1_distance = distance_table(flip_move, np.zeros((1, N_MOVES), dtype=np.int8), 0, PHASE_MOVES[0])
+
+        # Phase 2: twist * UD-slice
+        slice_move, slice_index, slice_solved = slice_move_table(turns)
+        phase2_distance = distance_table(twist_move_table(turns), slice_move, slice_solved, PHASE_MOVES[1])
+
+        # Phase 3 corners: right coset H * cp of the half-turn corner group H,
+        # labelled by the smallest rank of h[cp] over h in H, so moves act on labels
+        group = np.array(_half_turn_corner_group(turns), dtype=np.int8)
+        coset_rank = np.min(np.stack([permutation_rank_batch(h[perms8]) for h in group]), axis=0)
+        representatives, corner_coset = np.unique(coset_rank, return_inverse=True)
+        corner_coset = corner_coset.astype(np.int16)
+        coset_move = np.stack([
+            corner_coset[permutation_rank_batch(perms8[representatives][:, cp])] for cp, _, _, _ in turns
+        ], axis=1)
+
+        # Phase 3 edges: which of the slots 0..7 hold M-slice edges
+        combos = list(combinations(range(8), 4))
+        occupied = np.zeros((N_EDGE_LABEL, 8), dtype=np.int64)
+        for i, combo in enumerate(combos):
+            occupied[i, list(combo)] = 1
+        bit_weights = 1 << np.arange(8)
+        edge_label = np.full(1 << 8, -1, dtype=np.int16)
+        edge_label[occupied @ bit_weights] = np.arange(N_EDGE_LABEL)
+        label_move = np.zeros((N_EDGE_LABEL, N_MOVES), dtype=np.int16)
+        for m in PHASE_MOVES[2]:
+            label_move[:, m] = edge_label[occupied[:, turns[m][2][:8]] @ bit_weights]
+        phase3_goal = (int(corner_coset[0]) * N_EDGE_LABEL +
+                       int(edge_label[sum(1 << slot for slot in M_SLOTS)]))
+        phase3_distance = distance_table(coset_move, label_move, phase3_goal, PHASE_MOVES[2])
+
+        # Phase 4: index in H * slice permutations, (corner, M) by (S, E)
+        half_turn_corner = np.full(len(perms8), -1, dtype=np.int16)
+        half_turn_corner[permutation_rank_batch(group)] = np.arange(N_HALF_TURN_CORNERS)
+        corner_move = np.zeros((N_HALF_TURN_CORNERS, N_MOVES), dtype=np.int32)
+        slice_moves = [np.zeros((24, N_MOVES), dtype=np.int32) for _ in range(3)]
+        for m in PHASE_MOVES[3]:
+            cp, _, ep, _ = turns[m]
+            corner_move[:, m] = half_turn_corner[permutation_rank_batch(group[:, cp])]
+            for table, slots in zip(slice_moves, (M_SLOTS, S_SLOTS, E_SLOTS)):
+                # Position inside the slice read by each slot of the slice
+                local = [slots.index(ep[slot]) for slot in slots]
+                table[:, m] = permutation_rank_batch(perms4[:, local])
+        m_move, s_move, e_move = slice_moves
+        corner_m_move = (corner_move[:, None, :] * 24 + m_move[None, :, :]).reshape(-1, N_MOVES)
+        s_e_move = (s_move[:, None, :] * 24 + e_move[None, :, :]).reshape(-1, N_MOVES)
+        phase4_distance = distance_table(corner_m_move, s_e_move, 0, PHASE_MOVES[3])
+
+        return {
+            "phase1_distance": phase1_distance,
+            "phase2_distance": phase2_distance,
+            "phase3_distance": phase3_distance,
+            "phase4_distance": phase4_distance,
+            "slice_index": slice_index,
+            "corner_coset": corner_coset,
+            "edge_label": edge_label,
+            "half_turn_corner": half_turn_corner,
+        }
+
+    def coordinate(self, phase, state):
+        """
+        Coordinate of a RubikState in the distance table of a phase
+
+        Args:
+            phase: Phase number 1..4
+            state: RubikState, already in the starting subgroup of the phase
+
+        Returns:
+            int: Index into distances[phase - 1]
+        """
+        if phase == 1:
+            flip = 0
+            for value in state.eo[:11]:
+                flip = flip * 2 + value
+            return flip
+        if phase == 2:
+            twist = 0
+            for value in state.co[:7]:
+                twist = twist * 3 + value
+            mask = 0
+            for slot, edge in enumerate(state.ep):
+                if edge >= 8:
+                    mask |= 1 << slot
+            return twist * N_SLICE + self.slice_index[mask]
+        if phase == 3:
+            mask = 0
+            for slot in range(8):
+                if state.ep[slot] in M_SLOTS:
+                    mask |= 1 << slot
+            return (self.corner_coset[permutation_rank(state.cp)] * N_EDGE_LABEL +
+                    self.edge_label[mask])
+        index = self.half_turn_corner[permutation_rank(state.cp)]
+        for slots in (M_SLOTS, S_SLOTS, E_SLOTS):
+            index = index * 24 + permutation_rank([slots.index(state.ep[slot]) for slot in slots])
+        return index
+
+_tables = None
+
+def get_thistlethwaite_tables():
+    """Return the tables for MOVES_3x3, loading or building them on first use"""
+    global _tables
+    if _tables is None:
+        _tables = ThistlethwaiteTables(MOVES_3x3, DEFAULT_TABLE_FILE)
+    return _tables
+
+def thistlethwaite_solve(state, tables, start_time, time_limit):
+    """
+    Solve the four phases by descending their distance tables
+
+    Args:
+        state: RubikState to solve
+        tables: ThistlethwaiteTables
+        start_time: time.time() at the start of the solve
+        time_limit: Time limit in seconds
+
+    Returns:
+        tuple: (list of (face, power) or None, number of table lookups)
+    """
+    deadline = start_time + time_limit
+    moves_dict = tables.moves_dict
+    turns = []
+    lookups = 0
+
+    for phase in range(1, 5):
+        distances = tables.distances[phase - 1]
+        distance = distances[tables.coordinate(phase, state)]
+        lookups += 1
+        if distance == 255:
+            # Not reachable: the state is not a valid cube position
+            return None, lookups
+        while distance > 0:
+            if time.time() >= deadline:
+                return None, lookups
+            # The tables hold exact distances, so some move always lowers the
+            # distance; a turn of the face just turned is merged into that turn
+            for m in PHASE_MOVES[phase - 1]:
+                face, power = FACES[m // 3], m % 3 + 1
+                new_state = state
+                for name in face_turns_to_moves([(face, power)]):
+                    new_state = new_state.apply_move(name, moves_dict)
+                new_distance = distances[tables.coordinate(phase, new_state)]
+                lookups += 1
+                if new_distance < distance:
+                    state, distance = new_state, new_distance
+                    if turns and turns[-1][0] == face:
+                        power = (turns.pop()[1] + power) % 4
+                    if power:
+                        turns.append((face, power))
+                    break
+    return turns, lookups
@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+from RubikState.rubik_chen import SOLVED_STATE_3x3, MOVES_3x3
+
+def scramble_state(length, seed, solved=SOLVED_STATE_3x3, moves_dict=MOVES_3x3):
+    """State after length random moves, seed being an int or a random.Random"""
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+    names = list(moves_dict.keys())
+    state = solved
+    for _ in range(length):
+        state = state.apply_move(rng.choice(names), moves_dict)
+    return state
+
+def solves_state(state, path, solved=SOLVED_STATE_3x3, moves_dict=MOVES_3x3):
+    """True if path takes state to solved"""
+    for move in path:
+        state = state.apply_move(move, moves_dict)
+    return state == solved
+
+@pytest.fixture
+def scramble():
+    return scramble_state
+
+@pytest.fixture
+def solves():
+    return solves_state
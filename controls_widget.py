@@ -215,12 +215,27 @@ class ControlsWidget(QWidget):
         optimal_layout.addWidget(self.pdb_astar_radio)
         optimal_group.setLayout(optimal_layout)
         
+        # Nhóm 5: Thuật toán hai pha (Two-Phase Algorithms)
+        two_phase_group = QGroupBox("Thuật toán hai pha\n(Two-Phase Algorithms)")
+        two_phase_layout = QVBoxLayout()
+        
+        # Tạo các radio buttons cho nhóm hai pha
+        self.kociemba_radio = QRadioButton("Kociemba (3x3)")
+        
+        # Thêm vào button group
+        self.algorithm_button_group.addButton(self.kociemba_radio, 10)
+        
+        # Thêm vào layout
+        two_phase_layout.addWidget(self.kociemba_radio)
+        two_phase_group.setLayout(two_phase_layout)
+        
         # Thêm các nhóm vào grid layout (2 hàng, 3 cột)
         algo_grid.addWidget(uninformed_group, 0, 0)
         algo_grid.addWidget(informed_group, 0, 1)
         algo_grid.addWidget(local_group, 0, 2)
         algo_grid.addWidget(optimal_group, 1, 0)
-        # Còn 2 vị trí trống ở hàng 2 cho các nhóm thuật toán khác nếu cần
+        algo_grid.addWidget(two_phase_group, 1, 1)
+        # Còn 1 vị trí trống ở hàng 2 cho các nhóm thuật toán khác nếu cần
         
         algo_layout.addLayout(algo_grid)
         
@@ -458,7 +473,8 @@ class ControlsWidget(QWidget):
             6: ("Greedy Best-First", "greedy_best_first"),
             7: ("Hill Climbing Max", "hill_climbing_max"),
             8: ("Hill Climbing Random", "hill_climbing_random"),
-            9: ("Pattern Database A*", "pdb_astar")
+            9: ("Pattern Database A*", "pdb_astar"),
+            10: ("Kociemba", "kociemba")
         }
         
         if algorithm_id not in algorithm_map:
@@ -478,7 +494,7 @@ class ControlsWidget(QWidget):
             from RubikState.rubik_solver import (
                 bfs, dfs, ucs, ids, a_star, ida_star,
                 greedy_best_first, hill_climbing_max, hill_climbing_random,
-                pdb_astar
+                pdb_astar, kociemba
             )
             
             # Ánh xạ tên thuật toán với hàm tương ứng
@@ -492,7 +508,8 @@ class ControlsWidget(QWidget):
                 "greedy_best_first": greedy_best_first,
                 "hill_climbing_max": hill_climbing_max,
                 "hill_climbing_random": hill_climbing_random,
-                "pdb_astar": pdb_astar
+                "pdb_astar": pdb_astar,
+                "kociemba": kociemba
             }
             
             # Lấy hàm thuật toán dựa trên tên
@@ -2,9 +2,12 @@ from RubikState.rubik_2x2 import Rubik2x2State, SOLVED_STATE_2x2, MOVES_2x2
 import time
 import pickle
 import os
-from collections import deque
-import heapq
 import random
+import numpy as np
+from RubikState.coordinates import permutation_rank, orientation_rank, permutation_rank_batch, orientation_rank_batch
+from RubikState.rubik_2x2 import states_to_array_2x2
+from RubikState.search_structures import NodeArena, BucketQueue
+from RubikState.checkpoint import Checkpoint, CHECKPOINT_INTERVAL
 
 class PatternDatabase:
     """
@@ -18,93 +21,106 @@ class PatternDatabase:
         # Corner orientation database (CO)
         self.co_database = {}
         
+        # Packed NumPy tables indexed by coordinate, built lazily by pack()
+        self.cp_table = None
+        self.co_table = None
+        
         self.filename = filename
         
         # Load from file if available
         if filename and os.path.exists(filename):
             self.load()
     
-    def generate_corner_permutation_database(self, max_depth=8):
+    def _bfs_database(self, kind, start_key, build, project, max_depth, checkpoint_file, checkpoint_interval):
+        """
+        Breadth-first distances of an abstract state space, layer by layer.
+        
+        Args:
+            kind: Name of the database, recorded in the checkpoint
+            start_key: Key of the solved abstract state
+            build: Function key -> Rubik2x2State
+            project: Function Rubik2x2State -> key of its abstract state
+            max_depth: Last distance to compute
+            checkpoint_file: Optional file receiving the finished layers, the BFS
+                             resumes from it and deletes it when done
+            checkpoint_interval: Seconds between two checkpoint writes
+        
+        Returns:
+            dict: key -> distance, for every key but start_key
+        """
+        database = {}
+        frontier = [start_key]
+        depth = 0
+        checkpoint = None
+        if checkpoint_file:
+            checkpoint = Checkpoint(checkpoint_file, kind, (max_depth, tuple(MOVES_2x2)), checkpoint_interval)
+            saved = checkpoint.load()
+            if saved is not None:
+                depth, frontier, database = saved["depth"], saved["frontier"], saved["database"]
+                print(f"Resuming at depth {depth} from {checkpoint_file}")
+        
+        while frontier and depth < max_depth:
+            next_frontier = []
+            for key in frontier:
+                state = build(key)
+                # Try all moves
+                for move in MOVES_2x2:
+                    new_key = project(state.apply_move(move, MOVES_2x2))
+                    if new_key != start_key and new_key not in database:
+                        database[new_key] = depth + 1
+                        next_frontier.append(new_key)
+            frontier = next_frontier
+            depth += 1
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save({"depth": depth, "frontier": frontier, "database": database})
+        
+        if checkpoint is not None:
+            checkpoint.clear()
+        return database
+    
+    def generate_corner_permutation_database(self, max_depth=8, checkpoint_file=None,
+                                             checkpoint_interval=CHECKPOINT_INTERVAL):
         """
         Generate database for corner permutation (CP).
         Ignores the orientation (CO).
+        With checkpoint_file the finished layers are saved periodically and a
+        restarted generation resumes from them.
         """
         print("Generating corner permutation database...")
         start_time = time.time()
         
-        # Start with solved state
-        start_state = SOLVED_STATE_2x2.copy()
-        
-        # Create a new state with only permutation info (set all orientations to 0)
-        perm_state = Rubik2x2State(cp=start_state.cp, co=[0] * 8)
-        
-        # BFS to generate database
-        queue = deque([(perm_state, [])])  # (state, moves)
-        visited = {perm_state: 0}  # State -> distance
-        
-        while queue:
-            state, path = queue.popleft()
-            dist = len(path)
-            
-            if dist >= max_depth:
-                continue
-            
-            # Try all moves
-            for move in MOVES_2x2:
-                new_state = state.apply_move(move, MOVES_2x2)
-                
-                # Create a new state with only permutation info 
-                perm_new_state = Rubik2x2State(cp=new_state.cp, co=[0] * 8)
-                
-                if perm_new_state not in visited:
-                    queue.append((perm_new_state, path + [move]))
-                    visited[perm_new_state] = dist + 1
-                    
-                    # Store in database - use the CP tuple as key
-                    self.cp_database[tuple(perm_new_state.cp)] = dist + 1
+        # The CP tuple is the key; a state with only permutation info has all orientations 0
+        self.cp_database = self._bfs_database(
+            "pdb_2x2_cp", tuple(SOLVED_STATE_2x2.cp),
+            lambda cp: Rubik2x2State(cp=list(cp), co=[0] * 8),
+            lambda state: tuple(state.cp),
+            max_depth, checkpoint_file, checkpoint_interval
+        )
         
+        self.cp_table = None
         print(f"Corner permutation database generated with {len(self.cp_database)} entries")
         print(f"Time: {time.time() - start_time:.2f} seconds")
     
-    def generate_corner_orientation_database(self, max_depth=8):
+    def generate_corner_orientation_database(self, max_depth=8, checkpoint_file=None,
+                                             checkpoint_interval=CHECKPOINT_INTERVAL):
         """
         Generate database for corner orientation (CO).
         Ignores the permutation (CP).
+        With checkpoint_file the finished layers are saved periodically and a
+        restarted generation resumes from them.
         """
         print("Generating corner orientation database...")
         start_time = time.time()
         
-        # Start with solved state
-        start_state = SOLVED_STATE_2x2.copy()
-        
-        # Create a new state with only orientation info (set all permutations to identity)
-        orient_state = Rubik2x2State(cp=list(range(8)), co=start_state.co)
-        
-        # BFS to generate database
-        queue = deque([(orient_state, [])])  # (state, moves)
-        visited = {orient_state: 0}  # State -> distance
-        
-        while queue:
-            state, path = queue.popleft()
-            dist = len(path)
-            
-            if dist >= max_depth:
-                continue
-            
-            # Try all moves
-            for move in MOVES_2x2:
-                new_state = state.apply_move(move, MOVES_2x2)
-                
-                # Create a new state with only orientation info
-                orient_new_state = Rubik2x2State(cp=list(range(8)), co=new_state.co)
-                
-                if orient_new_state not in visited:
-                    queue.append((orient_new_state, path + [move]))
-                    visited[orient_new_state] = dist + 1
-                    
-                    # Store in database - use the CO tuple as key
-                    self.co_database[tuple(orient_new_state.co)] = dist + 1
+        # The CO tuple is the key; a state with only orientation info has the identity permutation
+        self.co_database = self._bfs_database(
+            "pdb_2x2_co", tuple(SOLVED_STATE_2x2.co),
+            lambda co: Rubik2x2State(cp=list(range(8)), co=list(co)),
+            lambda state: tuple(state.co),
+            max_depth, checkpoint_file, checkpoint_interval
+        )
         
+        self.co_table = None
         print(f"Corner orientation database generated with {len(self.co_database)} entries")
         print(f"Time: {time.time() - start_time:.2f} seconds")
     
@@ -116,11 +132,13 @@ class PatternDatabase:
         if filename is None:
             filename = "rubik_2x2_pdb.pkl"
             
-        with open(filename, "wb") as f:
+        # Written to a temporary file first, so an interrupted save keeps the old file
+        with open(filename + ".tmp", "wb") as f:
             pickle.dump({
                 "cp_database": self.cp_database,
                 "co_database": self.co_database
             }, f)
+        os.replace(filename + ".tmp", filename)
         
         print(f"Pattern database saved to {filename}")
     
@@ -134,6 +152,8 @@ class PatternDatabase:
                 data = pickle.load(f)
                 self.cp_database = data["cp_database"]
                 self.co_database = data["co_database"]
+                self.cp_table = None
+                self.co_table = None
             
             print(f"Pattern database loaded from {filename}")
             print(f"CP database: {len(self.cp_database)} entries")
@@ -153,6 +173,64 @@ class PatternDatabase:
         
         # Return the maximum since both subproblems must be solved
         return max(cp_value, co_value)
+    
+    def pack(self):
+        """
+        Pack the dictionaries into dense int8 tables.
+        CP is indexed by permutation rank (8! entries), CO by base-3 rank (3^8 entries).
+        Missing entries default to 0, matching get_heuristic.
+        """
+        self.cp_table = np.zeros(40320, dtype=np.int8)
+        for cp, dist in self.cp_database.items():
+            self.cp_table[permutation_rank(cp)] = dist
+        
+        self.co_table = np.zeros(3 ** 8, dtype=np.int8)
+        for co, dist in self.co_database.items():
+            self.co_table[orientation_rank(co, 3)] = dist
+    
+    def get_heuristic_batch(self, states):
+        """
+        Vectorized get_heuristic.
+        
+        Args:
+            states: List of Rubik2x2State or (N, 16) array as produced by states_to_array_2x2
+            
+        Returns:
+            np.ndarray: (N,) int8 array of heuristic values
+        """
+        arr = states_to_array_2x2(states)
+        return self.get_heuristic_coords(permutation_rank_batch(arr[:, :8]),
+                                         orientation_rank_batch(arr[:, 8:16], 3))
+    
+    def get_heuristic_coords(self, cp_coords, co_coords):
+        """
+        Heuristic values for arrays of (CP rank, CO rank) coordinates, gathered with np.take.
+        """
+        if self.cp_table is None or self.co_table is None:
+            self.pack()
+        return np.maximum(np.take(self.cp_table, cp_coords), np.take(self.co_table, co_coords))
+    
+    def key_heuristic(self):
+        """
+        get_heuristic on the keys of RubikState.compiled_moves, whose key[:8] holds cp * 3 + co.
+        Admissible for searches with MOVES_2x2, the moves the databases were built with.
+        
+        Returns:
+            function: h(key, g) -> int
+        """
+        if self.cp_table is None or self.co_table is None:
+            self.pack()
+        cp_table = self.cp_table.tolist()
+        co_table = self.co_table.tolist()
+        
+        def h(key, g):
+            co = 0
+            for value in key[:8]:
+                co = co * 3 + value % 3
+            cp_value = cp_table[permutation_rank([value // 3 for value in key[:8]])]
+            co_value = co_table[co]
+            return cp_value if cp_value > co_value else co_value
+        return h
 
 def pdb_heuristic_2x2(state, pdb):
     """Heuristic function using the pattern database."""
@@ -174,39 +252,43 @@ def a_star_pdb_2x2(start_state, goal_state=None, moves_dict=None, time_limit=30,
     start_time = time.time()
     nodes_explored = 0
     
-    # Priority queue for A*: (f_value, state_hash, state, path)
+    move_names = list(moves_dict.keys())
+    
+    # Bucket queue for A*: node indices keyed by f_value, deepest node first on ties
     # f_value = g_value (path length) + h_value (heuristic)
+    arena = NodeArena()
     h_value = pdb_heuristic_2x2(start_state, pdb)
-    frontier = [(h_value, hash(start_state), start_state, [])]
+    frontier = BucketQueue(order="high_g")
+    frontier.push(h_value, arena.add(start_state))
     
-    # Dictionary to track visited states and their shortest paths
-    visited = {start_state: (0, [])}  # state -> (g_value, path)
+    # Dictionary to track visited states and their shortest path lengths
+    visited = {start_state: 0}  # state -> g_value
     
     while frontier and time.time() - start_time < time_limit:
-        f_value, _, state, path = heapq.heappop(frontier)
+        f_value, node = frontier.pop()
+        state = arena.states[node]
         nodes_explored += 1
         
-        g_value = len(path)
+        g_value = arena.g[node]
         
         # Check if we reached the goal
         if state == goal_state:
             end_time = time.time()
-            return path, nodes_explored, end_time - start_time
+            return arena.path(node, move_names), nodes_explored, end_time - start_time
         
         # Try all possible moves
-        for move in moves_dict:
+        for move_index, move in enumerate(move_names):
             new_state = state.apply_move(move, moves_dict)
             new_g_value = g_value + 1
-            new_path = path + [move]
             
             # Skip if we've seen this state with a shorter or equal path
-            if new_state in visited and visited[new_state][0] <= new_g_value:
+            if new_state in visited and visited[new_state] <= new_g_value:
                 continue
             
             # Update visited and add to frontier
-            visited[new_state] = (new_g_value, new_path)
+            visited[new_state] = new_g_value
             h_value = pdb_heuristic_2x2(new_state, pdb)
-            heapq.heappush(frontier, (new_g_value + h_value, hash(new_state), new_state, new_path))
+            frontier.push(new_g_value + h_value, arena.add(new_state, node, move_index, new_g_value), new_g_value)
     
     end_time = time.time()
     return None, nodes_explored, end_time - start_time
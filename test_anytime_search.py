@@ -0,0 +1,35 @@
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_solver_2x2 import ara_star_search_2x2, weighted_a_star_search_2x2
+from RubikState.rubik_solver_3x3 import (
+    ara_star_search_3x3, bidirectional_bfs_search_3x3, weighted_a_star_search_3x3
+)
+
+def test_weighted_a_star_solves_scrambles(scramble, solves):
+    for seed in range(3):
+        state = scramble(8, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        for weight in (2.0, 3.0):
+            path, _, _ = weighted_a_star_search_2x2(state, weight=weight, time_limit=10)
+            assert path is not None and solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
+
+        state = scramble(12, seed)
+        path, _, _ = weighted_a_star_search_3x3(state, weight=2.0, use_pdb=True, time_limit=10)
+        assert path is not None and solves(state, path)
+
+def test_ara_star_improves_solutions(scramble, solves):
+    state = scramble(8, 0, SOLVED_STATE_2x2, MOVES_2x2)
+    found = []
+    path, _, _ = ara_star_search_2x2(state, time_limit=10,
+                                     on_solution=lambda path, bound, elapsed: found.append((len(path), bound)))
+    assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
+    assert found and len(path) == found[-1][0]
+    for (length, bound), (next_length, next_bound) in zip(found, found[1:]):
+        assert next_length < length and next_bound <= bound
+
+def test_ara_star_with_pattern_databases_ends_optimal(scramble, solves):
+    # The databases are consistent, so the final search with weight 1 is optimal
+    for seed in range(3):
+        state = scramble(8, seed)
+        path, _, _ = ara_star_search_3x3(state, time_limit=30, use_pdb=True,
+                                         on_solution=lambda path, bound, elapsed: None)
+        expected, _, _ = bidirectional_bfs_search_3x3(state)
+        assert solves(state, path) and len(path) == len(expected)
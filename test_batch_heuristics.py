@@ -0,0 +1,43 @@
+import random
+
+import numpy as np
+
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2, heuristic_2x2, heuristic_2x2_batch, states_to_array_2x2
+from RubikState.rubik_chen import SOLVED_STATE_3x3, MOVES_3x3, heuristic_3x3, heuristic_3x3_batch
+from RubikState.coordinates import calculate_parity_batch
+from pdb_rubik_2x2 import PatternDatabase
+
+def random_states(solved, moves_dict, count, max_depth=25, seed=0):
+    """Random states scrambled with 0..max_depth moves"""
+    rng = random.Random(seed)
+    names = list(moves_dict.keys())
+    states = []
+    for _ in range(count):
+        state = solved
+        for _ in range(rng.randint(0, max_depth)):
+            state = state.apply_move(rng.choice(names), moves_dict)
+        states.append(state)
+    return states
+
+def test_heuristic_2x2_batch_matches_scalar():
+    states = random_states(SOLVED_STATE_2x2, MOVES_2x2, 300)
+    expected = [heuristic_2x2(state) for state in states]
+    assert heuristic_2x2_batch(states).tolist() == expected
+    assert heuristic_2x2_batch(states_to_array_2x2(states)).tolist() == expected
+
+def test_heuristic_3x3_batch_matches_scalar():
+    states = random_states(SOLVED_STATE_3x3, MOVES_3x3, 300)
+    assert heuristic_3x3_batch(states).tolist() == [heuristic_3x3(state) for state in states]
+
+def test_calculate_parity_batch():
+    rng = np.random.default_rng(0)
+    perms = np.array([rng.permutation(12) for _ in range(200)])
+    inversions = [sum(p[i] > p[j] for i in range(12) for j in range(i + 1, 12)) for p in perms]
+    assert calculate_parity_batch(perms).tolist() == [n % 2 for n in inversions]
+
+def test_pattern_database_batch_matches_dictionaries():
+    pdb = PatternDatabase()
+    pdb.generate_corner_permutation_database(max_depth=5)
+    pdb.generate_corner_orientation_database(max_depth=5)
+    states = random_states(SOLVED_STATE_2x2, MOVES_2x2, 300, max_depth=8)
+    assert pdb.get_heuristic_batch(states).tolist() == [pdb.get_heuristic(state) for state in states]
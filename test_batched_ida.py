@@ -0,0 +1,38 @@
+import random
+
+import numpy as np
+
+from RubikState.batched_ida import BatchExpander
+from RubikState.compiled_moves import get_compiled_moves, make_heuristic
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_chen import SOLVED_STATE_3x3, MOVES_3x3
+from RubikState.rubik_solver_2x2 import batched_ida_star_search_2x2, ida_star_search_2x2
+from RubikState.rubik_solver_3x3 import batched_ida_star_search_3x3, ida_star_search_3x3
+
+def test_batch_heuristic_matches_make_heuristic(scramble):
+    rng = random.Random(0)
+    for solved, moves_dict in ((SOLVED_STATE_2x2, MOVES_2x2), (SOLVED_STATE_3x3, MOVES_3x3)):
+        compiled = get_compiled_moves(moves_dict)
+        start_key = compiled.encode(scramble(15, 3, solved, moves_dict))
+        heuristic = make_heuristic(compiled, start_key)
+        expander = BatchExpander(compiled, start_key)
+        key = start_key
+        for g in range(30):
+            h, solved_mask = expander.heuristic(np.array([key[:compiled.slots]], dtype=np.int8), g)
+            assert int(h[0]) == heuristic(key, g)
+            assert bool(solved_mask[0]) == (key == compiled.encode(solved))
+            key = compiled.apply[rng.randrange(len(compiled.apply))](key)
+
+def test_batched_ida_star_matches_ida_star_lengths(scramble, solves):
+    for seed in range(3):
+        state = scramble(9, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = batched_ida_star_search_2x2(state, time_limit=30, stats={})
+        expected, _, _ = ida_star_search_2x2(state, time_limit=30)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
+        assert len(path) == len(expected)
+
+        state = scramble(7, seed)
+        path, _, _ = batched_ida_star_search_3x3(state, time_limit=30, use_pdb=False, stats={})
+        expected, _, _ = ida_star_search_3x3(state, time_limit=30, endgame_depth=0)
+        assert solves(state, path)
+        assert len(path) == len(expected)
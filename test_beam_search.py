@@ -0,0 +1,8 @@
+from RubikState.rubik_solver_3x3 import beam_search_3x3
+
+def test_beam_search_solves_short_scrambles(scramble, solves):
+    for seed in range(3):
+        state = scramble(8, seed)
+        for use_pdb in (True, False):
+            path, _, _ = beam_search_3x3(state, time_limit=10, use_pdb=use_pdb)
+            assert path is not None and solves(state, path)
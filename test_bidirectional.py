@@ -0,0 +1,61 @@
+from RubikState.compiled_moves import get_compiled_moves
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_solver_2x2 import (
+    bfs_search_2x2, bidirectional_bfs_search_2x2, get_corner_pattern_database, mm_search_2x2
+)
+from RubikState.rubik_solver_3x3 import bfs_search_3x3, bidirectional_bfs_search_3x3, mm_search_3x3
+
+def test_bidirectional_bfs_matches_bfs(scramble, solves):
+    for seed in range(3):
+        state = scramble(5, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = bidirectional_bfs_search_2x2(state)
+        expected, _, _ = bfs_search_2x2(state)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2) and len(path) == len(expected)
+
+        state = scramble(4, seed)
+        path, _, _ = bidirectional_bfs_search_3x3(state)
+        expected, _, _ = bfs_search_3x3(state)
+        assert solves(state, path) and len(path) == len(expected)
+
+def test_bidirectional_bfs_to_another_goal(scramble, solves):
+    goal = scramble(5, 10)
+    state = scramble(5, 11)
+    path, _, _ = bidirectional_bfs_search_3x3(state, goal_state=goal)
+    assert solves(state, path, goal) and len(path) <= 10
+
+def test_mm_solves_short_scrambles(scramble, solves):
+    for seed in range(3):
+        state = scramble(8, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = mm_search_2x2(state, stats={})
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
+
+        state = scramble(6, seed)
+        path, _, _ = mm_search_3x3(state, stats={})
+        assert solves(state, path)
+
+def test_mm_is_optimal(scramble, solves):
+    for seed in range(8):
+        state = scramble(14, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = mm_search_2x2(state, stats={})
+        expected, _, _ = bidirectional_bfs_search_2x2(state)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2) and len(path) == len(expected)
+
+    for seed in range(4):
+        state = scramble(8, seed)
+        path, _, _ = mm_search_3x3(state, stats={})
+        expected, _, _ = bidirectional_bfs_search_3x3(state)
+        assert solves(state, path) and len(path) == len(expected)
+
+    goal = scramble(4, 99)
+    state = scramble(6, 98)
+    path, _, _ = mm_search_3x3(state, goal_state=goal, stats={})
+    expected, _, _ = bidirectional_bfs_search_3x3(state, goal_state=goal)
+    assert solves(state, path, goal) and len(path) == len(expected)
+
+def test_corner_pattern_database_key_heuristic(scramble):
+    pdb = get_corner_pattern_database()
+    h = pdb.key_heuristic()
+    compiled = get_compiled_moves(MOVES_2x2)
+    for seed in range(200):
+        state = scramble(seed % 15, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        assert h(compiled.encode(state), 0) == pdb.get_heuristic(state)
@@ -0,0 +1,101 @@
+import os
+import time
+
+import pytest
+
+from RubikState.checkpoint import Checkpoint
+from RubikState.external_bfs import external_bfs_search
+from RubikState.rubik_chen import SOLVED_STATE_3x3, MOVES_3x3
+from RubikState.rubik_solver_3x3 import ida_star_search_3x3
+from pdb_rubik_2x2 import PatternDatabase
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "search.ckpt")
+    checkpoint = Checkpoint(path, "ida_star", ("start", 3), interval=0)
+    assert checkpoint.load() is None
+    assert checkpoint.due()
+
+    state = {"threshold": 9, "position": ((1, 4), (2, 5, 0), 11), "nodes": 1234}
+    checkpoint.save(state)
+    assert checkpoint.saves == 1
+    assert not os.path.exists(path + ".tmp")
+    assert Checkpoint(path, "ida_star", ("start", 3)).load() == state
+
+    # Another search or another problem never resumes from it
+    assert Checkpoint(path, "korf_ida_star", ("start", 3)).load() is None
+    assert Checkpoint(path, "ida_star", ("other", 3)).load() is None
+
+    checkpoint.clear()
+    assert not os.path.exists(path)
+
+def test_checkpoint_interval():
+    checkpoint = Checkpoint("unused", "ida_star", None, interval=3600)
+    assert not checkpoint.due()
+
+def test_ida_star_resumes_from_checkpoint(tmp_path, scramble, solves):
+    state = scramble(14, 5)
+    expected, _, _ = ida_star_search_3x3(state, time_limit=120, endgame_depth=0)
+    assert expected is not None
+
+    path_file = str(tmp_path / "ida.ckpt")
+    runs = 0
+    path = None
+    while path is None and runs < 200:
+        runs += 1
+        path, _, _ = ida_star_search_3x3(state, time_limit=0.3, endgame_depth=0,
+                                         checkpoint_file=path_file, checkpoint_interval=0.1)
+        assert path is not None or os.path.exists(path_file)
+    assert runs > 1
+    assert solves(state, path) and len(path) == len(expected)
+    assert not os.path.exists(path_file)
+
+def test_ida_star_checkpoint_turns_move_ordering_off(tmp_path, scramble, solves):
+    # Checkpoints need the fixed move order, so move_ordering is ignored
+    state = scramble(5, 0)
+    path_file = str(tmp_path / "ida.ckpt")
+    path, _, _ = ida_star_search_3x3(state, endgame_depth=0, move_ordering=True, checkpoint_file=path_file)
+    assert solves(state, path)
+    assert not os.path.exists(path_file)
+
+def test_external_bfs_resumes_from_checkpoint(tmp_path, scramble, solves):
+    state = scramble(5, 1)
+    reference_dir = tmp_path / "reference"
+    reference_dir.mkdir()
+    expected, expected_nodes = external_bfs_search(state, SOLVED_STATE_3x3, MOVES_3x3, str(reference_dir),
+                                                   time.time(), 60, chunk=1000)
+
+    directory = tmp_path / "resumed"
+    directory.mkdir()
+    runs = 0
+    path = None
+    while path is None and runs < 200:
+        runs += 1
+        path, nodes = external_bfs_search(state, SOLVED_STATE_3x3, MOVES_3x3, str(directory),
+                                          time.time(), 0.05, chunk=1000, checkpoint_interval=0)
+    assert runs > 1
+    assert solves(state, path) and len(path) == len(expected)
+    assert nodes == expected_nodes
+    assert os.listdir(directory) == []
+
+def test_pattern_database_resumes_from_checkpoint(tmp_path, monkeypatch):
+    expected = PatternDatabase()
+    expected.generate_corner_orientation_database(max_depth=6)
+
+    # Stop the generation right after its third checkpoint, as a crash would
+    path = str(tmp_path / "co.ckpt")
+    save = Checkpoint.save
+
+    def interrupted_save(self, state):
+        save(self, state)
+        if self.saves == 3:
+            raise KeyboardInterrupt
+    monkeypatch.setattr(Checkpoint, "save", interrupted_save)
+    pdb = PatternDatabase()
+    with pytest.raises(KeyboardInterrupt):
+        pdb.generate_corner_orientation_database(max_depth=6, checkpoint_file=path, checkpoint_interval=0)
+    monkeypatch.setattr(Checkpoint, "save", save)
+    assert os.path.exists(path)
+
+    pdb.generate_corner_orientation_database(max_depth=6, checkpoint_file=path, checkpoint_interval=0)
+    assert pdb.co_database == expected.co_database
+    assert not os.path.exists(path)
@@ -0,0 +1,113 @@
+import time
+
+from RubikState.compiled_moves import get_compiled_moves, make_heuristic
+from RubikState.depth_first import bounded_dfs, depth_limited_dfs, ida_star
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_chen import SOLVED_STATE_3x3
+from RubikState.rubik_solver_2x2 import (
+    bidirectional_bfs_search_2x2, fringe_search_2x2, ida_star_search_2x2, ids_search_2x2
+)
+from RubikState.rubik_solver_3x3 import fringe_search_3x3, ida_star_search_3x3
+from RubikState.search_structures import TranspositionTable
+
+def test_ida_star_solves_short_scrambles(scramble, solves):
+    for seed in range(3):
+        state = scramble(8, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = ida_star_search_2x2(state)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2) and len(path) <= 8
+
+        state = scramble(6, seed)
+        path, _, _ = ida_star_search_3x3(state, endgame_depth=0)
+        assert solves(state, path) and len(path) <= 6
+    assert ida_star_search_3x3(SOLVED_STATE_3x3, endgame_depth=0)[0] == []
+
+def test_ida_star_transposition_table_keeps_lengths(scramble, solves):
+    for seed in range(3):
+        state = scramble(9, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, nodes, _ = ida_star_search_2x2(state)
+        expected, plain_nodes, _ = ida_star_search_2x2(state, table_memory_mb=0)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
+        assert len(path) == len(expected)
+        assert nodes <= plain_nodes
+
+def test_ida_star_tiny_transposition_table(scramble):
+    # Entries keep replacing each other in 64 slots; the cuts must stay exact
+    compiled = get_compiled_moves(MOVES_2x2)
+    goal_key = compiled.encode(SOLVED_STATE_2x2)
+    for seed in range(3):
+        state = scramble(9, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        start_key = compiled.encode(state)
+        heuristic = make_heuristic(compiled, start_key)
+        table = TranspositionTable(64 * TranspositionTable.ENTRY_BYTES)
+        path, _ = ida_star(start_key, goal_key, compiled, heuristic, time.time(), 30, table=table)
+        expected, _ = ida_star(start_key, goal_key, compiled, heuristic, time.time(), 30)
+        assert len(table) == 64 and len(path) == len(expected)
+
+def test_bounded_dfs_root_replaces_other_entry():
+    # A one-slot table holding another state: its bound must not stick to the root
+    compiled = get_compiled_moves(MOVES_2x2)
+    start_key = compiled.encode(SOLVED_STATE_2x2.apply_move("R", MOVES_2x2).apply_move("U", MOVES_2x2))
+    goal_key = compiled.encode(SOLVED_STATE_2x2)
+    table = TranspositionTable(TranspositionTable.ENTRY_BYTES)
+    table.new_iteration()
+    table.hashes[0] = hash(start_key) + 1
+    table.bound[0] = 200
+    table.stamp[0] = table.iteration
+    heuristic = make_heuristic(compiled, start_key)
+    _, next_threshold, _, _ = bounded_dfs(start_key, goal_key, compiled, heuristic, 0,
+                                          time.time() + 10, table=table)
+    assert table.hashes[0] == hash(start_key)
+    assert table.bound[0] == next_threshold
+
+def test_depth_limited_dfs_without_goal_moves():
+    compiled = get_compiled_moves(MOVES_2x2)
+    state = SOLVED_STATE_2x2
+    for move in ("R", "U", "F"):
+        state = state.apply_move(move, MOVES_2x2)
+    start_key = compiled.encode(state)
+    goal_key = compiled.encode(SOLVED_STATE_2x2)
+    deadline = time.time() + 10
+    moves, _, timed_out = depth_limited_dfs(start_key, goal_key, compiled, 3, deadline)
+    assert not timed_out and compiled.apply_sequence(start_key, moves) == goal_key
+    assert depth_limited_dfs(start_key, goal_key, compiled, 2, deadline)[0] is None
+
+def test_ids_finds_optimal_lengths(scramble, solves):
+    for seed in range(3):
+        state = scramble(8, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = ids_search_2x2(state)
+        expected, _, _ = bidirectional_bfs_search_2x2(state)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
+        assert len(path) == len(expected)
+
+def test_ids_transposition_table_keeps_lengths(scramble):
+    for seed in range(3):
+        state = scramble(9, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, nodes, _ = ids_search_2x2(state)
+        expected, plain_nodes, _ = ids_search_2x2(state, table_memory_mb=0)
+        assert len(path) == len(expected)
+        assert nodes <= plain_nodes
+
+def test_fringe_search_matches_ida_star(scramble, solves):
+    for seed in range(3):
+        state = scramble(9, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = fringe_search_2x2(state)
+        expected, _, _ = ida_star_search_2x2(state)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2) and len(path) == len(expected)
+
+        state = scramble(7, seed)
+        path, _, _ = fringe_search_3x3(state, endgame_depth=0)
+        expected, _, _ = ida_star_search_3x3(state, endgame_depth=0)
+        assert solves(state, path) and len(path) == len(expected)
+
+def test_move_ordering_keeps_lengths(scramble, solves):
+    for seed in range(3):
+        state = scramble(9, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        expected, _, _ = ida_star_search_2x2(state)
+        for search in (ida_star_search_2x2, ids_search_2x2):
+            path, _, _ = search(state, move_ordering=True)
+            assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2) and len(path) == len(expected)
+
+        state = scramble(7, seed)
+        path, _, _ = ida_star_search_3x3(state, endgame_depth=0, move_ordering=True)
+        expected, _, _ = ida_star_search_3x3(state, endgame_depth=0)
+        assert solves(state, path) and len(path) == len(expected)
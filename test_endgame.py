@@ -0,0 +1,47 @@
+import random
+
+from RubikState.compiled_moves import get_compiled_moves
+from RubikState.endgame import EndgameTable
+from RubikState.rubik_chen import SOLVED_STATE_3x3, MOVES_3x3
+
+# States within 0, 1, 2, 3 quarter turns of solved
+QTM_COUNTS = [1, 12, 114, 1068]
+
+def test_endgame_table_distances(tmp_path):
+    table = EndgameTable(3, filename=str(tmp_path / "endgame"))
+    assert len(table) == sum(QTM_COUNTS)
+
+    # Breadth-first layers give the exact distances the table must return
+    compiled = get_compiled_moves(MOVES_3x3)
+    layer = {compiled.encode(SOLVED_STATE_3x3)}
+    seen = set(layer)
+    for distance in range(4):
+        assert len(layer) == QTM_COUNTS[distance]
+        for key in layer:
+            assert table.lookup(key) == distance
+        layer = {apply(key) for key in layer for apply in compiled.apply} - seen
+        seen |= layer
+    for key in layer:
+        assert table.lookup(key) is None
+
+def test_endgame_walk_and_heuristic(tmp_path):
+    table = EndgameTable(3, filename=str(tmp_path / "endgame"))
+    compiled = get_compiled_moves(MOVES_3x3)
+    goal = compiled.encode(SOLVED_STATE_3x3)
+    rng = random.Random(0)
+    h = table.heuristic(lambda key, g: 0)
+    for _ in range(50):
+        key = goal
+        for _ in range(rng.randint(0, 3)):
+            key = compiled.apply[rng.randrange(len(compiled.apply))](key)
+        moves = table.walk(key)
+        assert len(moves) == table.lookup(key)
+        for m in moves:
+            key = compiled.apply[m](key)
+        assert key == goal
+
+    far = compiled.encode(SOLVED_STATE_3x3.apply_move("R", MOVES_3x3).apply_move("U", MOVES_3x3)
+                          .apply_move("F", MOVES_3x3).apply_move("L", MOVES_3x3))
+    assert table.lookup(far) is None
+    assert h(far, 0) == 4
+    assert table.lookup_state(SOLVED_STATE_3x3.apply_move("R", MOVES_3x3)) == 1
@@ -0,0 +1,36 @@
+import os
+import time
+
+import numpy as np
+
+from RubikState.external_bfs import external_bfs_search, external_pdb
+from RubikState.kociemba import N_MOVES, N_TWIST, distance_table, face_turn_arrays, twist_move_table
+from RubikState.rubik_chen import SOLVED_STATE_3x3, MOVES_3x3
+from RubikState.rubik_solver_3x3 import bfs_search_3x3, bidirectional_bfs_search_3x3
+
+def test_external_bfs_matches_bidirectional_bfs(tmp_path, scramble, solves):
+    # Small chunks: every layer past the third is split into several sorted runs
+    for seed in range(3):
+        state = scramble(5, seed)
+        directory = tmp_path / str(seed)
+        path, _ = external_bfs_search(state, SOLVED_STATE_3x3, MOVES_3x3, str(directory),
+                                      time.time(), 60, chunk=5000)
+        expected, _, _ = bidirectional_bfs_search_3x3(state)
+        assert solves(state, path) and len(path) == len(expected)
+        assert os.listdir(directory) == []
+
+def test_bfs_search_on_disk(tmp_path, scramble, solves):
+    state = scramble(4, 7)
+    path, _, _ = bfs_search_3x3(state, external_dir=str(tmp_path))
+    expected, _, _ = bfs_search_3x3(state)
+    assert solves(state, path) and len(path) == len(expected)
+
+def test_external_pdb_matches_in_memory_bfs(tmp_path):
+    twist_move = twist_move_table(face_turn_arrays(MOVES_3x3))
+    pdb, sizes = external_pdb(
+        np.zeros(1, dtype=np.int64), lambda records: twist_move[records].ravel().astype(np.int64),
+        lambda records: records, N_TWIST, str(tmp_path / "layers"), str(tmp_path / "twist.pdb"), chunk=500
+    )
+    expected = distance_table(twist_move, np.zeros((1, N_MOVES), dtype=np.int16), 0, range(N_MOVES))
+    assert sum(sizes) == N_TWIST
+    assert np.array_equal(pdb, expected)
@@ -0,0 +1,15 @@
+import random
+
+from RubikState.rubik_chen import SOLVED_STATE_3x3
+from RubikState.rubik_solver_3x3 import kociemba_search_3x3
+
+def test_kociemba_solves_random_states(scramble, solves):
+    rng = random.Random(0)
+    for _ in range(10):
+        state = scramble(50, rng)
+        path, _, _ = kociemba_search_3x3(state, time_limit=10)
+        assert path is not None and solves(state, path)
+
+def test_kociemba_solved_state():
+    path, _, _ = kociemba_search_3x3(SOLVED_STATE_3x3)
+    assert path == []
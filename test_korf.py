@@ -0,0 +1,16 @@
+from RubikState.korf import korf_moves_to_names
+from RubikState.rubik_chen import SOLVED_STATE_3x3
+from RubikState.rubik_solver_3x3 import bidirectional_bfs_search_3x3, optimal_search_3x3
+
+def test_korf_moves_to_names():
+    # Move index face * 3 + power - 1, faces in the order U D L R F B
+    assert korf_moves_to_names([0, 1, 2, 11]) == ["U", "U", "U", "U'", "R'"]
+    assert korf_moves_to_names([]) == []
+
+def test_optimal_search_is_optimal(scramble, solves):
+    for seed in range(3):
+        state = scramble(9, seed)
+        path, _, _ = optimal_search_3x3(state, progress=lambda threshold, nodes, elapsed: None)
+        expected, _, _ = bidirectional_bfs_search_3x3(state)
+        assert solves(state, path) and len(path) == len(expected)
+    assert optimal_search_3x3(SOLVED_STATE_3x3)[0] == []
@@ -0,0 +1,41 @@
+import numpy as np
+
+from RubikState.compiled_moves import get_compiled_moves
+from RubikState.genetic import evaluate_population
+from RubikState.local_search import StickerScorer, simplify_moves
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_solver_2x2 import genetic_search_2x2, local_search_2x2
+
+def test_simplify_moves():
+    compiled = get_compiled_moves(MOVES_2x2)
+    index = {name: m for m, name in enumerate(compiled.names)}
+    moves = [index[name] for name in ("R", "U", "U'", "F", "F", "F", "R'", "R")]
+    assert [compiled.names[m] for m in simplify_moves(compiled, moves)] == ["R", "F'"]
+
+def test_local_search_methods_solve_short_scrambles(scramble, solves):
+    for method in ("random_restart", "annealing", "tabu"):
+        for seed in range(2):
+            state = scramble(5, seed, SOLVED_STATE_2x2, MOVES_2x2)
+            path, _, _ = local_search_2x2(state, method=method, seed=seed, time_limit=10)
+            assert path is not None and solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
+
+def test_evaluate_population_scores_prefixes(scramble):
+    compiled = get_compiled_moves(MOVES_2x2)
+    goal_key = compiled.encode(SOLVED_STATE_2x2)
+    start_key = compiled.encode(scramble(6, 0, SOLVED_STATE_2x2, MOVES_2x2))
+    scorer = StickerScorer(start_key, goal_key, compiled)
+    genes = np.random.default_rng(0).integers(0, len(compiled.apply), size=(20, 10))
+    scores, lengths = evaluate_population(scorer, genes)
+    for row, score, length in zip(genes, scores, lengths):
+        key = start_key
+        prefix_scores = [scorer.score(np.array([key], dtype=np.int8))[0]]
+        for m in row:
+            key = compiled.apply[m](key)
+            prefix_scores.append(scorer.score(np.array([key], dtype=np.int8))[0])
+        assert score == min(prefix_scores) and length == prefix_scores.index(score)
+
+def test_genetic_search_solves_short_scrambles(scramble, solves):
+    for seed in range(2):
+        state = scramble(5, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = genetic_search_2x2(state, seed=seed, time_limit=10, stats={})
+        assert path is not None and solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
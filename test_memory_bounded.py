@@ -0,0 +1,13 @@
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_solver_2x2 import bidirectional_bfs_search_2x2, sma_star_search_2x2
+
+def test_sma_star_optimal_under_memory_caps(scramble, solves):
+    # Even a cap of 60 nodes holds the optimal paths of these scrambles
+    for seed in (1, 2, 3, 5):
+        state = scramble(8, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        expected, _, _ = bidirectional_bfs_search_2x2(state)
+        for max_nodes in (60, 500, 100000):
+            stats = {}
+            path, _, _ = sma_star_search_2x2(state, max_nodes=max_nodes, stats=stats)
+            assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2) and len(path) == len(expected)
+            assert stats["max_resident_nodes"] <= max_nodes
@@ -0,0 +1,25 @@
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_solver_2x2 import ida_star_search_2x2, parallel_ida_star_search_2x2
+from RubikState.rubik_solver_3x3 import (
+    distributed_ida_star_search_3x3, ida_star_search_3x3, parallel_ida_star_search_3x3
+)
+
+def test_parallel_ida_star_matches_ida_star(scramble, solves):
+    for seed in range(3):
+        state = scramble(9, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = parallel_ida_star_search_2x2(state, workers=2)
+        expected, _, _ = ida_star_search_2x2(state)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2) and len(path) == len(expected)
+
+        state = scramble(7, seed)
+        path, _, _ = parallel_ida_star_search_3x3(state, workers=2)
+        expected, _, _ = ida_star_search_3x3(state, endgame_depth=0)
+        assert solves(state, path) and len(path) == len(expected)
+
+def test_distributed_ida_star_on_localhost(scramble, solves):
+    # Two worker processes connect to the coordinator over 127.0.0.1
+    for seed in range(3):
+        state = scramble(7, seed)
+        path, _, _ = distributed_ida_star_search_3x3(state, workers=2)
+        expected, _, _ = ida_star_search_3x3(state, endgame_depth=0)
+        assert solves(state, path) and len(path) == len(expected)
@@ -0,0 +1,11 @@
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_solver_2x2 import a_star_search_2x2
+
+def test_epea_star_matches_a_star(scramble, solves):
+    for seed in range(3):
+        state = scramble(9, seed, SOLVED_STATE_2x2, MOVES_2x2)
+        stats = {}
+        path, _, _ = a_star_search_2x2(state, partial_expansion=True, stats=stats)
+        expected, _, _ = a_star_search_2x2(state)
+        assert solves(state, path, SOLVED_STATE_2x2, MOVES_2x2) and len(path) == len(expected)
+        assert stats["surplus_nodes"] > 0
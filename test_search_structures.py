@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from RubikState.search_structures import NodeArena, BucketQueue, TranspositionTable
+from RubikState.rubik_2x2 import SOLVED_STATE_2x2, MOVES_2x2
+from RubikState.rubik_solver_2x2 import greedy_best_first_search_2x2
+
+def drain(queue):
+    """Pop every item of a queue"""
+    items = []
+    while queue:
+        items.append(queue.pop())
+    return items
+
+def test_bucket_queue_pops_lowest_priority_first():
+    queue = BucketQueue()
+    for priority, item in ((3, "c"), (1, "a"), (2, "b"), (1, "a2")):
+        queue.push(priority, item)
+    assert len(queue) == 4
+    assert [priority for priority, _ in drain(queue)] == [1, 1, 2, 3]
+    with pytest.raises(IndexError):
+        queue.pop()
+
+def test_bucket_queue_orders_inside_a_bucket():
+    for order, expected in (("lifo", [3, 2, 1]), ("fifo", [1, 2, 3])):
+        queue = BucketQueue(order=order)
+        for item in (1, 2, 3):
+            queue.push(0, item)
+        assert [item for _, item in drain(queue)] == expected
+
+    queue = BucketQueue(order="high_g")
+    for item, g in (("a", 1), ("b", 3), ("c", 2), ("d", 3)):
+        queue.push(0, item, g)
+    assert [item for _, item in drain(queue)] == ["d", "b", "c", "a"]
+
+    with pytest.raises(ValueError):
+        BucketQueue(order="random")
+
+def test_bucket_queue_orders_by_key():
+    queue = BucketQueue(order="key")
+    for item, key in (("a", 5), ("b", -2), ("c", 9), ("d", 0)):
+        queue.push(0, item, key=key)
+    assert [item for _, item in drain(queue)] == ["b", "d", "a", "c"]
+
+def test_bucket_queue_push_below_minimum():
+    queue = BucketQueue()
+    queue.push(5, "x")
+    assert queue.pop() == (5, "x")
+    queue.push(2, "y")
+    queue.push(7, "z")
+    assert drain(queue) == [(2, "y"), (7, "z")]
+
+def test_node_arena_path():
+    arena = NodeArena()
+    root = arena.add("root")
+    child = arena.add("child", root, 2, 1)
+    grandchild = arena.add("grandchild", child, 0, 2)
+    assert arena.path(grandchild, ["R", "U", "F"]) == ["F", "R"]
+    assert arena.path(root, ["R", "U", "F"]) == []
+    assert arena.g[grandchild] == 2
+
+def test_transposition_table_memory_cap():
+    for max_bytes in (13, 100, 1 << 20, 16 << 20):
+        table = TranspositionTable(max_bytes)
+        assert table.memory_bytes <= max_bytes < 2 * table.memory_bytes
+        assert len(table) & (len(table) - 1) == 0
+    with pytest.raises(ValueError):
+        TranspositionTable(12)
+
+def test_transposition_table_stamp_overflow():
+    table = TranspositionTable(1024)
+    table.new_iteration()
+    table.stamp[3] = table.iteration
+    table.iteration = 0xFFFF
+    table.new_iteration()
+    assert table.iteration == 1 and table.stamp[3] == 0
+
+def test_greedy_best_first_solves_deep_scrambles(scramble, solves):
+    # Expanding heuristic ties first-in first-out timed out on these scrambles
+    rng = random.Random(1)
+    for _ in range(2):
+        state = scramble(20, rng, SOLVED_STATE_2x2, MOVES_2x2)
+        path, _, _ = greedy_best_first_search_2x2(state, time_limit=20)
+        assert path is not None and solves(state, path, SOLVED_STATE_2x2, MOVES_2x2)
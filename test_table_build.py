@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+import RubikState.rubik_solver_3x3 as solver_3x3
+
+# Each search with the getter whose table it loads before starting its clock
+SEARCHES = [
+    ("beam_search_3x3", "get_korf_tables", {}),
+    ("batched_ida_star_search_3x3", "get_korf_tables", {}),
+    ("ara_star_search_3x3", "get_korf_tables", {"use_pdb": True}),
+    ("sma_star_search_3x3", "get_korf_tables", {"use_pdb": True}),
+    ("local_search_3x3", "get_korf_tables", {"seed": 0}),
+    ("genetic_search_3x3", "get_korf_tables", {"seed": 0}),
+    ("optimal_search_3x3", "get_korf_tables", {}),
+    ("mm_search_3x3", "get_korf_tables", {}),
+    ("kociemba_search_3x3", "get_kociemba_tables", {}),
+    ("thistlethwaite_search_3x3", "get_thistlethwaite_tables", {}),
+    ("a_star_search_3x3", "get_endgame_table", {}),
+    ("dfs_search_3x3", "get_endgame_table", {"max_depth": 4}),
+    ("ids_search_3x3", "get_endgame_table", {}),
+    ("ida_star_search_3x3", "get_endgame_table", {}),
+    ("fringe_search_3x3", "get_endgame_table", {}),
+]
+
+@pytest.mark.parametrize("search, getter, options", SEARCHES, ids=[s[0] for s in SEARCHES])
+def test_table_build_not_counted(monkeypatch, scramble, solves, search, getter, options):
+    # The tables are built on first use; that must not eat the time limit
+    load = getattr(solver_3x3, getter)
+    load()
+    calls = []
+
+    def slow_load(*args, **kwargs):
+        calls.append(args)
+        time.sleep(1.5)
+        return load(*args, **kwargs)
+    monkeypatch.setattr(solver_3x3, getter, slow_load)
+    state = scramble(4, 1)
+    path, _, time_taken = getattr(solver_3x3, search)(state, time_limit=1, **options)
+    assert calls and time_taken < 1.5
+    if search in ("local_search_3x3", "genetic_search_3x3"):
+        assert path is None or solves(state, path)
+    else:
+        assert path is not None and solves(state, path)
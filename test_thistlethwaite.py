@@ -0,0 +1,27 @@
+import random
+
+from RubikState.rubik_chen import SOLVED_STATE_3x3
+from RubikState.rubik_solver_3x3 import thistlethwaite_search_3x3
+
+def test_thistlethwaite_solves_random_states(scramble, solves):
+    # Some phases can only progress with the face turned last, which used to stall the descent
+    rng = random.Random(0)
+    for _ in range(100):
+        state = scramble(60, rng)
+        path, _, _ = thistlethwaite_search_3x3(state, time_limit=2)
+        assert path is not None and solves(state, path)
+
+def test_thistlethwaite_merges_turns_of_one_face(scramble):
+    rng = random.Random(2)
+    for _ in range(20):
+        state = scramble(40, rng)
+        path, _, _ = thistlethwaite_search_3x3(state)
+        # Half turns are two quarter turns; three quarter turns in a row never appear
+        for i in range(len(path) - 2):
+            assert not path[i] == path[i + 1] == path[i + 2]
+
+def test_thistlethwaite_solved_state(scramble, solves):
+    assert thistlethwaite_search_3x3(SOLVED_STATE_3x3)[0] == []
+    state = scramble(3, 4)
+    path, _, _ = thistlethwaite_search_3x3(state)
+    assert path is not None and solves(state, path)